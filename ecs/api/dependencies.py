@@ -1,7 +1,9 @@
 from typing import Annotated, TypeAlias, TYPE_CHECKING
 
-from fastapi import Depends
+from fastapi import Depends, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.security import OAuth2PasswordBearer
+from pydantic import ValidationError
 from structlog.contextvars import bind_contextvars
 
 from ecs.core.security import verify_access_token
@@ -9,6 +11,7 @@ from ecs.models.schemas.token import PrincipalType
 from ecs.services import AuthService, EmotionService, CreditService
 from ecs.services.exceptions import UnauthorizedError
 from ecs.models.schemas.token import TokenData
+from ecs.models.schemas.emotion import EmotionalEvent, parse_emotional_events
 
 oauth2_scheme: OAuth2PasswordBearer = OAuth2PasswordBearer(tokenUrl="/api/v1/token")
 
@@ -31,8 +34,19 @@ def get_current_client_principal(token: Annotated[str, Depends(oauth2_scheme)])
     bind_contextvars(principal_type=token_data.typ)
     return token_data
 
+# Emotional events request body, decoded and validated as a whole from the raw bytes
+# Errors are reported like FastAPI's own body validation errors
+async def get_emotional_events(request: Request) -> list[EmotionalEvent]:
+    try:
+        return parse_emotional_events(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
+
 CurrentUserPrincipalDep: TypeAlias = Annotated[TokenData, Depends(get_current_user_principal)]
 CurrentClientPrincipalDep: TypeAlias = Annotated[TokenData, Depends(get_current_client_principal)]
+EmotionalEventsBodyDep: TypeAlias = Annotated[list[EmotionalEvent], Depends(get_emotional_events)]
 
 # Service dependencies
 AuthServiceDep: TypeAlias = Annotated[AuthService, Depends()]
@@ -1,12 +1,15 @@
+import hashlib
 import uuid
-from typing import Any
+from typing import Annotated, Any, AsyncIterator
 
 import structlog
 from structlog.contextvars import bind_contextvars
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Header, Response, status
+from fastapi.responses import StreamingResponse
 
 from ecs.api.dependencies import CurrentUserPrincipalDep, CreditServiceDep
-from ecs.models.schemas import CreditOfferResponse, CreditAcceptResponse
+from ecs.core.config import settings
+from ecs.models.schemas import CreditOfferResponse, CreditAcceptResponse, CreditAcceptJobStatus
 from ecs.models.domain import DBCreditOffer
 from ecs.services.exceptions import ActiveCreditOfferExistsError
 
@@ -45,6 +48,45 @@ async def apply(
     logger.info("Returning credit offer", offer_status=credit_offer.status)
     return credit_offer
 
+"""
+Current credit offer, for clients polling their offer
+Responses carry a strong ETag of the body, a request whose If-None-Match matches it gets a bodyless 304
+"""
+@router.get(
+    path="/offers/current",
+    status_code=status.HTTP_200_OK,
+    summary="Get current credit offer",
+    response_model=CreditOfferResponse,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Offer unchanged since the ETag in If-None-Match"}}
+)
+async def current_offer(
+    user_token: CurrentUserPrincipalDep,
+    credit_service: CreditServiceDep,
+    if_none_match: Annotated[str | None, Header()] = None
+) -> Response:
+    logger = structlog.get_logger()
+
+    user_id: uuid.UUID = uuid.UUID(user_token.sub)
+    bind_contextvars(user_id=user_id)
+
+    credit_offer: DBCreditOffer = await credit_service.get_current_credit_offer(user_id)
+    body = CreditOfferResponse.model_validate(credit_offer, from_attributes=True).model_dump_json().encode()
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    # Offers are per user, shared caches must not keep them and clients must revalidate
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if _etag_matches(if_none_match, etag):
+        logger.debug("Credit offer not modified")
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match uses the weak comparison, a W/ prefix does not prevent a match"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
 """
 Triggers async job for applying credit limit and user notification
 """
@@ -70,4 +112,68 @@ async def accept(
         offer_id=str(offer_id),
         status="processing",
         message="Credit offer acceptance is being processed"
-    )
\ No newline at end of file
+    )
+
+"""
+State of a credit acceptance job, the id is the one returned by the accept endpoint
+"""
+@router.get(
+    path="/jobs/{job_id}",
+    status_code=status.HTTP_200_OK,
+    summary="Get credit acceptance job",
+    response_model=CreditAcceptJobStatus
+)
+async def acceptance_job(
+    job_id: uuid.UUID,
+    user_token: CurrentUserPrincipalDep,
+    credit_service: CreditServiceDep
+) -> CreditAcceptJobStatus:
+    user_id: uuid.UUID = uuid.UUID(user_token.sub)
+    bind_contextvars(job_id=job_id, user_id=user_id)
+
+    return await credit_service.get_credit_acceptance(job_id, user_id)
+
+"""
+Server-Sent Events stream of a credit acceptance job, instead of polling for its completion
+Sends the current state right away and, unless the job is done, its final state once it finishes.
+The stream closes after that or after credit_acceptance_events_timeout_seconds, clients reconnect while the job is not done
+"""
+@router.get(
+    path="/jobs/{job_id}/events",
+    status_code=status.HTTP_200_OK,
+    summary="Stream credit acceptance job events",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {"text/event-stream": {}}}}
+)
+async def acceptance_job_events(
+    job_id: uuid.UUID,
+    user_token: CurrentUserPrincipalDep,
+    credit_service: CreditServiceDep
+) -> StreamingResponse:
+    user_id: uuid.UUID = uuid.UUID(user_token.sub)
+    bind_contextvars(job_id=job_id, user_id=user_id)
+
+    updates = credit_service.watch_credit_acceptance(
+        job_id, user_id, timeout_seconds=settings.credit_acceptance_events_timeout_seconds
+    )
+    # The current state is read before the stream starts, a missing job is still answered with a 404
+    job_status = await anext(updates)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            yield _server_sent_event(job_status)
+            async for update in updates:
+                yield _server_sent_event(update)
+        finally:
+            # Unsubscribes when the client goes away before the job finished
+            await updates.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Nginx would otherwise buffer the stream until it ends
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _server_sent_event(job_status: CreditAcceptJobStatus) -> str:
+    return f"event: status\ndata: {job_status.model_dump_json()}\n\n"
@@ -1,24 +1,50 @@
+from typing import Any
+
 from fastapi import APIRouter, status
 import structlog
 
-from ecs.models.schemas.emotion import EmotionalEvent
-from ecs.api.dependencies import CurrentClientPrincipalDep, EmotionalEventsServiceDep
+from ecs.models.schemas.emotion import EmotionalEventIngestResult, EMOTIONAL_EVENTS_ADAPTER
+from ecs.api.dependencies import CurrentClientPrincipalDep, EmotionalEventsBodyDep, EmotionalEventsServiceDep
 
 router = APIRouter(prefix="/emotions", tags=["Emotions"])
 
+def _inline_definitions(schema: dict[str, Any]) -> dict[str, Any]:
+    """JSON schema with its $defs references replaced by the definitions, as the OpenAPI document lacks them"""
+    definitions = schema.pop("$defs", {})
+
+    def inline(node: Any) -> Any:
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return inline(definitions[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: inline(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [inline(value) for value in node]
+        return node
+
+    return inline(schema)
+
+# The body is read by EmotionalEventsBodyDep rather than FastAPI, its schema is documented here
+INGEST_REQUEST_BODY = {
+    "required": True,
+    "content": {"application/json": {"schema": _inline_definitions(EMOTIONAL_EVENTS_ADAPTER.json_schema())}}
+}
+
 @router.post(
     path="/ingest",
     status_code=status.HTTP_200_OK,
     summary="Ingest emotional events",
+    response_model=EmotionalEventIngestResult,
+    openapi_extra={"requestBody": INGEST_REQUEST_BODY}
 )
 async def ingest(
-    events: list[EmotionalEvent],
     _: CurrentClientPrincipalDep,
+    events: EmotionalEventsBodyDep,
     emotional_events_service: EmotionalEventsServiceDep
-) -> None:
+) -> EmotionalEventIngestResult:
     logger = structlog.get_logger()
     logger.info("Received ingest request")
 
-    await emotional_events_service.ingest(events)
+    result = await emotional_events_service.ingest(events)
     
-    logger.info("Succesfully processed ingest request")
\ No newline at end of file
+    logger.info("Succesfully processed ingest request", inserted=result.inserted, duplicates=result.duplicates)
+    return result
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
 
@@ -8,6 +10,7 @@ from ecs.repositories.exceptions import BaseDomainError
 from ecs.services.exceptions import BaseServiceError
 from ecs.api.exceptions import BaseHandlerError
 from ecs.api import api_router, RequestLogMiddleware
+from ecs.services.internal import get_credit_model_backend
 
 def generate_custom_unique_id(route: APIRoute) -> str:
     return f"{route.tags[0]}-{route.name}"
@@ -22,10 +25,17 @@ def setup_app(app: FastAPI):
     # Global exception handler
     app.add_exception_handler(Exception, global_error_handler)
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Load the credit model before serving, instead of on the first application
+    get_credit_model_backend()
+    yield
+
 configure_logging()
 
 app = FastAPI(
     title=settings.TITLE,
+    lifespan=lifespan,
 )
 setup_app(app)
 
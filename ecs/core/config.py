@@ -23,18 +23,92 @@ class Settings(BaseSettings):
     # Database
     DB_URL: str = ""
     REDIS_URL: str = ""
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    worker_db_pool_size: int = 1  # Per RQ worker process, it runs one job at a time
 
     # RabbitMQ
     RABBITMQ_USER: str = ""
     RABBITMQ_PASS: str = ""
     RABBITMQ_HOST: str = ""
     RABBITMQ_PORT: str = ""
+    # Emotional events consumer, messages are written in batches of emotion_consumer_batch_size events
+    # or what arrived within emotion_consumer_batch_max_wait_seconds, one transaction per batch
+    emotion_consumer_prefetch_count: int = 5000  # Unacknowledged messages held at once
+    emotion_consumer_batch_size: int = 5000
+    emotion_consumer_batch_max_wait_seconds: float = 0.5
+    emotion_consumer_concurrency: int = 4  # Batches written at once per process, each with its own pooled connection
+    emotion_consumer_processes: int = 1  # Consumer processes started by python -m ecs.workers.emotion_consumer
 
     # Feature engineering configuration
     feature_engineering_transactions_period_days: int = 30
     feature_engineering_transactions_limit: int = 1000
     feature_engineering_emotional_events_period_days: int = 7
     feature_engineering_emotional_events_limit: int = 50
+    # Read emotional features from the per day buckets maintained at ingest time instead of the raw events
+    # Day granular window and no event limit, see DBEmotionalFeatureBucket
+    feature_engineering_use_emotional_feature_store: bool = False
+
+    # Credit application
+    # Run the independent reads of an application concurrently, each on its own pooled connection
+    # One extra connection per concurrent read (3) while an application runs, size pool_size/max_overflow accordingly
+    credit_apply_concurrent_reads: bool = False
+    # Concurrent applications of a user are coalesced, across workers through a Redis lock
+    # The lease bounds how long a crashed worker holds the lock, waiting longer than that runs the application anyway
+    credit_apply_single_flight_lease_seconds: float = 30.0
+    credit_apply_single_flight_wait_seconds: float = 10.0
+    # Cache credit eligibility reads (credit account, active offer, valid risk assessment) in Redis
+    # Writes invalidate the user's entry, entries without any credit data live credit_eligibility_cache_negative_ttl_seconds
+    credit_eligibility_cache: bool = False
+    credit_eligibility_cache_ttl_seconds: int = 300
+    credit_eligibility_cache_negative_ttl_seconds: int = 60
+    # Validity of a risk assessment, both for the ones created on apply and by the re-scoring pipeline
+    risk_assessment_ttl_days: int = 15
+
+    # Credit model
+    # remote: external model server (mocked), logistic: in-process NumPy model loaded from credit_model_path
+    credit_model_backend: str = "remote"
+    credit_model_path: str = ""
+    # Collect concurrent predictions into batches of up to credit_model_batch_size items,
+    # waiting at most credit_model_batch_max_wait_ms for a batch to fill
+    credit_model_micro_batching: bool = False
+    credit_model_batch_size: int = 32
+    credit_model_batch_max_wait_ms: float = 5.0
+    credit_model_batch_max_queue_depth: int = 1024  # Predictions beyond this are rejected with 503
+    # Reuse risk scores of near-identical features, same model version and features equal up to
+    # credit_model_prediction_cache_significant_digits, in process LRU backed by Redis
+    credit_model_prediction_cache: bool = False
+    credit_model_prediction_cache_size: int = 10000
+    credit_model_prediction_cache_ttl_seconds: int = 86400
+    credit_model_prediction_cache_significant_digits: int = 3
+
+    # Credit pricing
+    # JSON pricing policy, see ecs/services/internal/pricing_policies/default.json (used when empty)
+    # The file is checked for changes every credit_pricing_policy_reload_seconds, edits apply without a restart
+    credit_pricing_policy_path: str = ""
+    credit_pricing_policy_reload_seconds: float = 5.0
+    # Offers precomputed by the re-scoring pipeline and kept in Redis, apply only validates and persists them
+    # Entries are dropped when emotional events of the user are ingested and expire after the ttl
+    credit_offer_precompute: bool = False
+    credit_offer_precompute_ttl_seconds: int = 86400
+
+    # Credit acceptance jobs
+    # Finished and failed jobs stay readable through /credit/jobs/{job_id} for credit_acceptance_result_ttl_seconds
+    credit_acceptance_result_ttl_seconds: int = 3600
+    # Longest a /credit/jobs/{job_id}/events stream waits for the job, keep it below the proxy read timeout
+    credit_acceptance_events_timeout_seconds: float = 30.0
+
+    # User notifications, channels are sent concurrently
+    notification_timeout_seconds: float = 5.0  # Per delivery attempt and channel
+    notification_retries: int = 2  # Attempts after a failed one, with exponential backoff
+    # RQ queue for notifications, empty sends them from the job that triggers them
+    notification_queue: str = ""
+
+    # Portfolio re-scoring, see ecs/workers/rescoring.py
+    # Users whose risk assessments all expire within rescoring_refresh_ahead_days get a new one
+    rescoring_refresh_ahead_days: int = 2
+    rescoring_chunk_size: int = 1000
+    rescoring_workers: int = 4  # Worker processes scoring chunks in parallel, 0 scores in the calling process
 
     @property
     def is_development(self) -> bool:
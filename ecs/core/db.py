@@ -11,7 +11,11 @@ from functools import lru_cache
 from ecs.core.config import settings
 
 # Database setup
-engine: AsyncEngine = create_async_engine(settings.DB_URL)
+engine: AsyncEngine = create_async_engine(
+    settings.DB_URL,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow
+)
 SessionLocal: async_sessionmaker[AsyncSession] = async_sessionmaker(
     bind=engine, 
     autoflush=False, 
@@ -36,6 +40,10 @@ async def get_async_db_session()  -> AsyncGenerator[AsyncSession, Any]:
         finally:
             await session.close()
 
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Session factory, for work that needs more than the request's session, e.g. concurrent reads"""
+    return SessionLocal
+
 # Not used, but can be used if there's a need to store anything on Redis
 async def get_redis_client() -> AsyncGenerator[redis.Redis, Any]:
     """Get Redis client with connection pooling (async)."""
@@ -56,7 +64,7 @@ def _get_rq_queue_singleton(queue_name: str = "ecs:offers") -> Queue:
         max_connections=20,
         socket_connect_timeout=5,
         socket_timeout=5,
-        decode_responses=True,
+        # RQ stores pickled job data, responses must stay bytes for jobs to be read back
     )
     sync_client = redis_sync.Redis(connection_pool=sync_pool)
     return Queue(name=queue_name, connection=sync_client)
@@ -66,5 +74,6 @@ def get_rq_queue() -> Queue:
     return _get_rq_queue_singleton()
 
 AsyncSessionDep: TypeAlias = Annotated[AsyncSession, Depends(get_async_db_session)]
+AsyncSessionFactoryDep: TypeAlias = Annotated[async_sessionmaker[AsyncSession], Depends(get_async_session_factory)]
 RedisDep: TypeAlias = Annotated[redis.Redis, Depends(get_redis_client)]
 RQQueueDep: TypeAlias = Annotated[Queue, Depends(get_rq_queue)]
\ No newline at end of file
@@ -193,12 +193,12 @@ def _get_status_code_for_domain_exception(exc: "BaseDomainError") -> int:
 
 def _get_status_code_for_service_exception(exc: "BaseServiceError") -> int:
     """Map service exception types to HTTP status codes"""
-    from ecs.services import BusinessLogicError, UnauthorizedError, ForbiddenError 
+    from ecs.services import BusinessLogicError, UnauthorizedError, ForbiddenError, ServiceOverloadedError
 
     if isinstance(exc, BusinessLogicError):
         from ecs.services import (
             CreditAccountExistsError, ActiveCreditOfferExistsError, 
-            NoActiveCreditOfferExistsError, ExpiredCreditOfferError
+            NoActiveCreditOfferExistsError, ExpiredCreditOfferError, CreditAcceptanceNotFoundError
         )
         
         if isinstance(exc, ActiveCreditOfferExistsError):
@@ -207,6 +207,8 @@ def _get_status_code_for_service_exception(exc: "BaseServiceError") -> int:
             return status.HTTP_409_CONFLICT
         if isinstance(exc, NoActiveCreditOfferExistsError):
             return status.HTTP_404_NOT_FOUND
+        if isinstance(exc, CreditAcceptanceNotFoundError):
+            return status.HTTP_404_NOT_FOUND
         if isinstance(exc, ExpiredCreditOfferError):
             return status.HTTP_422_UNPROCESSABLE_ENTITY
         
@@ -218,6 +220,9 @@ def _get_status_code_for_service_exception(exc: "BaseServiceError") -> int:
     
     if isinstance(exc, ForbiddenError):
         return status.HTTP_403_FORBIDDEN
+
+    if isinstance(exc, ServiceOverloadedError):
+        return status.HTTP_503_SERVICE_UNAVAILABLE
     
     return status.HTTP_500_INTERNAL_SERVER_ERROR
 
@@ -0,0 +1,108 @@
+import asyncio
+from functools import lru_cache
+from typing import Annotated, Awaitable, Callable, TypeAlias
+
+import structlog
+import redis.asyncio as redis
+from fastapi import Depends
+from redis.exceptions import LockError, RedisError
+
+from ecs.core.config import settings
+from ecs.core.db import redis_pool
+
+class SingleFlight:
+    """Coalesces concurrent calls sharing a key, so only one of them does the work
+
+    Within a process, callers arriving while a call is in flight await its result instead of running again.
+    Across processes, the call runs under a Redis lock so duplicates on other workers wait for the first
+    one to finish and then run, by which time they normally find its persisted result.
+    Without a Redis client, only in-process coalescing is done
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis | None,
+        namespace: str,
+        lease_seconds: float,
+        wait_seconds: float
+    ) -> None:
+        self.redis = redis_client
+        self.namespace = namespace
+        self.lease_seconds = lease_seconds
+        self.wait_seconds = wait_seconds
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    async def do[T](self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        logger = structlog.get_logger()
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            logger.debug("Joining in flight call", single_flight_key=key)
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # Only the leader was cancelled, e.g. its request was aborted, this caller takes the call over
+                if asyncio.current_task().cancelling():
+                    raise
+                logger.debug("In flight call cancelled, running it again", single_flight_key=key)
+                return await self.do(key, fn)
+
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting, mark the outcome as retrieved
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[key] = future
+        try:
+            result = await self._run_locked(key, fn)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def _run_locked[T](self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        logger = structlog.get_logger()
+        if self.redis is None:
+            return await fn()
+
+        # The lease bounds how long a crashed holder blocks the key
+        lock = self.redis.lock(
+            f"{self.namespace}:{key}",
+            timeout=self.lease_seconds,
+            blocking_timeout=self.wait_seconds
+        )
+        try:
+            acquired = await lock.acquire()
+        except RedisError as e:
+            logger.warning("Single flight lock unavailable, running without it", single_flight_key=key, error=str(e))
+            acquired = False
+        else:
+            if not acquired:
+                logger.warning("Timed out waiting for single flight lock, running anyway", single_flight_key=key)
+
+        try:
+            return await fn()
+        finally:
+            if acquired:
+                try:
+                    await lock.release()
+                except (LockError, RedisError) as e:
+                    # Lease expired before the call finished, another holder may own the key by now
+                    logger.warning("Failed to release single flight lock", single_flight_key=key, error=str(e))
+
+@lru_cache(maxsize=1)
+def get_credit_apply_single_flight() -> SingleFlight:
+    """Process-wide coalescing of credit applications, keyed by user"""
+    return SingleFlight(
+        redis_client=redis.Redis(connection_pool=redis_pool),
+        namespace="ecs:single-flight:credit-apply",
+        lease_seconds=settings.credit_apply_single_flight_lease_seconds,
+        wait_seconds=settings.credit_apply_single_flight_wait_seconds
+    )
+
+CreditApplySingleFlightDep: TypeAlias = Annotated[SingleFlight, Depends(get_credit_apply_single_flight)]
@@ -10,6 +10,7 @@ from ecs.models.domain.emotion import DBEmotionalEvent
 from ecs.models.domain.transactions import DBTransaction
 from ecs.models.domain.credit import DBRiskAssessment, DBCreditOffer, DBCreditAccount
 from ecs.models.domain.client import DBClient
+from ecs.models.domain.features import DBEmotionalFeatureBucket
 
 __all__ = [
     "Base",
@@ -20,4 +21,5 @@ __all__ = [
     "DBRiskAssessment",
     "DBCreditOffer", 
     "DBCreditAccount",
+    "DBEmotionalFeatureBucket",
 ]
\ No newline at end of file
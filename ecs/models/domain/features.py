@@ -0,0 +1,56 @@
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Float, Integer, Index, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ecs.models.domain import Base
+
+
+class DBEmotionalFeatureBucket(Base):
+    """Running emotional feature state of a user for a single UTC day
+
+    Updated incrementally at ingest time, so emotional features can be read from
+    a handful of buckets instead of being recomputed from every emotional event.
+    """
+    __tablename__ = "emotional_feature_buckets"
+
+    # Composite primary key, one bucket per user and day
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    bucket_date: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    # Running counts and sums
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    valence_sum: Mapped[float] = mapped_column(Float, nullable=False)
+    valence_sq_sum: Mapped[float] = mapped_column(Float, nullable=False)
+    stress_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    positive_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Volatility state, sum of |valence delta| between consecutive events inside the bucket
+    # plus the boundary valences needed to chain consecutive buckets together
+    valence_abs_change_sum: Mapped[float] = mapped_column(Float, nullable=False)
+    first_valence: Mapped[float] = mapped_column(Float, nullable=False)
+    last_valence: Mapped[float] = mapped_column(Float, nullable=False)
+    first_captured_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_captured_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    # Timestamps
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+
+    # Indexes
+    __table_args__ = (
+        Index("ix_emotional_feature_buckets_bucket_date", "bucket_date"), # Pruning of buckets older than any feature window
+    )
+
+    def __repr__(self) -> str:
+        return f"<EmotionalFeatureBucket(user_id={self.user_id}, bucket_date={self.bucket_date}, event_count={self.event_count})>"
@@ -1,11 +1,17 @@
 from ecs.models.schemas.user import UserLogin
 from ecs.models.schemas.token import TokenData, TokenResponse, PrincipalType
-from ecs.models.schemas.emotion import EmotionalEvent, PrimaryEmotion
+from ecs.models.schemas.emotion import (
+    EmotionalEvent, EmotionalEventIngestResult, PrimaryEmotion, EMOTIONAL_EVENTS_ADAPTER, parse_emotional_events
+)
 from ecs.models.schemas.client import Client
-from ecs.models.schemas.features import Features
+from ecs.models.schemas.features import (
+    Features, TransactionColumns, EmotionalEventColumns, TransactionAggregates, EmotionalAggregates,
+    EmotionalFeatureBucket, FeatureTable, FEATURE_NAMES
+)
 from ecs.models.schemas.credit import (
     CreditOfferResponse, RiskAssessment, CreditOffer, RiskCategory, CreditOfferStatus, CreditType,
-    CreditOfferResponse, CreditAcceptResponse
+    CreditOfferResponse, CreditAcceptResponse, CreditAcceptJobStatus, CreditAcceptanceOutcome, CreditEligibility, CreditOfferBatch, PrecomputedOffer, RISK_CATEGORY_THRESHOLDS,
+    risk_categories_for
 )
 
 __all__ = [
@@ -14,14 +20,31 @@ __all__ = [
     "TokenResponse", 
     "PrincipalType",
     "EmotionalEvent",
+    "EmotionalEventIngestResult",
     "PrimaryEmotion",
+    "EMOTIONAL_EVENTS_ADAPTER",
+    "parse_emotional_events",
     "Client",
     "Features",
+    "TransactionColumns",
+    "EmotionalEventColumns",
+    "TransactionAggregates",
+    "EmotionalAggregates",
+    "EmotionalFeatureBucket",
+    "FeatureTable",
+    "FEATURE_NAMES",
     "RiskAssessment",
     "CreditOffer",
     "CreditOfferResponse",
     "RiskCategory", 
     "CreditOfferStatus", 
     "CreditType",
-    "CreditAcceptResponse"
+    "CreditAcceptResponse",
+    "CreditAcceptJobStatus",
+    "CreditAcceptanceOutcome",
+    "CreditEligibility",
+    "CreditOfferBatch",
+    "PrecomputedOffer",
+    "RISK_CATEGORY_THRESHOLDS",
+    "risk_categories_for"
 ]
@@ -1,8 +1,14 @@
 import uuid
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
+import numpy as np
 from pydantic import BaseModel, Field
 from enum import StrEnum
 
+if TYPE_CHECKING:
+    from ecs.models.domain import DBCreditOffer, DBRiskAssessment
+
 class RiskCategory(StrEnum):
     very_low_risk = "Very Low Risk"
     low_risk = "Low Risk"
@@ -19,19 +25,36 @@ class CreditType(StrEnum):
     short_term = "Short term"
     long_term = "Long term"
 
+class CreditAcceptanceOutcome(StrEnum):
+    account_created = "Account created"
+    offer_unavailable = "Offer unavailable"
+    account_exists = "Account exists"
+
+# Lower bound of the risk score for each category, checked from the highest
+RISK_CATEGORY_THRESHOLDS = (
+    (0.75, RiskCategory.high_risk),
+    (0.50, RiskCategory.medium_risk),
+    (0.25, RiskCategory.low_risk),
+)
+
+def risk_categories_for(risk_scores: np.ndarray) -> np.ndarray:
+    """Elementwise RiskAssessment.risk_category for an array of risk scores"""
+    risk_scores = np.asarray(risk_scores, dtype=np.float64)
+    return np.select(
+        [risk_scores >= threshold for threshold, _ in RISK_CATEGORY_THRESHOLDS],
+        [np.array(category, dtype=object) for _, category in RISK_CATEGORY_THRESHOLDS],
+        default=np.array(RiskCategory.very_low_risk, dtype=object)
+    )
+
 class RiskAssessment(BaseModel):
     risk_score: float = Field(ge=0, le=1, description="Risk score")
 
     @property
     def risk_category(self) -> str:
-        if self.risk_score >= 0.75:
-            return RiskCategory.high_risk
-        elif self.risk_score >= 0.50:
-            return RiskCategory.medium_risk
-        elif self.risk_score >= 0.25:
-            return RiskCategory.low_risk
-        else:
-            return RiskCategory.very_low_risk
+        for threshold, category in RISK_CATEGORY_THRESHOLDS:
+            if self.risk_score >= threshold:
+                return category
+        return RiskCategory.very_low_risk
             
 class CreditOffer(BaseModel):
     status: CreditOfferStatus = Field(description="Credit offer status")
@@ -39,6 +62,16 @@ class CreditOffer(BaseModel):
     credit_limit: float | None = Field(default=None, description="Credit limit")
     apr: float | None = Field(default=None, ge=0, le=1, description="Annual percentage interest rate")
 
+class PrecomputedOffer(BaseModel):
+    """Offer terms computed ahead of an application
+
+    Usable as long as the user's valid risk assessment and the pricing policy are the ones it was computed with
+    """
+    user_id: uuid.UUID
+    risk_assessment_id: uuid.UUID
+    pricing_policy_version: str
+    offer: CreditOffer
+
 class CreditOfferResponse(CreditOffer):
     id: uuid.UUID
     user_id: uuid.UUID
@@ -47,4 +80,49 @@ class CreditAcceptResponse(BaseModel):
     id: str
     offer_id: str
     status: str
-    message: str
\ No newline at end of file
+    message: str
+
+# RQ job statuses after which a job does not change anymore
+CREDIT_ACCEPT_JOB_DONE_STATUSES = frozenset({"finished", "failed", "stopped", "canceled"})
+
+class CreditAcceptJobStatus(BaseModel):
+    """State of a credit acceptance job, status is the RQ job status"""
+    id: str
+    offer_id: str
+    status: str
+    outcome: CreditAcceptanceOutcome | None = Field(default=None, description="Result of a finished job")
+
+    @property
+    def done(self) -> bool:
+        return self.status in CREDIT_ACCEPT_JOB_DONE_STATUSES
+
+@dataclass(frozen=True, slots=True)
+class CreditEligibility:
+    """Everything the apply and accept flows check before doing any work, read in a single query"""
+    has_credit_account: bool
+    active_offer: "DBCreditOffer | None"
+    valid_risk_assessment: "DBRiskAssessment | None"
+
+@dataclass(frozen=True, slots=True)
+class CreditOfferBatch:
+    """Offers priced in bulk, one position per user
+
+    Denied positions hold NaN credit limit and apr and a None credit type
+    """
+    statuses: np.ndarray
+    credit_limits: np.ndarray
+    aprs: np.ndarray
+    credit_types: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.statuses)
+
+    def to_credit_offer(self, position: int) -> CreditOffer:
+        if self.statuses[position] != CreditOfferStatus.offered:
+            return CreditOffer(status=self.statuses[position])
+        return CreditOffer(
+            status=self.statuses[position],
+            credit_limit=float(self.credit_limits[position]),
+            apr=float(self.aprs[position]),
+            credit_type=self.credit_types[position]
+        )
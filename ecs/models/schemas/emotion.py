@@ -3,7 +3,7 @@ from datetime import datetime
 from enum import StrEnum
 from typing import Dict, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 # https://en.wikipedia.org/wiki/Emotion_classification
 # -> Paul Ekman identified six basic emotions: anger, disgust, fear, happiness, sadness and surprise.
@@ -36,4 +36,20 @@ class EmotionalEvent(BaseModel):
 
     # Dimensional representation (normalized)
     arousal: float = Field(ge=0.0, le=1.0)
-    valence: float = Field(ge=0.0, le=1.0)
\ No newline at end of file
+    valence: float = Field(ge=0.0, le=1.0)
+
+# Built once, the validators are compiled when the adapter is created
+EMOTIONAL_EVENTS_ADAPTER = TypeAdapter(list[EmotionalEvent])
+
+def parse_emotional_events(payload: bytes) -> list[EmotionalEvent]:
+    """
+    Decode and validate a JSON array of emotional events in one pass, straight from the raw bytes.
+
+    Raises pydantic.ValidationError (a ValueError) for malformed JSON as well as for invalid events.
+    """
+    return EMOTIONAL_EVENTS_ADAPTER.validate_json(payload)
+
+class EmotionalEventIngestResult(BaseModel):
+    """Outcome of an ingest, events already stored (e.g. redelivered ones) count as duplicates"""
+    inserted: int
+    duplicates: int
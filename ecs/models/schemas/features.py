@@ -1,3 +1,8 @@
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+
+import numpy as np
 from pydantic import BaseModel, Field
 
 class Features(BaseModel):
@@ -18,4 +23,88 @@ class Features(BaseModel):
     spending_pattern_change: float = Field(ge=-1, le=1, description="Spending pattern change (-1=decreasing, 0=stable, 1=increasing)")
 
     # Derived features
-    emotional_spending_correlation: float = Field(ge=-1, le=1, description="Emotional spending correlation (-1=negative, 0=no correlation, 1=positive)")
\ No newline at end of file
+    emotional_spending_correlation: float = Field(ge=-1, le=1, description="Emotional spending correlation (-1=negative, 0=no correlation, 1=positive)")
+
+FEATURE_NAMES: tuple[str, ...] = tuple(Features.model_fields)
+
+# Columnar inputs, packed once per request so every feature kernel works on contiguous arrays
+# Rows of several users can share the same columns, owners maps each row to its user
+
+@dataclass(frozen=True, slots=True)
+class TransactionColumns:
+    """Transactions, one array entry per transaction"""
+    owners: np.ndarray       # int64 index of the transaction's user, all zeros for a single user
+    amounts: np.ndarray      # float64 amount
+    timestamps: np.ndarray   # float64 POSIX timestamp of occurred_at
+    days: np.ndarray         # int64 calendar day ordinal of occurred_at
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+@dataclass(frozen=True, slots=True)
+class EmotionalEventColumns:
+    """Emotional events, one array entry per event"""
+    owners: np.ndarray             # int64 index of the event's user, all zeros for a single user
+    valences: np.ndarray           # float64 valence
+    arousals: np.ndarray           # float64 arousal
+    timestamps: np.ndarray         # float64 POSIX timestamp of captured_at
+    is_stress_emotion: np.ndarray  # bool, primary emotion is a stress emotion
+    is_positive_emotion: np.ndarray  # bool, primary emotion is a positive emotion
+
+    def __len__(self) -> int:
+        return len(self.valences)
+
+# Sufficient statistics, every feature can be derived from these without revisiting the raw rows
+# Fields may be scalars (single user) or aligned arrays (one entry per user)
+
+@dataclass(frozen=True, slots=True)
+class TransactionAggregates:
+    count: int
+    total_amount: float
+    max_amount: float
+    stddev_amount: float      # Sample standard deviation, 0 when count < 2
+    active_days: int          # Distinct calendar days with at least one transaction
+    older_half_mean: float    # Mean amount of the oldest count // 2 transactions
+    recent_half_mean: float   # Mean amount of the remaining, most recent transactions
+
+@dataclass(frozen=True, slots=True)
+class EmotionalAggregates:
+    count: int
+    valence_sum: float
+    stress_count: int
+    positive_count: int
+    valence_abs_change_sum: float     # Sum of |valence delta| between consecutive events in capture order
+    older_half_valence_mean: float    # Mean valence of the oldest count // 2 events
+    recent_half_valence_mean: float   # Mean valence of the remaining, most recent events
+
+@dataclass(frozen=True, slots=True)
+class EmotionalFeatureBucket:
+    """Emotional feature state contributed by a batch of events to one user and UTC day"""
+    user_id: uuid.UUID
+    bucket_date: date
+    event_count: int
+    valence_sum: float
+    valence_sq_sum: float
+    stress_count: int
+    positive_count: int
+    valence_abs_change_sum: float
+    first_valence: float
+    last_valence: float
+    first_captured_at: datetime
+    last_captured_at: datetime
+
+@dataclass(frozen=True, slots=True)
+class FeatureTable:
+    """Features of many users as a single matrix, one row per user and one column per feature"""
+    user_ids: list[uuid.UUID]
+    values: np.ndarray  # float64 (len(user_ids), len(FEATURE_NAMES)), columns in FEATURE_NAMES order
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, FEATURE_NAMES.index(name)]
+
+    def to_features(self, position: int) -> Features:
+        """Materialize a single row, only meant for the occasional user"""
+        return Features(**dict(zip(FEATURE_NAMES, self.values[position].tolist())))
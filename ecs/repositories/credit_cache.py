@@ -0,0 +1,205 @@
+import asyncio
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Annotated, Any, Awaitable, Callable, Iterable, TypeAlias
+
+import structlog
+import redis as redis_sync
+import redis.asyncio as redis
+from fastapi import Depends
+from pydantic_core import from_json, to_json
+from redis.exceptions import RedisError
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ecs.core.config import settings
+from ecs.core.db import redis_pool
+from ecs.core.single_flight import SingleFlight
+from ecs.models.domain import Base, DBCreditOffer, DBRiskAssessment
+from ecs.models.schemas import CreditEligibility
+
+# Pending post-commit invalidations, kept on the session
+_PENDING_INVALIDATIONS = "credit_eligibility_cache_pending"
+
+def credit_eligibility_cache_key(user_id: uuid.UUID | str) -> str:
+    return f"ecs:credit-eligibility:{user_id}"
+
+class CreditEligibilityCache:
+    """Read-through Redis cache of CreditRepository.get_credit_eligibility, one entry per user
+
+    Entries without any credit data (no account, offer or risk assessment) are cached for
+    negative_ttl_seconds, the others for ttl_seconds but never past the expiry of their offer or assessment.
+    Misses of the same user are loaded once, concurrent callers wait for that load (see SingleFlight).
+    Writes invalidate the user's entry right away and once more after their transaction commits, so a
+    reader racing the write cannot leave the old state behind. Hits hand out detached instances
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        single_flight: SingleFlight,
+        ttl_seconds: int,
+        negative_ttl_seconds: int
+    ) -> None:
+        self.redis = redis_client
+        self.single_flight = single_flight
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._invalidations: set[asyncio.Task] = set()
+
+    async def get_or_load(
+        self, user_id: uuid.UUID, load: Callable[[], Awaitable[CreditEligibility]]
+    ) -> CreditEligibility:
+        payload = await self._get(user_id)
+        if payload is None:
+            payload = await self.single_flight.do(str(user_id), lambda: self._load_and_store(user_id, load))
+        else:
+            structlog.get_logger().debug("Credit eligibility cache hit")
+        return _decode(payload)
+
+    async def invalidate(self, user_ids: Iterable[uuid.UUID]) -> None:
+        keys = [credit_eligibility_cache_key(user_id) for user_id in set(user_ids)]
+        if not keys:
+            return
+        try:
+            await self.redis.delete(*keys)
+        except RedisError as e:
+            # The entries still expire after their ttl
+            structlog.get_logger().warning("Failed to invalidate credit eligibility cache", count=len(keys), error=str(e))
+
+    async def invalidate_on_write(self, user_ids: Iterable[uuid.UUID], db: AsyncSession) -> None:
+        """Invalidate now and again once the session commits"""
+        user_ids = set(user_ids)
+        await self.invalidate(user_ids)
+
+        sync_session = db.sync_session
+        pending: set[uuid.UUID] | None = sync_session.info.get(_PENDING_INVALIDATIONS)
+        if pending is None:
+            pending = sync_session.info[_PENDING_INVALIDATIONS] = set()
+            event.listen(sync_session, "after_commit", self._after_commit)
+            event.listen(sync_session, "after_rollback", self._after_rollback)
+        pending.update(user_ids)
+
+    def _after_commit(self, session: Session) -> None:
+        pending = session.info.get(_PENDING_INVALIDATIONS)
+        if not pending:
+            return
+        user_ids = set(pending)
+        pending.clear()
+        # Commit runs inside the event loop thread, the delete is sent without holding the commit up
+        task = asyncio.get_running_loop().create_task(self.invalidate(user_ids))
+        self._invalidations.add(task)
+        task.add_done_callback(self._invalidations.discard)
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.get(_PENDING_INVALIDATIONS, set()).clear()
+
+    async def _load_and_store(self, user_id: uuid.UUID, load: Callable[[], Awaitable[CreditEligibility]]) -> dict[str, Any]:
+        # Another worker may have filled the entry while this one waited for the lock
+        payload = await self._get(user_id)
+        if payload is not None:
+            return payload
+
+        eligibility = await load()
+        payload = _encode(eligibility)
+        ttl_seconds = self._ttl_seconds(eligibility)
+        if ttl_seconds > 0:
+            try:
+                await self.redis.set(credit_eligibility_cache_key(user_id), to_json(payload), ex=ttl_seconds)
+            except RedisError as e:
+                structlog.get_logger().warning("Failed to store credit eligibility", error=str(e))
+        return payload
+
+    async def _get(self, user_id: uuid.UUID) -> dict[str, Any] | None:
+        try:
+            value = await self.redis.get(credit_eligibility_cache_key(user_id))
+        except RedisError as e:
+            structlog.get_logger().warning("Credit eligibility cache unavailable", error=str(e))
+            return None
+        return None if value is None else from_json(value)
+
+    def _ttl_seconds(self, eligibility: CreditEligibility) -> int:
+        expirations = [
+            row.expires_at for row in (eligibility.active_offer, eligibility.valid_risk_assessment) if row is not None
+        ]
+        if not expirations and not eligibility.has_credit_account:
+            return self.negative_ttl_seconds
+
+        ttl_seconds = self.ttl_seconds
+        for expires_at in expirations:
+            now = datetime.now(expires_at.tzinfo) if expires_at.tzinfo else datetime.now()
+            ttl_seconds = min(ttl_seconds, int((expires_at - now).total_seconds()))
+        return ttl_seconds
+
+def _encode_row(row: Base | None) -> dict[str, Any] | None:
+    if row is None:
+        return None
+    return {attribute.key: getattr(row, attribute.key) for attribute in inspect(row).mapper.column_attrs}
+
+def _decode_row[M: Base](model: type[M], values: dict[str, Any] | None) -> M | None:
+    if values is None:
+        return None
+    columns = inspect(model).column_attrs
+    decoded = {}
+    for key, value in values.items():
+        python_type = columns[key].expression.type.python_type
+        if value is None or isinstance(value, python_type):
+            decoded[key] = value
+        elif python_type is datetime:
+            decoded[key] = datetime.fromisoformat(value)
+        elif python_type in (uuid.UUID, Decimal):
+            decoded[key] = python_type(value)
+        else:
+            decoded[key] = value
+    return model(**decoded)
+
+def _encode(eligibility: CreditEligibility) -> dict[str, Any]:
+    return {
+        "has_credit_account": eligibility.has_credit_account,
+        "active_offer": _encode_row(eligibility.active_offer),
+        "valid_risk_assessment": _encode_row(eligibility.valid_risk_assessment)
+    }
+
+def _decode(payload: dict[str, Any]) -> CreditEligibility:
+    return CreditEligibility(
+        has_credit_account=payload["has_credit_account"],
+        active_offer=_decode_row(DBCreditOffer, payload["active_offer"]),
+        valid_risk_assessment=_decode_row(DBRiskAssessment, payload["valid_risk_assessment"])
+    )
+
+@lru_cache(maxsize=1)
+def get_credit_eligibility_cache() -> CreditEligibilityCache | None:
+    """Process-wide credit eligibility cache, None when disabled"""
+    if not settings.credit_eligibility_cache:
+        return None
+    redis_client = redis.Redis(connection_pool=redis_pool)
+    return CreditEligibilityCache(
+        redis_client=redis_client,
+        # A load is a single indexed query, waiting longer than a few of them is not worth it
+        single_flight=SingleFlight(
+            redis_client=redis_client,
+            namespace="ecs:single-flight:credit-eligibility",
+            lease_seconds=5.0,
+            wait_seconds=1.0
+        ),
+        ttl_seconds=settings.credit_eligibility_cache_ttl_seconds,
+        negative_ttl_seconds=settings.credit_eligibility_cache_negative_ttl_seconds
+    )
+
+@lru_cache(maxsize=1)
+def _get_sync_redis_client() -> redis_sync.Redis:
+    return redis_sync.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=5, socket_timeout=5)
+
+def invalidate_credit_eligibility_sync(user_id: uuid.UUID) -> None:
+    """For synchronous writers such as RQ jobs, call after the commit"""
+    if not settings.credit_eligibility_cache:
+        return
+    try:
+        _get_sync_redis_client().delete(credit_eligibility_cache_key(user_id))
+    except RedisError as e:
+        structlog.get_logger().warning("Failed to invalidate credit eligibility cache", error=str(e))
+
+CreditEligibilityCacheDep: TypeAlias = Annotated[CreditEligibilityCache | None, Depends(get_credit_eligibility_cache)]
@@ -1,21 +1,31 @@
 import uuid
-from typing import override
+from functools import partial
+from typing import AsyncIterator, Sequence, override
 from datetime import datetime
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import exists, insert, select, true
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import aliased
 from structlog.contextvars import bind_contextvars
 
-from ecs.models.schemas.credit import CreditOfferStatus
+from ecs.models.schemas.credit import CreditOfferStatus, CreditEligibility
 from ecs.repositories.interfaces import ICreditRepository
+from ecs.repositories.credit_cache import CreditEligibilityCacheDep
 from ecs.repositories.exceptions import DatabaseError, NotFoundError
-from ecs.models.domain import DBCreditOffer, DBCreditAccount, DBRiskAssessment
+from ecs.models.domain import DBCreditOffer, DBCreditAccount, DBRiskAssessment, DBUser
 
 class CreditRepository(ICreditRepository):
     """Repository for credit-related database operations"""
 
+    def __init__(self, cache: CreditEligibilityCacheDep = None) -> None:
+        self.cache = cache
+
+    async def _invalidate(self, user_ids: Sequence[uuid.UUID], db: AsyncSession) -> None:
+        if self.cache is not None:
+            await self.cache.invalidate_on_write(user_ids, db)
+
     @override
     async def get_active_credit_offer_for_user(self, user_id: uuid.UUID, db: AsyncSession) -> DBCreditOffer | None:
         """
@@ -57,6 +67,7 @@ class CreditRepository(ICreditRepository):
             db.add(credit_offer)
             await db.flush()  # Get the ID without committing
             await db.refresh(credit_offer)
+            await self._invalidate([credit_offer.user_id], db)
             
             logger.debug("Credit offer created", offer_id=credit_offer.id, user_id=credit_offer.user_id)
             return
@@ -98,6 +109,7 @@ class CreditRepository(ICreditRepository):
             db.add(credit_account)
             await db.flush()  # Get the ID without committing
             await db.refresh(credit_account)
+            await self._invalidate([credit_account.user_id], db)
             
             logger.debug("Credit account created", account_id=credit_account.id, user_id=credit_account.user_id)
             return
@@ -122,6 +134,7 @@ class CreditRepository(ICreditRepository):
             
             offer.status = status
             await db.flush()
+            await self._invalidate([offer.user_id], db)
             
             logger.debug("Credit offer status updated", offer_id=offer_id, status=status)
             
@@ -138,6 +151,7 @@ class CreditRepository(ICreditRepository):
             db.add(risk_assessment)
             await db.flush()  # Get the ID without committing
             await db.refresh(risk_assessment)
+            await self._invalidate([risk_assessment.user_id], db)
             
             bind_contextvars(risk_assessment_id=risk_assessment.id, user_id=risk_assessment.user_id)
             logger.debug("Risk assessment created")
@@ -171,4 +185,129 @@ class CreditRepository(ICreditRepository):
             return risk_assessment
             
         except SQLAlchemyError as e:
-            raise DatabaseError(f"Database error getting valid risk assessment: {e}", original_error=e)
\ No newline at end of file
+            raise DatabaseError(f"Database error getting valid risk assessment: {e}", original_error=e)
+
+    @override
+    async def get_credit_eligibility(self, user_id: uuid.UUID, db: AsyncSession) -> CreditEligibility:
+        """
+        Retrieve the credit account flag, the active credit offer and the valid risk assessment
+        of a user in a single round trip.
+        Same conditions as get_credit_account_for_user, get_active_credit_offer_for_user and
+        get_valid_risk_assessment, the offer and assessment are joined laterally on the user row.
+        Read through the credit eligibility cache when enabled, cached offers and assessments are detached.
+        """
+        if self.cache is not None:
+            return await self.cache.get_or_load(user_id, partial(self._get_credit_eligibility, user_id, db))
+        return await self._get_credit_eligibility(user_id, db)
+
+    async def _get_credit_eligibility(self, user_id: uuid.UUID, db: AsyncSession) -> CreditEligibility:
+        logger = structlog.get_logger()
+        logger.debug("Retrieving credit eligibility for user")
+
+        now = datetime.now()
+        active_offer = select(DBCreditOffer).where(
+            DBCreditOffer.user_id == DBUser.id,
+            DBCreditOffer.status.in_([CreditOfferStatus.offered, CreditOfferStatus.denied]),
+            now < DBCreditOffer.expires_at,
+        ).limit(1).lateral("active_offer")
+        valid_risk_assessment = select(DBRiskAssessment).where(
+            DBRiskAssessment.user_id == DBUser.id,
+            now < DBRiskAssessment.expires_at
+        ).order_by(DBRiskAssessment.created_at.desc()).limit(1).lateral("valid_risk_assessment")
+
+        ActiveOffer = aliased(DBCreditOffer, active_offer)
+        ValidRiskAssessment = aliased(DBRiskAssessment, valid_risk_assessment)
+        query = (
+            select(
+                exists().where(DBCreditAccount.user_id == DBUser.id).label("has_credit_account"),
+                ActiveOffer,
+                ValidRiskAssessment
+            )
+            .select_from(DBUser)
+            .outerjoin(active_offer, true())
+            .outerjoin(valid_risk_assessment, true())
+            .where(DBUser.id == user_id)
+        )
+
+        try:
+            result = await db.execute(query)
+            row = result.one_or_none()
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Database error retrieving credit eligibility: {e}", original_error=e)
+
+        if row is None:
+            logger.debug("User not found, no credit data")
+            return CreditEligibility(has_credit_account=False, active_offer=None, valid_risk_assessment=None)
+
+        eligibility = CreditEligibility(
+            has_credit_account=row.has_credit_account,
+            active_offer=row[1],
+            valid_risk_assessment=row[2]
+        )
+        if eligibility.active_offer is not None:
+            bind_contextvars(offer_id=eligibility.active_offer.id, offer_status=eligibility.active_offer.status)
+        if eligibility.valid_risk_assessment is not None:
+            bind_contextvars(risk_assessment_id=eligibility.valid_risk_assessment.id)
+
+        logger.debug(
+            "Retrieved credit eligibility",
+            has_credit_account=eligibility.has_credit_account,
+            has_active_offer=eligibility.active_offer is not None,
+            has_valid_risk_assessment=eligibility.valid_risk_assessment is not None
+        )
+        return eligibility
+
+    @override
+    async def create_risk_assessments(
+        self, user_ids: Sequence[uuid.UUID], risk_scores: Sequence[float], expires_at: datetime, db: AsyncSession
+    ) -> list[uuid.UUID]:
+        """Insert the risk assessments of many users in a single bulk statement, returns their ids in order"""
+        logger = structlog.get_logger()
+        logger.debug("Creating risk assessments", count=len(user_ids))
+        if not user_ids:
+            return []
+
+        # Ids are generated here, no RETURNING round trip needed to know them
+        risk_assessment_ids = [uuid.uuid4() for _ in user_ids]
+        try:
+            await db.execute(
+                insert(DBRiskAssessment),
+                [
+                    {"id": risk_assessment_id, "user_id": user_id, "risk_score": risk_score, "expires_at": expires_at}
+                    for risk_assessment_id, user_id, risk_score in zip(risk_assessment_ids, user_ids, risk_scores, strict=True)
+                ]
+            )
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Database error creating risk assessments: {e}", original_error=e)
+
+        await self._invalidate(user_ids, db)
+        return risk_assessment_ids
+
+    @override
+    async def stream_user_ids_for_rescoring(
+        self, valid_until: datetime, chunk_size: int, db: AsyncSession
+    ) -> AsyncIterator[list[uuid.UUID]]:
+        """
+        Stream, in chunks of chunk_size, the ids of users without a credit account whose risk assessments
+        all expire before valid_until. Rows are fetched through a server-side cursor, the whole user base
+        is never loaded at once.
+        """
+        logger = structlog.get_logger()
+        logger.debug("Streaming user ids for rescoring", valid_until=valid_until.isoformat(), chunk_size=chunk_size)
+
+        query = (
+            select(DBUser.id)
+            .where(
+                ~exists().where(DBCreditAccount.user_id == DBUser.id),
+                ~exists().where(DBRiskAssessment.user_id == DBUser.id, DBRiskAssessment.expires_at >= valid_until)
+            )
+            .order_by(DBUser.id)
+            .execution_options(yield_per=chunk_size)
+        )
+
+        try:
+            result = await db.stream(query)
+            async for partition in result.scalars().partitions(chunk_size):
+                yield list(partition)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Database error streaming user ids for rescoring: {e}", original_error=e)
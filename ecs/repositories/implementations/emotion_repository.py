@@ -1,25 +1,118 @@
-from datetime import datetime
-from typing import Sequence, override
+from datetime import date, datetime, timezone
+from typing import Any, Sequence, override
 import uuid
 
 import structlog
+from sqlalchemy import Row, any_, bindparam, case, delete, func
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.sql import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from ecs.repositories.interfaces import IEmotionalEventsRepository
-from ecs.models.domain import DBEmotionalEvent
+from ecs.models.domain import DBEmotionalEvent, DBEmotionalFeatureBucket
+from ecs.models.schemas import EmotionalEvent, EmotionalFeatureBucket
 from ecs.repositories.exceptions import DatabaseError, EmotionalEventIngestionError
 
+# Only the columns read by feature engineering, returned as plain rows
+EMOTIONAL_EVENT_FEATURE_COLUMNS = (
+    DBEmotionalEvent.user_id,
+    DBEmotionalEvent.valence,
+    DBEmotionalEvent.arousal,
+    DBEmotionalEvent.emotion_primary,
+    DBEmotionalEvent.captured_at
+)
+
+# Columns written by ingest, each bound as one array parameter
+EMOTIONAL_EVENT_INGEST_COLUMNS = (
+    "id", "user_id", "event_id", "emotion_primary", "emotion_confidence", "arousal", "valence", "captured_at"
+)
+
+# INSERT ... SELECT * FROM unnest(:id_values, :user_id_values, ...), a whole batch is one statement with
+# one parameter per column, no ORM objects and no per row parameter binding
+# Events already stored are skipped, only the event ids actually inserted are returned
+_ingest_rows = func.unnest(*(
+    bindparam(f"{column}_values", type_=ARRAY(DBEmotionalEvent.__table__.c[column].type))
+    for column in EMOTIONAL_EVENT_INGEST_COLUMNS
+)).table_valued(*EMOTIONAL_EVENT_INGEST_COLUMNS).render_derived(name="events")
+INGEST_EMOTIONAL_EVENTS = (
+    insert(DBEmotionalEvent)
+    .from_select(EMOTIONAL_EVENT_INGEST_COLUMNS, select(*_ingest_rows.c))
+    .on_conflict_do_nothing(index_elements=[DBEmotionalEvent.event_id])
+    .returning(DBEmotionalEvent.event_id)
+)
+
+# Columns of a feature bucket increment, bound as arrays like the ingested events
+EMOTIONAL_FEATURE_BUCKET_COLUMNS = (
+    "user_id", "bucket_date", "event_count", "valence_sum", "valence_sq_sum", "stress_count", "positive_count",
+    "valence_abs_change_sum", "first_valence", "last_valence", "first_captured_at", "last_captured_at"
+)
+
+def _upsert_emotional_feature_buckets():
+    rows = func.unnest(*(
+        bindparam(f"{column}_values", type_=ARRAY(DBEmotionalFeatureBucket.__table__.c[column].type))
+        for column in EMOTIONAL_FEATURE_BUCKET_COLUMNS
+    )).table_valued(*EMOTIONAL_FEATURE_BUCKET_COLUMNS).render_derived(name="buckets")
+    stmt = insert(DBEmotionalFeatureBucket).from_select(EMOTIONAL_FEATURE_BUCKET_COLUMNS, select(*rows.c))
+    stored, new = DBEmotionalFeatureBucket, stmt.excluded
+
+    # Chain the increment to the stored state: after it when it arrived in order, before it when it is older
+    # Overlapping increments (out of order within the day) are chained at the end, which is approximate
+    boundary_change = case(
+        (new.last_captured_at <= stored.first_captured_at, func.abs(stored.first_valence - new.last_valence)),
+        else_=func.abs(new.first_valence - stored.last_valence)
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[stored.user_id, stored.bucket_date],
+        set_={
+            "event_count": stored.event_count + new.event_count,
+            "valence_sum": stored.valence_sum + new.valence_sum,
+            "valence_sq_sum": stored.valence_sq_sum + new.valence_sq_sum,
+            "stress_count": stored.stress_count + new.stress_count,
+            "positive_count": stored.positive_count + new.positive_count,
+            "valence_abs_change_sum": stored.valence_abs_change_sum + new.valence_abs_change_sum + boundary_change,
+            "first_valence": case(
+                (new.first_captured_at < stored.first_captured_at, new.first_valence), else_=stored.first_valence
+            ),
+            "last_valence": case(
+                (new.last_captured_at >= stored.last_captured_at, new.last_valence), else_=stored.last_valence
+            ),
+            "first_captured_at": func.least(stored.first_captured_at, new.first_captured_at),
+            "last_captured_at": func.greatest(stored.last_captured_at, new.last_captured_at),
+            "updated_at": func.now(),
+        }
+    )
+
+# Merges a batch of bucket increments in one statement with one parameter per column, whatever the bucket count
+UPSERT_EMOTIONAL_FEATURE_BUCKETS = _upsert_emotional_feature_buckets()
+
 class EmotionalEventsRepository(IEmotionalEventsRepository):
 
     @override
-    async def ingest(self, events: Sequence[DBEmotionalEvent], db: AsyncSession):
+    async def ingest(self, events: Sequence[EmotionalEvent], db: AsyncSession) -> set[uuid.UUID]:
+        """
+        Insert validated events in a single INSERT ... SELECT unnest statement, ids are generated here.
+        Events whose event_id is already stored are skipped, returns the event ids that were inserted.
+        """
         logger = structlog.get_logger()
-        
-        logger.debug("Inserting emotional events")
+        if not events:
+            return set()
+
+        logger.debug("Inserting emotional events", count=len(events))
+        # Rows go in event_id order, concurrent batches then take the unique index locks in the same order
+        events = sorted(events, key=lambda event: event.event_id)
+        parameters = {
+            "id_values": [uuid.uuid4() for _ in events],
+            "user_id_values": [event.user_id for event in events],
+            "event_id_values": [event.event_id for event in events],
+            "emotion_primary_values": [event.emotion_primary.value for event in events],
+            "emotion_confidence_values": [event.emotion_confidence for event in events],
+            "arousal_values": [event.arousal for event in events],
+            "valence_values": [event.valence for event in events],
+            "captured_at_values": [event.captured_at for event in events],
+        }
         try:
-            db.add_all(events)
+            result = await db.execute(INGEST_EMOTIONAL_EVENTS, parameters)
         except IntegrityError as e:
             raise EmotionalEventIngestionError(
                 f"Failed to insert emotional events: {e}",
@@ -28,8 +121,9 @@ class EmotionalEventsRepository(IEmotionalEventsRepository):
         except SQLAlchemyError as e:
             raise DatabaseError(f"Database error: {e}", original_error=e)
 
-        await db.flush()
-        logger.debug("Successfully inserted emotional events")
+        inserted_event_ids = set(result.scalars().all())
+        logger.debug("Successfully inserted emotional events", inserted=len(inserted_event_ids))
+        return inserted_event_ids
 
     @override
     async def get_recent_emotional_events(
@@ -62,4 +156,144 @@ class EmotionalEventsRepository(IEmotionalEventsRepository):
             return []
 
         logger.debug(f"Retrieved emotional events", count=len(events), since=since.isoformat() if since else "ever")
-        return events
\ No newline at end of file
+        return events
+
+    @override
+    async def get_recent_emotional_event_rows(
+        self,
+        user_id: uuid.UUID,
+        db: AsyncSession,
+        since: datetime | None = None,
+        limit: int | None = None
+    ) -> Sequence[Row[Any]]:
+        """
+        Same window as get_recent_emotional_events, but projected to
+        (user_id, valence, arousal, emotion_primary, captured_at) rows.
+        No ORM entities are built, so there is no identity map or unit of work overhead.
+        """
+        logger = structlog.get_logger()
+        logger.debug("Retrieving recent emotional event rows", since=since.isoformat() if since else "ever")
+
+        query = select(*EMOTIONAL_EVENT_FEATURE_COLUMNS).where(DBEmotionalEvent.user_id == user_id)
+        if since:
+            query = query.where(DBEmotionalEvent.captured_at > since)
+        if limit:
+            query = query.limit(limit)
+        query = query.order_by(DBEmotionalEvent.captured_at.desc())
+
+        try:
+            result = await db.execute(query)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Database error: {e}", original_error=e)
+
+        events = result.all()
+        logger.debug("Retrieved emotional event rows", count=len(events), since=since.isoformat() if since else "ever")
+        return events
+
+    @override
+    async def get_recent_emotional_events_for_users(
+        self,
+        user_ids: Sequence[uuid.UUID],
+        db: AsyncSession,
+        since: datetime | None = None,
+        limit: int | None = None
+    ) -> Sequence[Row[Any]]:
+        """
+        Retrieve the recent emotional events of many users in a single round trip.
+        Returns projected (user_id, valence, arousal, emotion_primary, captured_at) rows,
+        limit caps the number of events per user.
+        """
+        logger = structlog.get_logger()
+        logger.debug("Retrieving recent emotional events for users", users=len(user_ids), since=since.isoformat() if since else "ever")
+        if not user_ids:
+            return []
+
+        # One array parameter whatever the number of users, = ANY(:user_ids) rather than IN (...)
+        user_ids_param = bindparam("user_ids", list(user_ids), type_=ARRAY(DBEmotionalEvent.__table__.c.user_id.type))
+        recent = select(*EMOTIONAL_EVENT_FEATURE_COLUMNS).where(DBEmotionalEvent.user_id == any_(user_ids_param))
+        if since:
+            recent = recent.where(DBEmotionalEvent.captured_at > since)
+
+        if limit:
+            # Most recent events of each user
+            ranked = recent.add_columns(
+                func.row_number().over(
+                    partition_by=DBEmotionalEvent.user_id,
+                    order_by=DBEmotionalEvent.captured_at.desc()
+                ).label("position")
+            ).subquery("ranked")
+            query = select(
+                ranked.c.user_id, ranked.c.valence, ranked.c.arousal, ranked.c.emotion_primary, ranked.c.captured_at
+            ).where(ranked.c.position <= limit)
+        else:
+            query = recent
+
+        try:
+            result = await db.execute(query)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Database error: {e}", original_error=e)
+
+        events = result.all()
+        logger.debug("Retrieved emotional events for users", users=len(user_ids), count=len(events))
+        return events
+
+    @override
+    async def upsert_emotional_feature_buckets(self, buckets: Sequence[EmotionalFeatureBucket], db: AsyncSession) -> None:
+        """Merge bucket increments into the stored per user/day feature state in one statement"""
+        logger = structlog.get_logger()
+        if not buckets:
+            return
+
+        logger.debug("Updating emotional feature buckets", count=len(buckets))
+        # Rows go in key order, concurrent upserts of the same buckets then lock them in the same order
+        buckets = sorted(buckets, key=lambda bucket: (bucket.user_id, bucket.bucket_date))
+        parameters = {
+            f"{column}_values": [getattr(bucket, column) for bucket in buckets]
+            for column in EMOTIONAL_FEATURE_BUCKET_COLUMNS
+        }
+        try:
+            await db.execute(UPSERT_EMOTIONAL_FEATURE_BUCKETS, parameters)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Database error: {e}", original_error=e)
+
+        logger.debug("Successfully updated emotional feature buckets")
+
+    @override
+    async def get_emotional_feature_buckets(
+        self,
+        user_id: uuid.UUID,
+        db: AsyncSession,
+        since: datetime | None = None
+    ) -> Sequence[DBEmotionalFeatureBucket]:
+        """Point lookup of a user's daily feature buckets, at most one row per day of the window"""
+        logger = structlog.get_logger()
+        logger.debug("Retrieving emotional feature buckets", since=since.isoformat() if since else "ever")
+
+        query = select(DBEmotionalFeatureBucket).where(DBEmotionalFeatureBucket.user_id == user_id)
+        if since:
+            query = query.where(DBEmotionalFeatureBucket.bucket_date >= since.astimezone(timezone.utc).date())
+        query = query.order_by(DBEmotionalFeatureBucket.bucket_date)
+
+        try:
+            result = await db.execute(query)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Database error: {e}", original_error=e)
+
+        buckets = result.scalars().all()
+        logger.debug("Retrieved emotional feature buckets", count=len(buckets))
+        return buckets
+
+    @override
+    async def prune_emotional_feature_buckets(self, before: date, db: AsyncSession) -> int:
+        """Delete the buckets of days before the given date, returns the number of buckets deleted"""
+        logger = structlog.get_logger()
+        logger.debug("Pruning emotional feature buckets", before=before.isoformat())
+
+        stmt = delete(DBEmotionalFeatureBucket).where(DBEmotionalFeatureBucket.bucket_date < before)
+        try:
+            result = await db.execute(stmt)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Database error: {e}", original_error=e)
+
+        logger.debug("Pruned emotional feature buckets", count=result.rowcount)
+        return result.rowcount
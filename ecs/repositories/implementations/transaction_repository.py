@@ -2,6 +2,8 @@ import uuid
 from typing import Any, override, Sequence
 from datetime import datetime
 
+from sqlalchemy import Float, Row, any_, bindparam, cast, func
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.sql import select
 import structlog
@@ -10,6 +12,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ecs.repositories.exceptions import DatabaseError
 from ecs.repositories.interfaces import ITransactionRepository
 from ecs.models.domain import DBTransaction
+from ecs.models.schemas import TransactionAggregates
+
+# Only the columns read by feature engineering, returned as plain rows with the amount already a float
+TRANSACTION_FEATURE_COLUMNS = (
+    DBTransaction.user_id,
+    cast(DBTransaction.amount, Float).label("amount"),
+    DBTransaction.occurred_at
+)
 
 class TransactionRepository(ITransactionRepository):
 
@@ -44,4 +54,115 @@ class TransactionRepository(ITransactionRepository):
             return []
 
         logger.debug(f"Retrieved transactions", count=len(transactions), since=since.isoformat() if since else "ever")
-        return transactions
\ No newline at end of file
+        return transactions
+
+    @override
+    async def get_transaction_aggregates(
+        self,
+        user_id: uuid.UUID,
+        db: AsyncSession,
+        since: datetime | None = None,
+        limit: int | None = None
+    ) -> TransactionAggregates:
+        """
+        Compute the transactional feature statistics in a single query.
+        Only a handful of numbers cross the wire instead of every transaction row.
+        The user_id/occurred_at filter and ordering are served by ix_transactions_user_occurred.
+        """
+        logger = structlog.get_logger()
+        logger.debug("Aggregating recent transactions", since=since.isoformat() if since else "ever")
+
+        # Same window as get_recent_transactions: most recent transactions, optionally capped
+        recent = select(
+            cast(DBTransaction.amount, Float).label("amount"),
+            DBTransaction.occurred_at
+        ).where(DBTransaction.user_id == user_id)
+        if since:
+            recent = recent.where(DBTransaction.occurred_at > since)
+        if limit:
+            recent = recent.order_by(DBTransaction.occurred_at.desc()).limit(limit)
+        recent = recent.subquery("recent")
+
+        # Position in occurrence order, used to split older vs recent halves
+        ranked = select(
+            recent.c.amount,
+            recent.c.occurred_at,
+            func.row_number().over(order_by=recent.c.occurred_at).label("position"),
+            func.count().over().label("total")
+        ).subquery("ranked")
+        is_older_half = ranked.c.position <= ranked.c.total // 2
+
+        query = select(
+            func.count().label("count"),
+            func.sum(ranked.c.amount).label("total_amount"),
+            func.max(ranked.c.amount).label("max_amount"),
+            func.stddev_samp(ranked.c.amount).label("stddev_amount"),
+            func.count(func.distinct(func.date_trunc("day", ranked.c.occurred_at))).label("active_days"),
+            func.avg(ranked.c.amount).filter(is_older_half).label("older_half_mean"),
+            func.avg(ranked.c.amount).filter(~is_older_half).label("recent_half_mean")
+        )
+
+        try:
+            result = await db.execute(query)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Database error: {e}", original_error=e)
+
+        row = result.one()
+        if row.count == 0:
+            logger.warn(f"User has no transactions since {since.isoformat() if since else "ever"}")
+
+        logger.debug("Aggregated transactions", count=row.count, since=since.isoformat() if since else "ever")
+        return TransactionAggregates(
+            count=row.count,
+            total_amount=row.total_amount or 0.0,
+            max_amount=row.max_amount or 0.0,
+            stddev_amount=row.stddev_amount or 0.0,
+            active_days=row.active_days,
+            older_half_mean=row.older_half_mean or 0.0,
+            recent_half_mean=row.recent_half_mean or 0.0
+        )
+
+    @override
+    async def get_recent_transactions_for_users(
+        self,
+        user_ids: Sequence[uuid.UUID],
+        db: AsyncSession,
+        since: datetime | None = None,
+        limit: int | None = None
+    ) -> Sequence[Row[Any]]:
+        """
+        Retrieve the recent transactions of many users in a single round trip.
+        Returns projected (user_id, amount, occurred_at) rows with the amount already cast to float,
+        limit caps the number of transactions per user.
+        """
+        logger = structlog.get_logger()
+        logger.debug("Retrieving recent transactions for users", users=len(user_ids), since=since.isoformat() if since else "ever")
+        if not user_ids:
+            return []
+
+        # One array parameter whatever the number of users, = ANY(:user_ids) rather than IN (...)
+        user_ids_param = bindparam("user_ids", list(user_ids), type_=ARRAY(DBTransaction.__table__.c.user_id.type))
+        recent = select(*TRANSACTION_FEATURE_COLUMNS).where(DBTransaction.user_id == any_(user_ids_param))
+        if since:
+            recent = recent.where(DBTransaction.occurred_at > since)
+
+        if limit:
+            # Most recent transactions of each user
+            ranked = recent.add_columns(
+                func.row_number().over(
+                    partition_by=DBTransaction.user_id,
+                    order_by=DBTransaction.occurred_at.desc()
+                ).label("position")
+            ).subquery("ranked")
+            query = select(ranked.c.user_id, ranked.c.amount, ranked.c.occurred_at).where(ranked.c.position <= limit)
+        else:
+            query = recent
+
+        try:
+            result = await db.execute(query)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Database error: {e}", original_error=e)
+
+        transactions = result.all()
+        logger.debug("Retrieved transactions for users", users=len(user_ids), count=len(transactions))
+        return transactions
@@ -3,9 +3,12 @@ from abc import ABC, abstractmethod
 
 if TYPE_CHECKING:
     import uuid
+    from datetime import datetime
+    from typing import AsyncIterator, Sequence
 
     from sqlalchemy.ext.asyncio import AsyncSession
     from ecs.models.domain import DBCreditOffer, DBCreditAccount, DBRiskAssessment
+    from ecs.models.schemas import CreditEligibility
 
 class ICreditRepository(ABC):
     """Base abstract class for the credit repository"""
@@ -36,4 +39,20 @@ class ICreditRepository(ABC):
 
     @abstractmethod
     async def get_valid_risk_assessment(self, user_id: "uuid.UUID", db: "AsyncSession") -> "DBRiskAssessment | None":
-        ...
\ No newline at end of file
+        ...
+
+    @abstractmethod
+    async def get_credit_eligibility(self, user_id: "uuid.UUID", db: "AsyncSession") -> "CreditEligibility":
+        ...
+
+    @abstractmethod
+    async def create_risk_assessments(
+        self, user_ids: "Sequence[uuid.UUID]", risk_scores: "Sequence[float]", expires_at: "datetime", db: "AsyncSession"
+    ) -> "list[uuid.UUID]":
+        ...
+
+    @abstractmethod
+    def stream_user_ids_for_rescoring(
+        self, valid_until: "datetime", chunk_size: int, db: "AsyncSession"
+    ) -> "AsyncIterator[list[uuid.UUID]]":
+        ...
@@ -1,18 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import Sequence, TYPE_CHECKING
-from datetime import datetime
+from typing import Any, Sequence, TYPE_CHECKING
+from datetime import date, datetime
 import uuid
 
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 if TYPE_CHECKING:
-    from ecs.models.domain import DBEmotionalEvent
+    from ecs.models.domain import DBEmotionalEvent, DBEmotionalFeatureBucket
+    from ecs.models.schemas import EmotionalEvent, EmotionalFeatureBucket
 
 class IEmotionalEventsRepository(ABC):
     """Base abstract class for the emotional events repository"""
 
     @abstractmethod
-    async def ingest(self, events: Sequence["DBEmotionalEvent"], db: AsyncSession) -> None:
+    async def ingest(self, events: Sequence["EmotionalEvent"], db: AsyncSession) -> set[uuid.UUID]:
         ...
 
     @abstractmethod
@@ -23,4 +25,41 @@ class IEmotionalEventsRepository(ABC):
         since: datetime | None = None,
         limit: int | None = None
     ) -> Sequence["DBEmotionalEvent"]:
-        ...
\ No newline at end of file
+        ...
+
+    @abstractmethod
+    async def get_recent_emotional_event_rows(
+        self,
+        user_id: uuid.UUID,
+        db: AsyncSession,
+        since: datetime | None = None,
+        limit: int | None = None
+    ) -> Sequence[Row[Any]]:
+        ...
+
+    @abstractmethod
+    async def get_recent_emotional_events_for_users(
+        self,
+        user_ids: Sequence[uuid.UUID],
+        db: AsyncSession,
+        since: datetime | None = None,
+        limit: int | None = None
+    ) -> Sequence[Row[Any]]:
+        ...
+
+    @abstractmethod
+    async def upsert_emotional_feature_buckets(self, buckets: Sequence["EmotionalFeatureBucket"], db: AsyncSession) -> None:
+        ...
+
+    @abstractmethod
+    async def get_emotional_feature_buckets(
+        self,
+        user_id: uuid.UUID,
+        db: AsyncSession,
+        since: datetime | None = None
+    ) -> Sequence["DBEmotionalFeatureBucket"]:
+        ...
+
+    @abstractmethod
+    async def prune_emotional_feature_buckets(self, before: date, db: AsyncSession) -> int:
+        ...
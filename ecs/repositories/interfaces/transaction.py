@@ -1,12 +1,14 @@
 import uuid
-from typing import Sequence, TYPE_CHECKING
+from typing import Any, Sequence, TYPE_CHECKING
 from datetime import datetime
 from abc import ABC, abstractmethod
 
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 if TYPE_CHECKING:
     from ecs.models.domain import DBTransaction
+    from ecs.models.schemas import TransactionAggregates
 
 class ITransactionRepository(ABC):
     """Base abstract class for the transaction repository"""
@@ -20,3 +22,23 @@ class ITransactionRepository(ABC):
         limit: int | None = None
     ) -> Sequence["DBTransaction"]:
         ...
+
+    @abstractmethod
+    async def get_transaction_aggregates(
+        self,
+        user_id: uuid.UUID,
+        db: AsyncSession,
+        since: datetime | None = None,
+        limit: int | None = None
+    ) -> "TransactionAggregates":
+        ...
+
+    @abstractmethod
+    async def get_recent_transactions_for_users(
+        self,
+        user_ids: Sequence[uuid.UUID],
+        db: AsyncSession,
+        since: datetime | None = None,
+        limit: int | None = None
+    ) -> Sequence[Row[Any]]:
+        ...
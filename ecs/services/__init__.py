@@ -1,17 +1,22 @@
 from ecs.services.auth_service import AuthService
 from ecs.services.emotion_service import EmotionService
 from ecs.services.credit_service import CreditService
+from ecs.services.feature_service import FeatureService
+from ecs.services.rescoring_service import RescoringService, RescoringResult
 
 from ecs.services.exceptions import (
     BaseServiceError, BusinessLogicError, UnauthorizedError, ForbiddenError, 
     ActiveCreditOfferExistsError, CreditAccountExistsError, NoActiveCreditOfferExistsError,
-    ExpiredCreditOfferError
+    ExpiredCreditOfferError, CreditAcceptanceNotFoundError, ServiceOverloadedError
 )
 
 __all__ = [
     "AuthService",
     "EmotionService",
     "CreditService",
+    "FeatureService",
+    "RescoringService",
+    "RescoringResult",
     
     "BaseServiceError",
     
@@ -20,7 +25,10 @@ __all__ = [
     "CreditAccountExistsError",
     "NoActiveCreditOfferExistsError",
     "ExpiredCreditOfferError",
+    "CreditAcceptanceNotFoundError",
     
+    "ServiceOverloadedError",
+
     "UnauthorizedError",
     "ForbiddenError",
 
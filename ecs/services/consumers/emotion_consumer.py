@@ -1,11 +1,13 @@
-import json
 import asyncio
-from typing import TYPE_CHECKING
+from typing import Callable, TYPE_CHECKING
 
 import aio_pika
 import structlog
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from ecs.models.schemas import EmotionalEvent
+from ecs.core.config import settings
+from ecs.models.schemas import EmotionalEvent, EmotionalEventIngestResult, parse_emotional_events
+from ecs.repositories.exceptions import EmotionalEventIngestionError
 
 if TYPE_CHECKING:
     from ecs.services.emotion_service import EmotionService
@@ -13,15 +15,41 @@ if TYPE_CHECKING:
 logger = structlog.get_logger()
 
 class EmotionQueueConsumer:
+    """
+    Consumes batches of emotional events from the ecs:ingest queue.
+
+    Events of many messages are accumulated, up to batch_size events or batch_max_wait_seconds after the
+    first pending message, and written in one transaction. Their messages are then all acked, or all nacked
+    and requeued when the write fails. prefetch_count bounds the unacknowledged messages held meanwhile,
+    it should be well above the messages making up a batch.
+
+    Every batch is written through its own pooled session, up to concurrency batches at a time, so the
+    session factory's pool should hold concurrency connections.
+    """
+
     def __init__(
         self,
-        emotion_service: "EmotionService",
-        connection_params: dict[str, str]
+        emotion_service_factory: Callable[[AsyncSession], "EmotionService"],
+        session_factory: async_sessionmaker[AsyncSession],
+        connection_params: dict[str, str],
+        prefetch_count: int | None = None,
+        batch_size: int | None = None,
+        batch_max_wait_seconds: float | None = None,
+        concurrency: int | None = None
     ):
-        self.emotion_service = emotion_service
+        self.emotion_service_factory = emotion_service_factory
+        self.session_factory = session_factory
         self.connection_params = connection_params
         self.connection = None
         self.channel = None
+        self.prefetch_count = prefetch_count or settings.emotion_consumer_prefetch_count
+        self.batch_size = batch_size or settings.emotion_consumer_batch_size
+        self.batch_max_wait_seconds = batch_max_wait_seconds or settings.emotion_consumer_batch_max_wait_seconds
+        self.concurrency = concurrency or settings.emotion_consumer_concurrency
+        self._pending: list[tuple[aio_pika.abc.AbstractIncomingMessage, list[EmotionalEvent]]] = []
+        self._pending_events = 0
+        self._write_slots = asyncio.Semaphore(self.concurrency)
+        self._flush_timer: asyncio.Task | None = None
         
     async def start_consuming(self):
         """Start consuming messages from the queue using aio_pika"""
@@ -38,8 +66,9 @@ class EmotionQueueConsumer:
             # Connect to RabbitMQ
             self.connection = await aio_pika.connect_robust(connection_string)
             
-            # Create channel
+            # Create channel, without a prefetch limit the broker pushes the whole queue
             self.channel = await self.connection.channel()
+            await self.channel.set_qos(prefetch_count=self.prefetch_count)
             
             # Declare queue
             queue = await self.channel.declare_queue('ecs:ingest', durable=True)
@@ -59,22 +88,72 @@ class EmotionQueueConsumer:
             raise
         
     async def _process_message(self, message: aio_pika.abc.AbstractIncomingMessage):
-        """Process message asynchronously"""
-        async with message.process():
+        """Add the message's events to the pending batch, the batch is written once it is full or old enough"""
+        try:
+            # Decoded and validated as a whole, straight from the body bytes
+            events = parse_emotional_events(message.body)
+        except ValueError as e:
+            # Redelivering an unreadable message would not change anything
+            logger.error("Rejecting unreadable emotional data", error=str(e))
+            await message.reject(requeue=False)
+            return
+
+        self._pending.append((message, events))
+        self._pending_events += len(events)
+        if self._pending_events >= self.batch_size:
+            await self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.create_task(self._flush_after(self.batch_max_wait_seconds))
+
+    async def _flush_after(self, delay_seconds: float):
+        await asyncio.sleep(delay_seconds)
+        await self._flush()
+
+    async def _flush(self):
+        """Write all pending events in one transaction, then ack their messages, or nack them all for redelivery"""
+        # The batch is taken before waiting for a write slot, messages arriving meanwhile start the next one
+        timer, self._flush_timer = self._flush_timer, None
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        batch, self._pending, self._pending_events = self._pending, [], 0
+        if not batch:
+            return
+
+        async with self._write_slots:
+            events = [event for _, message_events in batch for event in message_events]
+            try:
+                # Redelivered events are skipped, the batch is still acknowledged
+                result = await self._ingest(events)
+            except EmotionalEventIngestionError as e:
+                # Some message holds events that can never be stored, find it instead of redelivering the batch
+                logger.warning("Emotional data batch rejected, ingesting its messages one by one", error=str(e))
+                await self._ingest_messages(batch)
+                return
+            except Exception as e:
+                logger.error("Error processing emotional data batch", messages=len(batch), error=str(e))
+                await asyncio.gather(*(message.nack(requeue=True) for message, _ in batch))
+                return
+
+            await asyncio.gather(*(message.ack() for message, _ in batch))
+            logger.info(
+                "Successfully processed emotional data batch",
+                messages=len(batch), count=len(events), inserted=result.inserted, duplicates=result.duplicates
+            )
+
+    async def _ingest(self, events: list[EmotionalEvent]) -> EmotionalEventIngestResult:
+        # A fresh session per write, concurrent batches never share one
+        async with self.session_factory() as session:
+            return await self.emotion_service_factory(session).ingest(events)
+
+    async def _ingest_messages(self, batch: list[tuple[aio_pika.abc.AbstractIncomingMessage, list[EmotionalEvent]]]):
+        for message, events in batch:
             try:
-                # Parse message body
-                body = message.body.decode()
-                data = json.loads(body)
-                
-                # Validate events
-                events = [EmotionalEvent.model_validate(event) for event in data]
-                
-                # Process using existing service
-                await self.emotion_service.ingest(events)
-                
-                logger.info("Successfully processed emotional data batch", count=len(events))
-                
+                await self._ingest(events)
+            except EmotionalEventIngestionError as e:
+                logger.error("Rejecting emotional data that cannot be stored", error=str(e))
+                await message.reject(requeue=False)
             except Exception as e:
                 logger.error("Error processing emotional data", error=str(e))
-                # Message will be rejected due to exception in context manager
-                raise
\ No newline at end of file
+                await message.nack(requeue=True)
+            else:
+                await message.ack()
@@ -1,24 +1,41 @@
+import asyncio
 from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Mapping, Sequence
 
 import uuid
 
+import numpy as np
 import structlog
+from rq import Callback
+from rq.exceptions import NoSuchJobError
+from rq.job import Job, JobStatus
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from structlog.contextvars import bind_contextvars
 
 from ecs.services.dependencies import (
     EmotionalEventsRepositoryDep, CreditRepositoryDep,
-    TransactionRepositoryDep, FeatureEngineeringServiceDep, CreditModelServiceDep
+    TransactionRepositoryDep, FeatureEngineeringServiceDep, CreditModelServiceDep,
+    PrecomputedOfferCacheDep, JobEventsDep
 )
-from ecs.core.db import AsyncSessionDep, RQQueueDep
+from ecs.core.config import settings
+from ecs.core.db import AsyncSessionDep, AsyncSessionFactoryDep, RQQueueDep
+from ecs.core.single_flight import CreditApplySingleFlightDep
 from ecs.models.schemas import (
-    Features, CreditOffer, RiskCategory, CreditType, CreditOfferStatus, RiskAssessment
+    Features, CreditOffer, RiskCategory, CreditType, CreditOfferStatus, RiskAssessment,
+    TransactionAggregates, EmotionalAggregates, CreditEligibility, CreditOfferBatch, FeatureTable,
+    PrecomputedOffer, CreditAcceptJobStatus, FEATURE_NAMES, risk_categories_for
 )
 from ecs.models.domain import DBCreditOffer, DBRiskAssessment
+from ecs.services.internal import CompiledPricingPolicy, get_pricing_policy_store
 from ecs.services.exceptions import (
     ActiveCreditOfferExistsError, CreditAccountExistsError, 
-    NoActiveCreditOfferExistsError, InvalidCreditOfferError
+    NoActiveCreditOfferExistsError, InvalidCreditOfferError, CreditAcceptanceNotFoundError
 )
 
+CREDIT_ACCEPTANCE_JOB = "ecs.workers.jobs.process_credit_acceptance"
+
 class CreditService:
     def __init__(
         self, 
@@ -28,9 +45,18 @@ class CreditService:
         feature_engineering_service: FeatureEngineeringServiceDep,
         credit_model_service: CreditModelServiceDep,
         session: AsyncSessionDep,
-        redis_queue: RQQueueDep
+        session_factory: AsyncSessionFactoryDep,
+        redis_queue: RQQueueDep,
+        single_flight: CreditApplySingleFlightDep,
+        job_events: JobEventsDep,
+        offer_cache: PrecomputedOfferCacheDep = None
     ) -> None:
         self.db = session
+        self.job_events = job_events
+        self.offer_cache = offer_cache
+        self.session_factory = session_factory
+        self.single_flight = single_flight
+        self.concurrent_reads = settings.credit_apply_concurrent_reads
         self.credit_repository = credit_repository
         self.transaction_repository = transaction_repository
         self.emotional_events_repo = emotional_events_repo
@@ -39,46 +65,67 @@ class CreditService:
         self.redis_queue = redis_queue
 
     async def apply_for_credit_line(self, user_id: uuid.UUID) -> DBCreditOffer:
-        logger = structlog.get_logger()
+        # Retries and double taps of the same user share a single application instead of racing each other
+        return await self.single_flight.do(str(user_id), partial(self._apply_for_credit_line, user_id))
 
-        # If user already has an active credit account, we won't allow them to request for another
-        # or more credit
-        # This doesn't reflect the reality of the business, its a choice made for simplificaton purposes
-        active_credit_account = await self.credit_repository.get_credit_account_for_user(user_id, self.db)
-        if active_credit_account is not None:
-            raise CreditAccountExistsError("User already has an active credit account")
-
-        # If user already has an active credit offer, return that
-        active_offer = await self.credit_repository.get_active_credit_offer_for_user(user_id, self.db)
-        if active_offer is not None:
-            bind_contextvars(offer_id=active_offer.id)
-            logger.debug("User has an active credit offer")
-            raise ActiveCreditOfferExistsError(credit_offer=active_offer, message="User already has an active credit offer")
-
-        # Get raw data from database
-        logger.debug("Retrieving data for credit line analysis")
-        transactions = await self.transaction_repository.get_recent_transactions(
-            user_id,
-            self.db,
-            since=self.feature_engineering_service.transactions_since,
-            limit=self.feature_engineering_service.transaction_limit
-        )
-        emotional_events = await self.emotional_events_repo.get_recent_emotional_events(
-            user_id,
-            self.db,
-            self.feature_engineering_service.emotional_events_since,
-            self.feature_engineering_service.emotional_events_limit
-        )
+    async def _apply_for_credit_line(self, user_id: uuid.UUID) -> DBCreditOffer:
+        logger = structlog.get_logger()
+        eligibility: CreditEligibility | None = None
+
+        precomputed_offer = await self.offer_cache.get(user_id) if self.offer_cache is not None else None
+        if precomputed_offer is not None:
+            # Features, model and calculator already ran ahead of time, only the eligibility is read
+            eligibility = await self.credit_repository.get_credit_eligibility(user_id, self.db)
+            self._ensure_can_apply(eligibility)
+            if self._is_current(precomputed_offer, eligibility):
+                logger.debug("Using precomputed credit offer", pricing_policy_version=precomputed_offer.pricing_policy_version)
+                try:
+                    db_credit_offer = await self._create_credit_offer(
+                        user_id, precomputed_offer.risk_assessment_id, precomputed_offer.offer
+                    )
+                    await self.db.commit()
+                    return db_credit_offer
+                except Exception:
+                    await self.db.rollback()
+                    raise
+            logger.debug("Precomputed credit offer is stale")
+
+        if self.concurrent_reads:
+            # Every read is independent, overlap them on separate pooled connections
+            # The checks run once all reads are back, rejected applications pay for the whole fan out
+            logger.debug("Retrieving data for credit line analysis concurrently")
+
+            async def read_eligibility() -> CreditEligibility:
+                if eligibility is not None:
+                    return eligibility
+                return await self._read_in_own_session(partial(self.credit_repository.get_credit_eligibility, user_id))
+
+            eligibility, transaction_aggregates, emotional_events = await asyncio.gather(
+                read_eligibility(),
+                self._read_in_own_session(partial(self._get_transaction_aggregates, user_id)),
+                self._read_in_own_session(partial(self._get_emotional_events, user_id))
+            )
+            self._ensure_can_apply(eligibility)
+        else:
+            if eligibility is None:
+                # Credit account, active offer and valid risk assessment in a single round trip
+                eligibility = await self.credit_repository.get_credit_eligibility(user_id, self.db)
+                self._ensure_can_apply(eligibility)
+
+            # Get raw data from database
+            logger.debug("Retrieving data for credit line analysis")
+            transaction_aggregates = await self._get_transaction_aggregates(user_id, self.db)
+            emotional_events = await self._get_emotional_events(user_id, self.db)
 
         # Perform feature engineering
         logger.debug("Creating features from user data")
         features: Features = await self.feature_engineering_service.create_features(
-            transactions, emotional_events
+            transaction_aggregates, emotional_events
         )
         
         try:
             # Check if there's a non expired risk assessment
-            db_risk_assessment: DBRiskAssessment | None = await self.credit_repository.get_valid_risk_assessment(user_id, self.db)   
+            db_risk_assessment: DBRiskAssessment | None = eligibility.valid_risk_assessment
             if db_risk_assessment is None:
                 # Submit request to credit ML model
                 logger.debug("Sending request to credit model service")
@@ -88,7 +135,7 @@ class CreditService:
                 logger.debug("Creating risk assessment")
                 db_risk_assessment = DBRiskAssessment(
                     user_id=user_id,
-                    expires_at=datetime.now()+timedelta(days=15),
+                    expires_at=datetime.now()+timedelta(days=settings.risk_assessment_ttl_days),
                     **risk_assessment.model_dump()
                 )
                 await self.credit_repository.create_risk_assessment(db_risk_assessment, self.db)
@@ -96,20 +143,12 @@ class CreditService:
                 logger.debug("Reusing valid previous risk assessment")
                 risk_assessment = RiskAssessment(risk_score=db_risk_assessment.risk_score)
 
-            logger.debug("Calculating credit offer")
-            credit_offer: CreditOffer = CreditOfferCalculator().calculate_offer(risk_assessment, features)
+            calculator = CreditOfferCalculator()
+            logger.debug("Calculating credit offer", pricing_policy_version=calculator.policy.version)
+            credit_offer: CreditOffer = calculator.calculate_offer(risk_assessment, features)
 
-            # Create credit offer in the database
-            logger.debug("Creating credit offer")
-            db_credit_offer: DBCreditOffer = DBCreditOffer(
-                user_id=user_id,
-                risk_assessment_id=db_risk_assessment.id,
-                expires_at=datetime.now()+timedelta(days=15),
-                **credit_offer.model_dump()
-            )
-            await self.credit_repository.create_credit_offer(db_credit_offer, self.db)
+            db_credit_offer = await self._create_credit_offer(user_id, db_risk_assessment.id, credit_offer)
             
-            print("we got here?")
             logger.debug("Committing changes")
             await self.db.commit() # Commit both changes as a unit
             return db_credit_offer # Already refreshed
@@ -117,18 +156,99 @@ class CreditService:
             await self.db.rollback()
             raise
 
+    async def _create_credit_offer(
+        self, user_id: uuid.UUID, risk_assessment_id: uuid.UUID, credit_offer: CreditOffer
+    ) -> DBCreditOffer:
+        # Create credit offer in the database
+        logger = structlog.get_logger()
+        logger.debug("Creating credit offer")
+        db_credit_offer: DBCreditOffer = DBCreditOffer(
+            user_id=user_id,
+            risk_assessment_id=risk_assessment_id,
+            expires_at=datetime.now()+timedelta(days=15),
+            **credit_offer.model_dump()
+        )
+        await self.credit_repository.create_credit_offer(db_credit_offer, self.db)
+        return db_credit_offer
+
+    @staticmethod
+    def _is_current(precomputed_offer: PrecomputedOffer, eligibility: CreditEligibility) -> bool:
+        """A precomputed offer only stands for the risk assessment and pricing policy it was computed with"""
+        risk_assessment = eligibility.valid_risk_assessment
+        return (
+            risk_assessment is not None
+            and precomputed_offer.risk_assessment_id == risk_assessment.id
+            and precomputed_offer.pricing_policy_version == get_pricing_policy_store().current().version
+        )
+
+    @staticmethod
+    def _ensure_can_apply(eligibility: CreditEligibility) -> None:
+        # If user already has an active credit account, we won't allow them to request for another
+        # or more credit
+        # This doesn't reflect the reality of the business, its a choice made for simplificaton purposes
+        if eligibility.has_credit_account:
+            raise CreditAccountExistsError("User already has an active credit account")
+
+        # If user already has an active credit offer, return that
+        if eligibility.active_offer is not None:
+            bind_contextvars(offer_id=eligibility.active_offer.id)
+            structlog.get_logger().debug("User has an active credit offer")
+            raise ActiveCreditOfferExistsError(
+                credit_offer=eligibility.active_offer, message="User already has an active credit offer"
+            )
+
+    async def _get_transaction_aggregates(self, user_id: uuid.UUID, db: AsyncSession) -> TransactionAggregates:
+        # Transactions are aggregated by the database, only the summary statistics are transferred
+        return await self.transaction_repository.get_transaction_aggregates(
+            user_id,
+            db,
+            since=self.feature_engineering_service.transactions_since,
+            limit=self.feature_engineering_service.transaction_limit
+        )
+
+    async def _get_emotional_events(self, user_id: uuid.UUID, db: AsyncSession) -> Sequence[Row[Any]] | EmotionalAggregates:
+        if self.feature_engineering_service.use_emotional_feature_store:
+            # Emotional state maintained at ingest time, a lookup of at most one row per day of the window
+            feature_buckets = await self.emotional_events_repo.get_emotional_feature_buckets(
+                user_id,
+                db,
+                since=self.feature_engineering_service.emotional_events_since
+            )
+            return self.feature_engineering_service.aggregate_emotional_feature_buckets(feature_buckets)
+
+        # Projected rows, only the columns the features need
+        return await self.emotional_events_repo.get_recent_emotional_event_rows(
+            user_id,
+            db,
+            self.feature_engineering_service.emotional_events_since,
+            self.feature_engineering_service.emotional_events_limit
+        )
+
+    async def _read_in_own_session[T](self, read: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """Run a read on a dedicated session, so it gets its own pooled connection"""
+        async with self.session_factory() as session:
+            return await read(session)
+
+    async def get_current_credit_offer(self, user_id: uuid.UUID) -> DBCreditOffer:
+        """The user's active credit offer, a plain read without the apply checks"""
+        eligibility = await self.credit_repository.get_credit_eligibility(user_id, self.db)
+        if eligibility.active_offer is None:
+            raise NoActiveCreditOfferExistsError("No active credit offer found")
+        bind_contextvars(offer_id=eligibility.active_offer.id)
+        return eligibility.active_offer
+
     async def accept_credit_offer(self, offer_id: uuid.UUID, user_id: uuid.UUID) -> str:
 
         # If user already has an active credit account, we won't allow them to request for another or more credit
         # This doesn't reflect the reality of the business, its a choice made for simplificaton purposes
         # We check for this again in case the user tries to accept some other offer somehow
-        active_credit_account = await self.credit_repository.get_credit_account_for_user(user_id, self.db)
-        if active_credit_account is not None:
-            raise CreditAccountExistsError("User already has an active credit account")
-
         # Query by the user_id, that way, we avoid other users being able to query the database for offer_ids
         # Safer to query by the user_id by default
-        credit_offer: DBCreditOffer | None = await self.credit_repository.get_active_credit_offer_for_user(user_id, self.db)
+        eligibility = await self.credit_repository.get_credit_eligibility(user_id, self.db)
+        if eligibility.has_credit_account:
+            raise CreditAccountExistsError("User already has an active credit account")
+
+        credit_offer: DBCreditOffer | None = eligibility.active_offer
         if credit_offer is None:
             raise NoActiveCreditOfferExistsError("No active credit offer found")
         if credit_offer.status == CreditOfferStatus.denied:
@@ -146,132 +266,114 @@ class CreditService:
             raise InvalidCreditOfferError("Credit offer has expired")
 
         # Trigger async job to create credit account and then mark the credit offer as accepted
-        _ =  self.redis_queue.enqueue("ecs.workers.jobs.process_credit_acceptance", offer_id=str(offer_id), user_id=str(user_id))
-        
-        # Create an internal tracker for the job, not used as of this implementation
-        # No status checking endpoint requirement.
+        # The job id is ours so it can be returned to the client and tracked through get_credit_acceptance
         job_id: str = str(uuid.uuid4())
+        self.redis_queue.enqueue(
+            CREDIT_ACCEPTANCE_JOB,
+            offer_id=str(offer_id),
+            user_id=str(user_id),
+            job_id=job_id,
+            result_ttl=settings.credit_acceptance_result_ttl_seconds,
+            failure_ttl=settings.credit_acceptance_result_ttl_seconds,
+            on_success=Callback("ecs.workers.jobs.publish_credit_acceptance_success"),
+            on_failure=Callback("ecs.workers.jobs.publish_credit_acceptance_failure")
+        )
 
         return job_id
 
-class CreditOfferCalculator:
-
-    def calculate_offer(self, risk_assessment: RiskAssessment, features: Features) -> CreditOffer:
-        if risk_assessment.risk_category == RiskCategory.high_risk:
-            return CreditOffer(status=CreditOfferStatus.denied)
+    async def get_credit_acceptance(self, job_id: uuid.UUID, user_id: uuid.UUID) -> CreditAcceptJobStatus:
+        """State of a credit acceptance job of the user, as kept by RQ"""
+        # RQ reads Redis synchronously, keep it off the event loop
+        return await asyncio.to_thread(self._read_credit_acceptance, job_id, user_id)
 
-        # Base credit limit calculation
-        base_limit = self._calculate_base_limit(risk_assessment.risk_score)
-        
-        # Adjustments based on multiple factors
-        adjusted_limit = base_limit * self._get_multipliers(risk_assessment.risk_score, features)
-        
-        return CreditOffer(
-            status=CreditOfferStatus.offered,
-            credit_limit=adjusted_limit,
-            apr=self._calculate_interest_rate(risk_assessment.risk_score, features),
-            credit_type=self._determine_credit_type(risk_assessment.risk_category)
+    def _read_credit_acceptance(self, job_id: uuid.UUID, user_id: uuid.UUID) -> CreditAcceptJobStatus:
+        try:
+            job = Job.fetch(str(job_id), connection=self.redis_queue.connection)
+        except NoSuchJobError:
+            raise CreditAcceptanceNotFoundError("Credit acceptance job not found")
+        job_status = job.get_status()
+        # Job ids are not secret, a job of another user is reported as missing
+        if job_status is None or job.func_name != CREDIT_ACCEPTANCE_JOB or job.kwargs.get("user_id") != str(user_id):
+            raise CreditAcceptanceNotFoundError("Credit acceptance job not found")
+
+        return CreditAcceptJobStatus(
+            id=job.id,
+            offer_id=job.kwargs["offer_id"],
+            status=job_status.value,
+            outcome=job.return_value() if job_status == JobStatus.FINISHED else None
         )
-    
-    def _calculate_base_limit(self, risk_score: float) -> float:
-        # Inverse relationship: lower risk = higher limit
-        max_limit = 50000  # Maximum credit limit
-        min_limit = 1000   # Minimum credit limit
-        
-        # Exponential decay function
-        base_limit = max_limit * (1 - risk_score ** 2)
-        return max(min_limit, base_limit)
-    
-    def _get_multipliers(self, risk_score: float, features: Features) -> float:
-        """Post processing
-            Individual features can be weighted differently based on business requirements
-            Aligns more closely with business requirements
-        """
-        multiplier = 1.0
-
-        # Average daily spend
-        # What this means
-        # If someone spends less than $50 a day, we are always going to apply the lowest possible multiplier
-        # If someone spends more then $5000 a day, we are still going to apply the highest possible multiplier
-        normalized_avg_daily_spend = self._normalize(features.average_daily_spend, lower_bound=50, upper_bound=5000)
-        avg_daily_spend_multiplier = self._interpolate(metric=normalized_avg_daily_spend, min_value=1, max_value=1.5, bias_factor=2)
-        
-        # Average daily transactions - heavily biased towards high daily transaction volume
-        normalized_avg_daily_transactions = self._normalize(features.avg_daily_transactions, lower_bound=0.1, upper_bound=1000)
-        avg_daily_transactions_multiplier = self._interpolate(metric=normalized_avg_daily_transactions, min_value=0.9, max_value=1.8, bias_factor=2.5)
-
-        # Emotional trend multiplier - linearly penalizes downward emotional trends
-        normalized_avg_emotional_trend = self._normalize(features.recent_emotional_trend, lower_bound=-1, upper_bound=1)
-        avg_emotional_trend_multiplier = self._interpolate(normalized_avg_emotional_trend, min_value=0.5, max_value=1.5, bias_factor=1)
-        
-        # Risk score multiplier - penalizes higher risk scores
-        # Normalize risk_score (already in [0,1]), invert so that lower risk gets higher multiplier
-        risk_score_multiplier = self._interpolate(metric=risk_score,  min_value=0.7, max_value=1.2, bias_factor=2, invert=True)
 
-        return multiplier * avg_daily_spend_multiplier * avg_daily_transactions_multiplier * avg_emotional_trend_multiplier * risk_score_multiplier    
+    async def watch_credit_acceptance(
+        self, job_id: uuid.UUID, user_id: uuid.UUID, timeout_seconds: float
+    ) -> AsyncIterator[CreditAcceptJobStatus]:
+        """Current state of the job, then unless it is done its state once it finishes or timeout_seconds passed
 
-    def _calculate_interest_rate(self, risk_score: float, features: Features) -> float:
-        """Post processing
-            Individual features can be weighted differently based on business requirements
-            Aligns more closely with business requirements
-            Currently, only risk_score is used to calculate apr
+        The job events are subscribed before the current state is read, a job finishing in between is not missed
         """
+        final_status: CreditAcceptJobStatus | None = None
+        async with self.job_events.subscribe(str(job_id)) as notice:
+            job_status = await self.get_credit_acceptance(job_id, user_id)
+            yield job_status
+            if job_status.done:
+                return
+            try:
+                async with asyncio.timeout(timeout_seconds):
+                    # Callbacks run before RQ stores the final status, the notice carries it
+                    final_status = CreditAcceptJobStatus.model_validate_json(await notice)
+            except TimeoutError:
+                pass
+        yield final_status or await self.get_credit_acceptance(job_id, user_id)
 
-        # Base interest rate range
-        min_rate = 0.08  # 8% APR
-        max_rate = 0.25  # 25% APR
-        base_rate: float = self._interpolate(metric=risk_score, min_value=min_rate, max_value=max_rate, bias_factor=1.75)
-        
-        return base_rate
-    
-    def _determine_credit_type(self, risk_category: str) -> CreditType:
-        """Determine credit type based on credit risk category"""
-        match risk_category:
-            case RiskCategory.high_risk | RiskCategory.medium_risk:
-                return CreditType.short_term
-            case RiskCategory.low_risk | RiskCategory.very_low_risk:
-                return CreditType.long_term
-        raise ValueError("Invalid credit category")
+class CreditOfferCalculator:
+    """Prices credit offers from risk scores and features
 
-    @staticmethod
-    def _interpolate(metric: float, min_value: float, max_value: float, bias_factor: float, invert: bool = False) -> float:
-        """
-        Interpolates between min_value and max_value using a bias factor.
-        The metric should be in [0, 1].
+    The limit and apr curves come from the declarative pricing policy, see ecs/services/internal/pricing_policy.py.
+    Every computation is elementwise over NumPy arrays, a single offer is priced as a batch of one
+    so the single and batch paths always give identical results
+    """
 
-        If invert is True, the interpolation is performed with (1 - metric).
-        Effectively, this pushed the X axis to the right and uses the "other side" of the curve
+    def __init__(self, policy: CompiledPricingPolicy | None = None) -> None:
+        self.policy = policy or get_pricing_policy_store().current()
 
-        The interpolation formula is:
-            result = (max_value - min_value) * (metric ** bias_factor) + min_value
+    def calculate_offer(self, risk_assessment: RiskAssessment, features: Features) -> CreditOffer:
+        offers = self._calculate(
+            np.array([risk_assessment.risk_score], dtype=np.float64),
+            {name: np.array([value], dtype=np.float64) for name, value in features.model_dump().items()}
+        )
+        return offers.to_credit_offer(0)
 
-        - bias_factor < 1: bias towards lower metric values (faster growth)
-        - bias_factor == 1: linear interpolation
-        - bias_factor > 1: bias towards higher metric values (slower growth)
+    def calculate_offers(self, risk_scores: np.ndarray, features: FeatureTable) -> CreditOfferBatch:
+        """Price many users at once, risk_scores is aligned with the rows of the feature table"""
+        return self._calculate(
+            np.asarray(risk_scores, dtype=np.float64),
+            {name: features.column(name) for name in FEATURE_NAMES}
+        )
 
-        Examples:
-            bias_factor = 2, metric = 0.0 -> min_value
-            bias_factor = 2, metric = 0.5 -> (max_value - min_value) * 0.25 + min_value
-            bias_factor = 2, metric = 1.0 -> max_value
-            invert=True, metric=0.2 -> uses 0.8 instead of 0.2
-        """
-        if not (0.0 <= metric <= 1.0):
-            raise ValueError("Metric must be in the interval [0, 1].")
-        if invert:
-            metric = 1.0 - metric
-        return (max_value - min_value) * (metric ** bias_factor) + min_value
+    def _calculate(self, risk_scores: np.ndarray, features: Mapping[str, np.ndarray]) -> CreditOfferBatch:
+        risk_categories = risk_categories_for(risk_scores)
+        approved = risk_categories != RiskCategory.high_risk
+        inputs = {**features, "risk_score": risk_scores}
+
+        # Base credit limit, adjusted by the policy multipliers
+        adjusted_limits = self.policy.base_limits(risk_scores) * self.policy.multiplier(inputs)
+
+        return CreditOfferBatch(
+            statuses=np.where(
+                approved,
+                np.array(CreditOfferStatus.offered, dtype=object),
+                np.array(CreditOfferStatus.denied, dtype=object)
+            ),
+            credit_limits=np.where(approved, adjusted_limits, np.nan),
+            aprs=np.where(approved, self.policy.aprs(inputs), np.nan),
+            credit_types=np.where(approved, self._determine_credit_type(risk_categories), None)
+        )
 
-    @staticmethod
-    def _normalize(metric: float, lower_bound: float, upper_bound: float) -> float:
-        """
-        Normalize some metric to [0, 1] given lower and upper bounds.
-        Values below lower_bound get mapped to 0
-        Values above upper_bound get mapped to 1
-        """
-        if upper_bound == lower_bound:
-            raise ValueError("Upper and lower bounds must be different for normalization.")
-        if metric <= lower_bound:
-            return 0.0
-        if metric >= upper_bound:
-            return 1.0
-        return (metric - lower_bound) / (upper_bound - lower_bound)
\ No newline at end of file
+    def _determine_credit_type(self, risk_categories: np.ndarray) -> np.ndarray:
+        """Determine credit type based on credit risk category"""
+        short_term = np.isin(risk_categories, [RiskCategory.high_risk, RiskCategory.medium_risk])
+        long_term = np.isin(risk_categories, [RiskCategory.low_risk, RiskCategory.very_low_risk])
+        if not np.all(short_term | long_term):
+            raise ValueError("Invalid credit category")
+        return np.where(
+            short_term, np.array(CreditType.short_term, dtype=object), np.array(CreditType.long_term, dtype=object)
+        )
@@ -6,7 +6,10 @@ from ecs.repositories import (
     EmotionalEventsRepository, UserRepository, ClientRepository,
     TransactionRepository, CreditRepository
 )
-from ecs.services.internal import FeatureEngineeringService, CreditModelService
+from ecs.services.internal import (
+    FeatureEngineeringService, CreditModelService, PrecomputedOfferCache, get_precomputed_offer_cache,
+    JobEvents, get_job_events
+)
 
 
 EmotionalEventsRepositoryDep: TypeAlias = Annotated[EmotionalEventsRepository, Depends()]
@@ -17,3 +20,7 @@ TransactionRepositoryDep: TypeAlias = Annotated[TransactionRepository, Depends()
 
 FeatureEngineeringServiceDep: TypeAlias = Annotated[FeatureEngineeringService, Depends()]
 CreditModelServiceDep: TypeAlias = Annotated[CreditModelService, Depends()]
+
+# None when precomputed offers are disabled
+PrecomputedOfferCacheDep: TypeAlias = Annotated[PrecomputedOfferCache | None, Depends(get_precomputed_offer_cache)]
+JobEventsDep: TypeAlias = Annotated[JobEvents, Depends(get_job_events)]
@@ -1,27 +1,52 @@
 from typing import Sequence
 
+import structlog
 from structlog.contextvars import bind_contextvars
 
-from ecs.models.schemas import EmotionalEvent
-from ecs.models.domain import DBEmotionalEvent
-from ecs.services.dependencies import EmotionalEventsRepositoryDep
+from ecs.models.schemas import EmotionalEvent, EmotionalEventIngestResult
+from ecs.services.dependencies import (
+    EmotionalEventsRepositoryDep, FeatureEngineeringServiceDep, PrecomputedOfferCacheDep
+)
 from ecs.core.db import AsyncSessionDep
 
 class EmotionService:
-    def __init__(self, emotional_events_repository: EmotionalEventsRepositoryDep, session: AsyncSessionDep) -> None:
+    def __init__(
+        self,
+        emotional_events_repository: EmotionalEventsRepositoryDep,
+        feature_engineering_service: FeatureEngineeringServiceDep,
+        session: AsyncSessionDep,
+        offer_cache: PrecomputedOfferCacheDep = None
+    ) -> None:
         self.db = session
+        self.offer_cache = offer_cache
         self.emotional_events_repo = emotional_events_repository
+        self.feature_engineering_service = feature_engineering_service
 
-    async def ingest(self, events: Sequence[EmotionalEvent]):
+    async def ingest(self, events: Sequence[EmotionalEvent]) -> EmotionalEventIngestResult:
+        """Store new events, events already stored (e.g. redelivered ones) are skipped and counted as duplicates"""
+        logger = structlog.get_logger()
         bind_contextvars(count=len(events))
-        
-        db_events: list[DBEmotionalEvent] = [
-            DBEmotionalEvent(**event.model_dump()) for event in events
-        ]
+
+        # A batch may repeat an event, only one copy of it is ingested
+        unique_events = list({event.event_id: event for event in events}.values())
 
         try:
-            await self.emotional_events_repo.ingest(db_events, self.db)
+            inserted_event_ids = await self.emotional_events_repo.ingest(unique_events, self.db)
+            inserted_events = [event for event in unique_events if event.event_id in inserted_event_ids]
+            # Incremental feature state, written in the same transaction as the events
+            # Only for inserted events, a duplicate is already counted in the stored state
+            feature_buckets = self.feature_engineering_service.build_emotional_feature_buckets(inserted_events)
+            await self.emotional_events_repo.upsert_emotional_feature_buckets(feature_buckets, self.db)
             await self.db.commit()
         except Exception:
             await self.db.rollback()
-            raise
\ No newline at end of file
+            raise
+
+        result = EmotionalEventIngestResult(inserted=len(inserted_events), duplicates=len(events) - len(inserted_events))
+        if result.duplicates:
+            logger.info("Skipped duplicate emotional events", duplicates=result.duplicates)
+
+        # New events change the features, offers precomputed from the old ones no longer apply
+        if self.offer_cache is not None and inserted_events:
+            await self.offer_cache.invalidate(event.user_id for event in inserted_events)
+        return result
@@ -44,6 +44,17 @@ class CreditAccountExistsError(BusinessLogicError):
     """User already has a credit account"""
     pass
 
+class CreditAcceptanceNotFoundError(BusinessLogicError):
+    """No credit acceptance job with the given id exists for the user"""
+    pass
+
+class ServiceOverloadedError(BaseServiceError):
+    """Too much pending work, the request is rejected instead of queued"""
+
+    @override
+    def _add_subclass_fields(self, result: dict[str, Any]) -> None:
+        pass
+
 class UnauthorizedError(BaseServiceError):
     """Unauthorized action error"""
 
@@ -0,0 +1,54 @@
+from typing import Sequence
+import uuid
+
+import structlog
+
+from ecs.models.schemas import FeatureTable
+from ecs.services.dependencies import (
+    TransactionRepositoryDep, EmotionalEventsRepositoryDep, FeatureEngineeringServiceDep
+)
+from ecs.core.db import AsyncSessionDep
+
+class FeatureService:
+    """Computes the features of many users at once, e.g. for bulk scoring"""
+
+    def __init__(
+        self,
+        transaction_repository: TransactionRepositoryDep,
+        emotional_events_repository: EmotionalEventsRepositoryDep,
+        feature_engineering_service: FeatureEngineeringServiceDep,
+        session: AsyncSessionDep
+    ) -> None:
+        self.db = session
+        self.transaction_repo = transaction_repository
+        self.emotional_events_repo = emotional_events_repository
+        self.feature_engineering_service = feature_engineering_service
+
+    async def create_feature_table(self, user_ids: Sequence[uuid.UUID]) -> FeatureTable:
+        """One set-based query per source for the whole batch, then a single vectorized pass"""
+        logger = structlog.get_logger()
+        user_ids = list(dict.fromkeys(user_ids))
+
+        transactions = await self.transaction_repo.get_recent_transactions_for_users(
+            user_ids,
+            self.db,
+            since=self.feature_engineering_service.transactions_since,
+            limit=self.feature_engineering_service.transaction_limit
+        )
+        emotional_events = await self.emotional_events_repo.get_recent_emotional_events_for_users(
+            user_ids,
+            self.db,
+            since=self.feature_engineering_service.emotional_events_since,
+            limit=self.feature_engineering_service.emotional_events_limit
+        )
+
+        feature_table = await self.feature_engineering_service.create_feature_table(
+            user_ids, transactions, emotional_events
+        )
+        logger.debug(
+            "Created feature table",
+            users=len(feature_table),
+            transactions=len(transactions),
+            emotional_events=len(emotional_events)
+        )
+        return feature_table
@@ -1,7 +1,34 @@
 from ecs.services.internal.feature_engineering_service import FeatureEngineeringService
 from ecs.services.internal.credit_model_service import CreditModelService
+from ecs.services.internal.micro_batcher import MicroBatcher
+from ecs.services.internal.prediction_cache import PredictionCache, get_prediction_cache
+from ecs.services.internal.offer_cache import PrecomputedOfferCache, get_precomputed_offer_cache
+from ecs.services.internal.job_events import JobEvents, get_job_events
+from ecs.services.internal.credit_model_backends import (
+    ICreditModelBackend, RemoteCreditModelBackend, LogisticCreditModelBackend,
+    get_credit_model_backend, features_matrix
+)
+from ecs.services.internal.pricing_policy import (
+    PricingPolicy, CompiledPricingPolicy, load_pricing_policy, get_pricing_policy_store
+)
 
 __all__ = [
     "FeatureEngineeringService",
-    "CreditModelService"
+    "CreditModelService",
+    "MicroBatcher",
+    "PredictionCache",
+    "get_prediction_cache",
+    "PrecomputedOfferCache",
+    "get_precomputed_offer_cache",
+    "JobEvents",
+    "get_job_events",
+    "ICreditModelBackend",
+    "RemoteCreditModelBackend",
+    "LogisticCreditModelBackend",
+    "get_credit_model_backend",
+    "features_matrix",
+    "PricingPolicy",
+    "CompiledPricingPolicy",
+    "load_pricing_policy",
+    "get_pricing_policy_store"
 ]
\ No newline at end of file
@@ -0,0 +1,82 @@
+import hashlib
+import random
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import structlog
+
+from ecs.core.config import settings
+from ecs.models.schemas import Features, FEATURE_NAMES
+
+def features_matrix(features: Sequence[Features]) -> np.ndarray:
+    """Stack features into a float64 matrix, one row per item and columns in FEATURE_NAMES order"""
+    return np.array(
+        [[getattr(f, name) for name in FEATURE_NAMES] for f in features],
+        dtype=np.float64
+    ).reshape(-1, len(FEATURE_NAMES))
+
+class ICreditModelBackend(ABC):
+    """Base abstract class for credit model runtimes"""
+
+    # Identifies the model, e.g. for caching its predictions
+    version: str
+
+    @abstractmethod
+    async def predict_risk_scores(self, features: np.ndarray) -> np.ndarray:
+        """Risk scores in [0, 1] for a (n, len(FEATURE_NAMES)) feature matrix, one per row"""
+        ...
+
+class RemoteCreditModelBackend(ICreditModelBackend):
+    """Mocked external ML model, one request per batch"""
+
+    version = "remote-mock"
+
+    async def predict_risk_scores(self, features: np.ndarray) -> np.ndarray:
+        logger = structlog.get_logger()
+        logger.debug("Sending predict risk score request to external ML model", batch_size=len(features))
+
+        return np.array([random.randint(0, 1) for _ in range(len(features))], dtype=np.float64)
+
+class LogisticCreditModelBackend(ICreditModelBackend):
+    """In-process logistic regression evaluated with NumPy
+
+    The model file is a .npy float64 array of shape (3, len(FEATURE_NAMES) + 1), rows are the
+    standardization means, the standardization scales and the weights. The last column is the intercept
+    (mean 0, scale 1, weight = bias), so risk_score = sigmoid(((x - mean) / scale) @ weight) with x extended by a 1.
+    The file is memory-mapped read only, so all worker processes share the same pages
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        parameters = np.load(self.path, mmap_mode="r")
+        if parameters.shape != (3, len(FEATURE_NAMES) + 1) or parameters.dtype != np.float64:
+            raise ValueError(
+                f"Invalid model file {self.path}, expected float64 {(3, len(FEATURE_NAMES) + 1)}, "
+                f"got {parameters.dtype} {parameters.shape}"
+            )
+        self.means, self.scales, self.weights = parameters
+        self.version = f"logistic-{hashlib.sha256(self.path.read_bytes()).hexdigest()[:12]}"
+
+    async def predict_risk_scores(self, features: np.ndarray) -> np.ndarray:
+        design = np.column_stack((features, np.ones(len(features))))
+        logits = ((design - self.means) / self.scales) @ self.weights
+        # Sigmoid written with tanh, does not overflow for large logits
+        return 0.5 * (1.0 + np.tanh(0.5 * logits))
+
+@lru_cache(maxsize=1)
+def get_credit_model_backend() -> ICreditModelBackend:
+    """Process-wide model backend, loaded once and warmed at startup"""
+    logger = structlog.get_logger()
+    match settings.credit_model_backend:
+        case "remote":
+            backend = RemoteCreditModelBackend()
+        case "logistic":
+            backend = LogisticCreditModelBackend(settings.credit_model_path)
+        case other:
+            raise ValueError(f"Unknown credit model backend: {other}")
+
+    logger.info("Loaded credit model backend", backend=settings.credit_model_backend, model_version=backend.version)
+    return backend
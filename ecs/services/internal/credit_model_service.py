@@ -1,14 +1,68 @@
-import random
+from functools import lru_cache
+from typing import Sequence
 
+import numpy as np
 import structlog
 
+from ecs.core.config import settings
 from ecs.models.schemas import Features, RiskAssessment
+from ecs.services.internal.credit_model_backends import features_matrix, get_credit_model_backend
+from ecs.services.internal.micro_batcher import MicroBatcher
+from ecs.services.internal.prediction_cache import get_prediction_cache
 
 class CreditModelService:
-    
+    def __init__(self) -> None:
+        self.backend = get_credit_model_backend()
+        self.prediction_cache = get_prediction_cache()
+        self.use_micro_batching = settings.credit_model_micro_batching
+
+    @property
+    def model_version(self) -> str:
+        return self.backend.version
+
     async def predict_credit_risk(self, features: Features) -> RiskAssessment:
-        """Mocked credit ML model call"""
-        logger = structlog.get_logger()
-        logger.debug("Sending predict risk score request to external ML model")
-        
-        return RiskAssessment(risk_score = random.randint(0, 1))
\ No newline at end of file
+        if self.use_micro_batching:
+            # Concurrent requests of this process are scored together
+            return await get_prediction_batcher().submit(features)
+        return (await self.predict_credit_risk_batch([features]))[0]
+
+    async def predict_credit_risk_batch(self, features: Sequence[Features]) -> list[RiskAssessment]:
+        """Score many users with a single model call"""
+        risk_scores = await self.predict_risk_scores(features_matrix(features))
+        return [RiskAssessment(risk_score=risk_score) for risk_score in risk_scores.tolist()]
+
+    async def predict_risk_scores(self, features: np.ndarray) -> np.ndarray:
+        """Score a feature matrix with columns in FEATURE_NAMES order, e.g. FeatureTable.values
+
+        Rows found in the prediction cache skip the model, only the remaining ones are scored
+        """
+        if self.prediction_cache is None or len(features) == 0:
+            return await self.backend.predict_risk_scores(features)
+
+        keys = [self.prediction_cache.key(self.model_version, row) for row in features]
+        cached = await self.prediction_cache.get_many(keys)
+        missing = [position for position, risk_score in enumerate(cached) if risk_score is None]
+        risk_scores = np.array([np.nan if risk_score is None else risk_score for risk_score in cached])
+
+        if missing:
+            risk_scores[missing] = await self.backend.predict_risk_scores(features[missing])
+            await self.prediction_cache.set_many([keys[position] for position in missing], risk_scores[missing].tolist())
+
+        structlog.get_logger().debug(
+            "Scored with prediction cache",
+            batch_size=len(features),
+            model_calls=len(missing),
+            cache_hit_ratio=self.prediction_cache.stats.hit_ratio
+        )
+        return risk_scores
+
+@lru_cache(maxsize=1)
+def get_prediction_batcher() -> MicroBatcher[Features, RiskAssessment]:
+    """Process-wide micro batcher in front of the credit model"""
+    return MicroBatcher(
+        CreditModelService().predict_credit_risk_batch,
+        max_batch_size=settings.credit_model_batch_size,
+        max_wait_ms=settings.credit_model_batch_max_wait_ms,
+        max_queue_depth=settings.credit_model_batch_max_queue_depth,
+        name="credit-model"
+    )
@@ -1,12 +1,22 @@
-from datetime import datetime, timedelta
+import uuid
+from dataclasses import replace
+from datetime import date, datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Sequence
-import statistics
+
+import numpy as np
 
 from ecs.core.config import settings
-from ecs.models.schemas import Features
+from ecs.models.schemas import (
+    Features, TransactionColumns, EmotionalEventColumns, TransactionAggregates, EmotionalAggregates,
+    EmotionalFeatureBucket, FeatureTable, FEATURE_NAMES
+)
 
 if TYPE_CHECKING:
-    from ecs.models.domain import DBTransaction, DBEmotionalEvent
+    from ecs.models.domain import DBTransaction, DBEmotionalEvent, DBEmotionalFeatureBucket
+    from ecs.models.schemas import EmotionalEvent
+
+STRESS_EMOTIONS = frozenset(["anger", "fear", "anxiety", "stress"])
+POSITIVE_EMOTIONS = frozenset(["joy", "happiness", "excitement", "contentment"])
 
 class FeatureEngineeringService:
     def __init__(self) -> None:
@@ -14,7 +24,8 @@ class FeatureEngineeringService:
         self.transaction_limit = settings.feature_engineering_transactions_limit
         self.emotional_events_period_days = settings.feature_engineering_emotional_events_period_days
         self.emotional_events_limit = settings.feature_engineering_emotional_events_limit
-    
+        self.use_emotional_feature_store = settings.feature_engineering_use_emotional_feature_store
+
     @property
     def transactions_since(self) -> datetime:
         return datetime.now() - timedelta(days=self.transaction_period_days)
@@ -23,208 +34,360 @@ class FeatureEngineeringService:
     def emotional_events_since(self) -> datetime:
         return datetime.now() - timedelta(days=self.emotional_events_period_days)
 
-    async def create_features(self, transactions: Sequence["DBTransaction"], emotional_events: Sequence["DBEmotionalEvent"]) -> Features:
-        """Create ML features from transactional and emotional data"""
-        
-        # Calculate transactional features
-        avg_daily_spend = self._calculate_average_daily_spend(transactions)
-        avg_daily_transactions = self._calculate_average_daily_transactions(transactions)
-        max_single_transaction = self._calculate_max_single_transaction(transactions)
-        income_volatility = self._calculate_income_volatility(transactions)
-        
-        # Calculate emotional features
-        avg_emotional_stability = self._calculate_average_emotional_stability(emotional_events)
-        stress_events_count = self._calculate_stress_events_count(emotional_events)
-        positive_emotion_ratio = self._calculate_positive_emotion_ratio(emotional_events)
-        emotional_volatility = self._calculate_emotional_volatility(emotional_events)
-        
-        # Calculate time-weighted features
-        recent_emotional_trend = self._calculate_recent_emotional_trend(emotional_events)
-        spending_pattern_change = self._calculate_spending_pattern_change(transactions)
-        
-        # Calculate derived features
-        emotional_spending_correlation = self._calculate_emotional_spending_correlation(
-            transactions, emotional_events
+    async def create_features(
+        self,
+        transactions: Sequence["DBTransaction"] | TransactionAggregates,
+        emotional_events: Sequence["DBEmotionalEvent"] | EmotionalAggregates
+    ) -> Features:
+        """Create ML features from transactional and emotional data
+
+        Rows are packed into arrays once, reduced to sufficient statistics and every feature
+        is derived from those statistics, instead of walking the rows once per feature.
+        Either input may also be given already aggregated, e.g. by the database or the feature store
+        """
+        if isinstance(transactions, TransactionAggregates):
+            transaction_aggregates = transactions
+        else:
+            transaction_aggregates = self._aggregate_transactions(self._pack_transactions(transactions))
+
+        if isinstance(emotional_events, EmotionalAggregates):
+            emotional_aggregates = emotional_events
+        else:
+            emotional_aggregates = self._aggregate_emotional_events(self._pack_emotional_events(emotional_events))
+
+        return self._features_from_aggregates(transaction_aggregates, emotional_aggregates)
+
+    async def create_feature_table(
+        self,
+        user_ids: Sequence[uuid.UUID],
+        transactions: Sequence["DBTransaction"],
+        emotional_events: Sequence["DBEmotionalEvent"]
+    ) -> FeatureTable:
+        """Create the features of many users in one vectorized pass
+
+        Rows of every user are packed into shared columns and reduced per user,
+        users without rows get neutral features
+        """
+        owners_by_user = {user_id: position for position, user_id in enumerate(user_ids)}
+        transaction_aggregates = self._aggregate_transactions(
+            self._pack_transactions(transactions, owners_by_user), len(owners_by_user)
         )
-        
-        return Features(
-            average_daily_spend=avg_daily_spend,
-            avg_daily_transactions=avg_daily_transactions,
-            max_single_transaction=max_single_transaction,
-            income_volatility=income_volatility,
-            average_emotional_stability=avg_emotional_stability,
-            stress_events_count=stress_events_count,
-            positive_emotion_ratio=positive_emotion_ratio,
-            emotional_volatility=emotional_volatility,
-            recent_emotional_trend=recent_emotional_trend,
-            spending_pattern_change=spending_pattern_change,
-            emotional_spending_correlation=emotional_spending_correlation
+        emotional_aggregates = self._aggregate_emotional_events(
+            self._pack_emotional_events(emotional_events, owners_by_user), len(owners_by_user)
         )
-    
-    def _calculate_average_daily_spend(self, transactions: Sequence["DBTransaction"]) -> float:
-        """Calculate average daily spending"""
-        if not transactions:
-            return 0.0
-        
-        # Group transactions by day
-        daily_spends = {}
-        for transaction in transactions:
-            day = transaction.occurred_at.date()
-            amount = float(transaction.amount)
-            daily_spends[day] = daily_spends.get(day, 0) + amount
-        
-        return statistics.mean(daily_spends.values()) if daily_spends else 0.0
-    
-    def _calculate_average_daily_transactions(self, transactions: Sequence["DBTransaction"]) -> int:
-        """Calculate average daily transaction count"""
-        if not transactions:
-            return 0
-        
-        # Group transactions by day
-        daily_counts = {}
-        for transaction in transactions:
-            day = transaction.occurred_at.date()
-            daily_counts[day] = daily_counts.get(day, 0) + 1
-        
-        return round(statistics.mean(daily_counts.values())) if daily_counts else 0
-    
-    def _calculate_max_single_transaction(self, transactions: Sequence["DBTransaction"]) -> float:
-        """Calculate maximum single transaction amount"""
-        if not transactions:
-            return 0.0
-        return max(float(t.amount) for t in transactions)
-    
-    def _calculate_income_volatility(self, transactions: Sequence["DBTransaction"]) -> float:
-        """Calculate income volatility based on transaction amounts"""
-        if len(transactions) < 2:
-            return 0.0
-        
-        amounts = [float(t.amount) for t in transactions]
-        mean_amount = statistics.mean(amounts)
-        
-        if mean_amount == 0:
-            return 0.0
-        
-        # Coefficient of variation (standard deviation / mean)
-        std_dev = statistics.stdev(amounts)
-        return min(1.0, std_dev / mean_amount)
-    
-    def _calculate_average_emotional_stability(self, emotional_events: Sequence["DBEmotionalEvent"]) -> float:
-        """Calculate average emotional stability based on valence consistency"""
-        if not emotional_events:
-            return 0  # Neutral stability
-        
-        # Use valence as a proxy for emotional stability
-        # Higher valence = more positive emotions = more stable
-        valences = [event.valence for event in emotional_events]
-        return statistics.mean(valences)
-    
-    def _calculate_stress_events_count(self, emotional_events: Sequence["DBEmotionalEvent"]) -> int:
-        """Count stressful emotional events"""
-        if not emotional_events:
-            return 0
-        
-        # Define stress indicators: low valence, high arousal, or specific emotions
-        stress_count = 0
-        for event in emotional_events:
-            # Low valence (negative emotions) or high arousal (stress)
-            if event.valence < 0.3 or event.arousal > 0.7:
-                stress_count += 1
-            # Specific stress emotions
-            elif event.emotion_primary.lower() in ["anger", "fear", "anxiety", "stress"]:
-                stress_count += 1
-        
-        return stress_count
-    
-    def _calculate_positive_emotion_ratio(self, emotional_events: Sequence["DBEmotionalEvent"]) -> float:
-        """Calculate ratio of positive emotions"""
-        if not emotional_events:
-            return 0  # Neutral ratio
-        
-        positive_count = 0
-        for event in emotional_events:
-            # High valence indicates positive emotions
-            if event.valence > 0.35:
-                positive_count += 1
-            # Specific positive emotions
-            elif event.emotion_primary.lower() in ["joy", "happiness", "excitement", "contentment"]:
-                positive_count += 1
-        
-        return positive_count / len(emotional_events)
-    
-    def _calculate_emotional_volatility(self, emotional_events: Sequence["DBEmotionalEvent"]) -> float:
-        """Calculate emotional volatility based on valence changes"""
-        if len(emotional_events) < 2:
-            return 0.0
-        
-        # Sort by timestamp and calculate valence changes
-        sorted_events = sorted(emotional_events, key=lambda x: x.captured_at)
-        valence_changes = []
-        
-        for i in range(1, len(sorted_events)):
-            change = abs(sorted_events[i].valence - sorted_events[i-1].valence)
-            valence_changes.append(change)
-        
-        return statistics.mean(valence_changes) if valence_changes else 0.0
-    
-    def _calculate_recent_emotional_trend(self, emotional_events: Sequence["DBEmotionalEvent"]) -> float:
-        """Calculate recent emotional trend (positive = improving, negative = declining)"""
-        if len(emotional_events) < 2:
-            return 0.0
-        
-        # Sort by timestamp and split into recent vs older
-        sorted_events = sorted(emotional_events, key=lambda x: x.captured_at)
-        mid_point = len(sorted_events) // 2
-        
-        older_events = sorted_events[:mid_point]
-        recent_events = sorted_events[mid_point:]
-        
-        older_avg_valence = statistics.mean([e.valence for e in older_events])
-        recent_avg_valence = statistics.mean([e.valence for e in recent_events])
-        
-        # Return trend (-1 to 1)
-        return max(-1.0, min(1.0, recent_avg_valence - older_avg_valence))
-    
-    def _calculate_spending_pattern_change(self, transactions: Sequence["DBTransaction"]) -> float:
-        """Calculate spending pattern change over time"""
-        if len(transactions) < 4:
-            return 0.0
-        
-        # Sort by timestamp and split into recent vs older
-        sorted_transactions = sorted(transactions, key=lambda x: x.occurred_at)
-        mid_point = len(sorted_transactions) // 2
-        
-        older_transactions = sorted_transactions[:mid_point]
-        recent_transactions = sorted_transactions[mid_point:]
-        
-        older_avg_amount = statistics.mean([float(t.amount) for t in older_transactions])
-        recent_avg_amount = statistics.mean([float(t.amount) for t in recent_transactions])
-        
-        if older_avg_amount == 0:
-            return 0.0
-        
-        # Calculate percentage change
-        change_ratio = (recent_avg_amount - older_avg_amount) / older_avg_amount
-        return max(-1.0, min(1.0, change_ratio))
-    
-    def _calculate_emotional_spending_correlation(self, transactions: Sequence["DBTransaction"], emotional_events: Sequence["DBEmotionalEvent"]) -> float:
-        """Calculate correlation between emotional state and spending patterns"""
-        if not transactions or not emotional_events:
-            return 0.0
-        
-        # This is a simplified correlation calculation
-        
-        # Calculate average transaction amount
-        avg_transaction_amount = statistics.mean([float(t.amount) for t in transactions])
-        
-        # Calculate average emotional valence
-        avg_valence = statistics.mean([e.valence for e in emotional_events])
-        
-        # Simple correlation: if both are high or both are low, positive correlation
-        # This is a placeholder - real implementation would need time-aligned data
-        if avg_transaction_amount > 100 and avg_valence > 0.6:
-            return 0.3  # Positive correlation
-        elif avg_transaction_amount < 50 and avg_valence < 0.4:
-            return 0.2  # Positive correlation
-        else:
-            return 0.0  # No clear correlation
\ No newline at end of file
+
+        columns = self._feature_columns(transaction_aggregates, emotional_aggregates)
+        values = np.column_stack([columns[name] for name in FEATURE_NAMES]).astype(np.float64)
+        return FeatureTable(user_ids=list(owners_by_user), values=values)
+
+    def build_emotional_feature_buckets(self, emotional_events: Sequence["EmotionalEvent"]) -> list[EmotionalFeatureBucket]:
+        """Summarize newly ingested events into per user and UTC day feature bucket increments
+
+        Buckets come out sorted by (user_id, bucket_date), so concurrent upserts lock shared rows in the same order
+        """
+        groups: dict[tuple[uuid.UUID, date], list["EmotionalEvent"]] = {}
+        for event in sorted(emotional_events, key=lambda e: e.captured_at):
+            bucket_date = event.captured_at.astimezone(timezone.utc).date()
+            groups.setdefault((event.user_id, bucket_date), []).append(event)
+        # Events of a group stay in capture order
+        groups = dict(sorted(groups.items(), key=lambda group: group[0]))
+
+        # One segment per (user, day) group
+        columns = self._pack_emotional_events([event for events in groups.values() for event in events])
+        owners = np.repeat(np.arange(len(groups)), [len(events) for events in groups.values()])
+        columns = replace(columns, owners=owners)
+        aggregates = self._aggregate_emotional_events(columns, len(groups))
+        valence_sq_sums = np.bincount(owners, weights=np.square(columns.valences), minlength=len(groups))
+
+        buckets: list[EmotionalFeatureBucket] = []
+        for position, ((user_id, bucket_date), events) in enumerate(groups.items()):
+            buckets.append(EmotionalFeatureBucket(
+                user_id=user_id,
+                bucket_date=bucket_date,
+                event_count=int(aggregates.count[position]),
+                valence_sum=float(aggregates.valence_sum[position]),
+                valence_sq_sum=float(valence_sq_sums[position]),
+                stress_count=int(aggregates.stress_count[position]),
+                positive_count=int(aggregates.positive_count[position]),
+                valence_abs_change_sum=float(aggregates.valence_abs_change_sum[position]),
+                first_valence=events[0].valence,
+                last_valence=events[-1].valence,
+                first_captured_at=events[0].captured_at,
+                last_captured_at=events[-1].captured_at
+            ))
+        return buckets
+
+    @staticmethod
+    def aggregate_emotional_feature_buckets(buckets: Sequence["DBEmotionalFeatureBucket"]) -> EmotionalAggregates:
+        """Combine a user's daily feature buckets into the emotional aggregates
+
+        Counts, sums and volatility are exact for in-order ingestion. The older/recent half split
+        is exact when it falls on a bucket boundary, otherwise the boundary bucket is prorated by its mean
+        """
+        if not buckets:
+            return EmotionalAggregates(
+                count=0, valence_sum=0.0, stress_count=0, positive_count=0,
+                valence_abs_change_sum=0.0, older_half_valence_mean=0.0, recent_half_valence_mean=0.0
+            )
+
+        buckets = sorted(buckets, key=lambda b: b.bucket_date)
+        counts = np.array([b.event_count for b in buckets], dtype=np.float64)
+        valence_sums = np.array([b.valence_sum for b in buckets], dtype=np.float64)
+        first_valences = np.array([b.first_valence for b in buckets], dtype=np.float64)
+        last_valences = np.array([b.last_valence for b in buckets], dtype=np.float64)
+
+        count = int(counts.sum())
+        valence_sum = float(valence_sums.sum())
+
+        # Changes inside each bucket plus the change between the last event of a day and the first of the next
+        valence_abs_change_sum = sum(b.valence_abs_change_sum for b in buckets)
+        valence_abs_change_sum += float(np.abs(first_valences[1:] - last_valences[:-1]).sum())
+
+        # Number of events of each bucket that fall in the older half
+        mid_point = count // 2
+        events_before = np.cumsum(counts) - counts
+        older_counts = np.clip(mid_point - events_before, 0, counts)
+        older_valence_sum = float((older_counts * valence_sums / counts).sum())
+
+        return EmotionalAggregates(
+            count=count,
+            valence_sum=valence_sum,
+            stress_count=sum(b.stress_count for b in buckets),
+            positive_count=sum(b.positive_count for b in buckets),
+            valence_abs_change_sum=valence_abs_change_sum,
+            older_half_valence_mean=older_valence_sum / mid_point if mid_point else 0.0,
+            recent_half_valence_mean=(valence_sum - older_valence_sum) / (count - mid_point)
+        )
+
+    @staticmethod
+    def _pack_transactions(
+        transactions: Sequence["DBTransaction"],
+        owners_by_user: dict[uuid.UUID, int] | None = None
+    ) -> TransactionColumns:
+        """Single pass over the rows, Decimal to float conversion happens only here
+
+        Rows may be ORM entities or projected rows exposing the same attribute names.
+        owners_by_user maps user IDs to their position when packing rows of several users
+        """
+        packed = np.array(
+            [
+                (
+                    owners_by_user[t.user_id] if owners_by_user else 0,
+                    float(t.amount),
+                    t.occurred_at.timestamp(),
+                    t.occurred_at.toordinal()
+                )
+                for t in transactions
+            ],
+            dtype=np.float64
+        ).reshape(-1, 4)
+        return TransactionColumns(
+            owners=packed[:, 0].astype(np.int64),
+            amounts=packed[:, 1],
+            timestamps=packed[:, 2],
+            days=packed[:, 3].astype(np.int64)
+        )
+
+    @staticmethod
+    def _pack_emotional_events(
+        emotional_events: Sequence["DBEmotionalEvent"],
+        owners_by_user: dict[uuid.UUID, int] | None = None
+    ) -> EmotionalEventColumns:
+        """Single pass over the rows, emotion labels are classified only here
+
+        Rows may be ORM entities, projected rows or schemas exposing the same attribute names.
+        owners_by_user maps user IDs to their position when packing rows of several users
+        """
+        packed = np.array(
+            [
+                (
+                    owners_by_user[e.user_id] if owners_by_user else 0,
+                    e.valence,
+                    e.arousal,
+                    e.captured_at.timestamp(),
+                    (emotion := e.emotion_primary.lower()) in STRESS_EMOTIONS,
+                    emotion in POSITIVE_EMOTIONS
+                )
+                for e in emotional_events
+            ],
+            dtype=np.float64
+        ).reshape(-1, 6)
+        return EmotionalEventColumns(
+            owners=packed[:, 0].astype(np.int64),
+            valences=packed[:, 1],
+            arousals=packed[:, 2],
+            timestamps=packed[:, 3],
+            is_stress_emotion=packed[:, 4].astype(bool),
+            is_positive_emotion=packed[:, 5].astype(bool)
+        )
+
+    @staticmethod
+    def _aggregate_transactions(columns: TransactionColumns, user_count: int = 1) -> TransactionAggregates:
+        """Reduce transaction columns to the statistics needed by the transactional features
+
+        Segmented by owner, every field is an array with one entry per user
+        """
+        owners = columns.owners
+        count = np.bincount(owners, minlength=user_count)
+        total_amount = np.bincount(owners, weights=columns.amounts, minlength=user_count)
+        has_rows = count > 0
+
+        # Stable sort by user and then occurrence keeps ties in their original order, same as sorted()
+        order = np.lexsort((columns.timestamps, owners))
+        sorted_owners, amounts = owners[order], columns.amounts[order]
+        starts = np.cumsum(count) - count
+
+        max_amount = np.zeros(user_count)
+        if has_rows.any():
+            max_amount[has_rows] = np.maximum.reduceat(amounts, starts[has_rows])
+
+        # Distinct (user, day) pairs
+        user_days = np.unique(np.column_stack((owners, columns.days)), axis=0)
+        active_days = np.bincount(user_days[:, 0], minlength=user_count)
+
+        # Position of each transaction inside its user's segment splits older vs recent halves
+        mid_point = count // 2
+        is_older = (np.arange(len(amounts)) - starts[sorted_owners]) < mid_point[sorted_owners]
+        older_sum = np.bincount(sorted_owners, weights=np.where(is_older, amounts, 0.0), minlength=user_count)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_amount = total_amount / count
+            squared_deviations = np.bincount(
+                sorted_owners, weights=np.square(amounts - mean_amount[sorted_owners]), minlength=user_count
+            )
+            return TransactionAggregates(
+                count=count,
+                total_amount=total_amount,
+                max_amount=max_amount,
+                stddev_amount=np.where(count > 1, np.sqrt(squared_deviations / (count - 1)), 0.0),
+                active_days=active_days,
+                older_half_mean=np.where(mid_point > 0, older_sum / mid_point, 0.0),
+                recent_half_mean=np.where(has_rows, (total_amount - older_sum) / (count - mid_point), 0.0)
+            )
+
+    @staticmethod
+    def _aggregate_emotional_events(columns: EmotionalEventColumns, user_count: int = 1) -> EmotionalAggregates:
+        """Reduce emotional event columns to the statistics needed by the emotional features
+
+        Segmented by owner, every field is an array with one entry per user
+        """
+        owners = columns.owners
+        count = np.bincount(owners, minlength=user_count)
+        valence_sum = np.bincount(owners, weights=columns.valences, minlength=user_count)
+
+        # Low valence (negative emotions), high arousal (stress) or specific stress emotions
+        is_stress = (columns.valences < 0.3) | (columns.arousals > 0.7) | columns.is_stress_emotion
+        # High valence or specific positive emotions
+        is_positive = (columns.valences > 0.35) | columns.is_positive_emotion
+
+        # Single sort by user and capture time, shared by volatility and trend
+        order = np.lexsort((columns.timestamps, owners))
+        sorted_owners, valences = owners[order], columns.valences[order]
+        starts = np.cumsum(count) - count
+
+        # Changes between consecutive events of the same user
+        same_user = sorted_owners[1:] == sorted_owners[:-1]
+        valence_abs_change_sum = np.bincount(
+            sorted_owners[1:], weights=np.where(same_user, np.abs(np.diff(valences)), 0.0), minlength=user_count
+        )
+
+        mid_point = count // 2
+        is_older = (np.arange(len(valences)) - starts[sorted_owners]) < mid_point[sorted_owners]
+        older_sum = np.bincount(sorted_owners, weights=np.where(is_older, valences, 0.0), minlength=user_count)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return EmotionalAggregates(
+                count=count,
+                valence_sum=valence_sum,
+                stress_count=np.bincount(owners, weights=is_stress, minlength=user_count).astype(np.int64),
+                positive_count=np.bincount(owners, weights=is_positive, minlength=user_count).astype(np.int64),
+                valence_abs_change_sum=valence_abs_change_sum,
+                older_half_valence_mean=np.where(mid_point > 0, older_sum / mid_point, 0.0),
+                recent_half_valence_mean=np.where(count > 0, (valence_sum - older_sum) / (count - mid_point), 0.0)
+            )
+
+    def _features_from_aggregates(self, transactions: TransactionAggregates, emotional_events: EmotionalAggregates) -> Features:
+        columns = self._feature_columns(transactions, emotional_events)
+        return Features(**{name: value.item() for name, value in columns.items()})
+
+    @staticmethod
+    def _feature_columns(transactions: TransactionAggregates, emotional_events: EmotionalAggregates) -> dict[str, np.ndarray]:
+        """Derive every feature from the aggregates
+
+        Works elementwise, so aggregates may hold scalars or aligned arrays.
+        Divisions by zero are computed and then discarded by the surrounding np.where
+        """
+        tx_count = np.asarray(transactions.count, dtype=np.float64)
+        tx_total = np.asarray(transactions.total_amount, dtype=np.float64)
+        tx_days = np.asarray(transactions.active_days, dtype=np.float64)
+        tx_older = np.asarray(transactions.older_half_mean, dtype=np.float64)
+        tx_recent = np.asarray(transactions.recent_half_mean, dtype=np.float64)
+        ev_count = np.asarray(emotional_events.count, dtype=np.float64)
+        ev_valence_sum = np.asarray(emotional_events.valence_sum, dtype=np.float64)
+
+        has_transactions = tx_count > 0
+        has_events = ev_count > 0
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_amount = tx_total / tx_count
+            mean_valence = ev_valence_sum / ev_count
+
+            # Mean of the per day sums and counts, the number of days is enough to derive both
+            average_daily_spend = np.where(has_transactions, tx_total / tx_days, 0.0)
+            avg_daily_transactions = np.where(has_transactions, np.rint(tx_count / tx_days), 0.0)
+            max_single_transaction = np.where(has_transactions, transactions.max_amount, 0.0)
+
+            # Coefficient of variation (standard deviation / mean)
+            income_volatility = np.where(
+                (tx_count >= 2) & (mean_amount != 0),
+                np.minimum(1.0, np.asarray(transactions.stddev_amount) / mean_amount),
+                0.0
+            )
+
+            # Use valence as a proxy for emotional stability
+            average_emotional_stability = np.where(has_events, mean_valence, 0.0)
+            positive_emotion_ratio = np.where(has_events, np.asarray(emotional_events.positive_count) / ev_count, 0.0)
+            emotional_volatility = np.where(
+                ev_count >= 2, np.asarray(emotional_events.valence_abs_change_sum) / (ev_count - 1), 0.0
+            )
+
+            # Recent vs older halves, in capture/occurrence order
+            recent_emotional_trend = np.where(
+                ev_count >= 2,
+                np.clip(
+                    np.asarray(emotional_events.recent_half_valence_mean) - np.asarray(emotional_events.older_half_valence_mean),
+                    -1.0, 1.0
+                ),
+                0.0
+            )
+            spending_pattern_change = np.where(
+                (tx_count >= 4) & (tx_older != 0),
+                np.clip((tx_recent - tx_older) / tx_older, -1.0, 1.0),
+                0.0
+            )
+
+            # Simple correlation: if both are high or both are low, positive correlation
+            # This is a placeholder - real implementation would need time-aligned data
+            emotional_spending_correlation = np.where(
+                has_transactions & has_events,
+                np.select(
+                    [(mean_amount > 100) & (mean_valence > 0.6), (mean_amount < 50) & (mean_valence < 0.4)],
+                    [0.3, 0.2],
+                    0.0
+                ),
+                0.0
+            )
+
+        return {
+            "average_daily_spend": average_daily_spend,
+            "avg_daily_transactions": avg_daily_transactions.astype(np.int64),
+            "max_single_transaction": max_single_transaction,
+            "income_volatility": income_volatility,
+            "average_emotional_stability": average_emotional_stability,
+            "stress_events_count": np.asarray(emotional_events.stress_count, dtype=np.int64),
+            "positive_emotion_ratio": positive_emotion_ratio,
+            "emotional_volatility": emotional_volatility,
+            "recent_emotional_trend": recent_emotional_trend,
+            "spending_pattern_change": spending_pattern_change,
+            "emotional_spending_correlation": emotional_spending_correlation,
+        }
@@ -0,0 +1,88 @@
+import asyncio
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator
+
+import structlog
+import redis.asyncio as redis
+from redis.asyncio.client import PubSub
+from redis.exceptions import RedisError
+
+from ecs.core.db import redis_pool
+
+class JobEvents:
+    """Completion notices of RQ jobs, published on one Redis channel per job
+
+    Jobs publish from their success and failure callbacks, see ecs/workers/jobs.py. All subscriptions of the
+    process share a single pub/sub connection and listener task, so a waiting client holds no Redis connection.
+    Notices are not kept, subscribe before reading the job's state so a job finishing in between is not missed
+    """
+
+    def __init__(self, redis_client: redis.Redis) -> None:
+        self.redis = redis_client
+        self._pubsub: PubSub | None = None
+        self._listener: asyncio.Task | None = None
+        self._waiters: dict[str, set[asyncio.Future[str]]] = {}
+
+    @staticmethod
+    def channel(job_id: str) -> str:
+        return f"ecs:job-events:{job_id}"
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: str) -> AsyncIterator[asyncio.Future[str]]:
+        """Future resolved with the payload of the next notice of the job
+
+        When Redis is unavailable the future is never resolved, callers bound the wait with a timeout anyway
+        """
+        channel = self.channel(job_id)
+        notice: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        waiters = self._waiters.setdefault(channel, set())
+        subscribe = not waiters
+        waiters.add(notice)
+        try:
+            if subscribe:
+                try:
+                    await self._get_pubsub().subscribe(channel)
+                    self._ensure_listener()
+                except RedisError as e:
+                    structlog.get_logger().warning("Failed to subscribe to job events", job_id=job_id, error=str(e))
+            yield notice
+        finally:
+            notice.cancel()
+            waiters.discard(notice)
+            if not waiters and self._waiters.get(channel) is waiters:
+                del self._waiters[channel]
+                try:
+                    await self._get_pubsub().unsubscribe(channel)
+                except RedisError as e:
+                    structlog.get_logger().warning("Failed to unsubscribe from job events", job_id=job_id, error=str(e))
+
+    def _get_pubsub(self) -> PubSub:
+        if self._pubsub is None:
+            self._pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        return self._pubsub
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self) -> None:
+        pubsub = self._get_pubsub()
+        while True:
+            try:
+                message = await pubsub.get_message(timeout=1.0)
+            except RedisError as e:
+                # The connection is re-established and the channels resubscribed on the next read
+                structlog.get_logger().warning("Job events connection lost", error=str(e))
+                await asyncio.sleep(1.0)
+                continue
+            if message is None or message["type"] != "message":
+                continue
+            for notice in self._waiters.get(message["channel"], ()):
+                if not notice.done():
+                    notice.set_result(message["data"])
+
+@lru_cache(maxsize=1)
+def get_job_events() -> JobEvents:
+    """Process-wide job events subscriber"""
+    return JobEvents(redis_client=redis.Redis(connection_pool=redis_pool))
@@ -0,0 +1,125 @@
+import asyncio
+import contextvars
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Sequence
+
+import structlog
+
+from ecs.services.exceptions import ServiceOverloadedError
+
+@dataclass(slots=True)
+class MicroBatcherStats:
+    batches: int = 0
+    items: int = 0
+    rejected: int = 0
+
+    def fill_ratio(self, max_batch_size: int) -> float:
+        """Average batch size relative to the maximum batch size"""
+        return self.items / (self.batches * max_batch_size) if self.batches else 0.0
+
+class MicroBatcher[I, O]:
+    """Collects concurrent single item requests into batch calls
+
+    A batch is sent once max_batch_size items are waiting or max_wait_ms went by since its first item,
+    whichever comes first. Every caller gets the result at its own position of the batch.
+    At most max_queue_depth items may wait, further submissions are rejected instead of queueing without bound
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[Sequence[I]], Awaitable[Sequence[O]]],
+        max_batch_size: int,
+        max_wait_ms: float,
+        max_queue_depth: int,
+        name: str
+    ) -> None:
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_ms / 1000
+        self.max_queue_depth = max_queue_depth
+        self.name = name
+        self.stats = MicroBatcherStats()
+        self._queue: asyncio.Queue[tuple[I, asyncio.Future[O]]] = asyncio.Queue(maxsize=max_queue_depth)
+        self._worker: asyncio.Task | None = None
+        self._dispatches: set[asyncio.Task] = set()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    async def submit(self, item: I) -> O:
+        future: asyncio.Future[O] = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            self.stats.rejected += 1
+            raise ServiceOverloadedError(f"{self.name} queue is full", extra_context={"queue_depth": self.queue_depth})
+
+        if self._worker is None or self._worker.done():
+            # Fresh context, the worker outlives the request that happened to start it
+            self._worker = asyncio.create_task(
+                self._run(), name=f"{self.name}-micro-batcher", context=contextvars.Context()
+            )
+        return await future
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+
+            # Fill the batch until it is full or the oldest item waited long enough
+            deadline = time.monotonic() + self.max_wait_seconds
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except TimeoutError:
+                    break
+
+            # Keep collecting the next batch while this one is being processed
+            dispatch = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(dispatch)
+            dispatch.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: list[tuple[I, asyncio.Future[O]]]) -> None:
+        logger = structlog.get_logger()
+        self.stats.batches += 1
+        self.stats.items += len(batch)
+        logger.debug(
+            "Dispatching micro batch",
+            batcher=self.name,
+            batch_size=len(batch),
+            fill_ratio=len(batch) / self.max_batch_size,
+            avg_fill_ratio=self.stats.fill_ratio(self.max_batch_size),
+            queue_depth=self.queue_depth
+        )
+
+        # Callers that went away no longer need a result
+        pending = [(item, future) for item, future in batch if not future.done()]
+        if not pending:
+            return
+
+        try:
+            results = await self.process_batch([item for item, _ in pending])
+            if len(results) != len(pending):
+                raise RuntimeError(f"{self.name} returned {len(results)} results for {len(pending)} items")
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
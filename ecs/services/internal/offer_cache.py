@@ -0,0 +1,74 @@
+import uuid
+from functools import lru_cache
+from typing import Iterable, Sequence
+
+import structlog
+import redis.asyncio as redis
+from pydantic import ValidationError
+from redis.exceptions import RedisError
+
+from ecs.core.config import settings
+from ecs.core.db import redis_pool
+from ecs.models.schemas import PrecomputedOffer
+
+class PrecomputedOfferCache:
+    """Offers computed ahead of the application, one Redis entry per user
+
+    Entries are written by the re-scoring pipeline and dropped when the user's features change.
+    Callers still have to check an entry against the current risk assessment and pricing policy
+    """
+
+    def __init__(self, redis_client: redis.Redis, ttl_seconds: int) -> None:
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def key(user_id: uuid.UUID) -> str:
+        return f"ecs:precomputed-offer:{user_id}"
+
+    async def get(self, user_id: uuid.UUID) -> PrecomputedOffer | None:
+        logger = structlog.get_logger()
+        try:
+            value = await self.redis.get(self.key(user_id))
+        except RedisError as e:
+            logger.warning("Precomputed offer cache unavailable", error=str(e))
+            return None
+        if value is None:
+            return None
+
+        try:
+            return PrecomputedOffer.model_validate_json(value)
+        except ValidationError as e:
+            logger.warning("Discarding unreadable precomputed offer", error=str(e))
+            return None
+
+    async def set_many(self, offers: Sequence[PrecomputedOffer]) -> None:
+        if not offers:
+            return
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for offer in offers:
+                    pipe.set(self.key(offer.user_id), offer.model_dump_json(), ex=self.ttl_seconds)
+                await pipe.execute()
+        except RedisError as e:
+            structlog.get_logger().warning("Failed to store precomputed offers", count=len(offers), error=str(e))
+
+    async def invalidate(self, user_ids: Iterable[uuid.UUID]) -> None:
+        keys = [self.key(user_id) for user_id in set(user_ids)]
+        if not keys:
+            return
+        try:
+            await self.redis.delete(*keys)
+        except RedisError as e:
+            # The entries still expire after ttl_seconds
+            structlog.get_logger().warning("Failed to invalidate precomputed offers", count=len(keys), error=str(e))
+
+@lru_cache(maxsize=1)
+def get_precomputed_offer_cache() -> PrecomputedOfferCache | None:
+    """Process-wide precomputed offer cache, None when disabled"""
+    if not settings.credit_offer_precompute:
+        return None
+    return PrecomputedOfferCache(
+        redis_client=redis.Redis(connection_pool=redis_pool),
+        ttl_seconds=settings.credit_offer_precompute_ttl_seconds
+    )
@@ -0,0 +1,119 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+import structlog
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from ecs.core.config import settings
+from ecs.core.db import redis_pool
+
+@dataclass(slots=True)
+class PredictionCacheStats:
+    local_hits: int = 0
+    shared_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.local_hits + self.shared_hits + self.misses
+        return (self.local_hits + self.shared_hits) / lookups if lookups else 0.0
+
+class PredictionCache:
+    """Risk scores keyed by model version and quantized features
+
+    Features are rounded to a few significant digits before hashing, so near-identical feature vectors share
+    an entry. Lookups go through an in-process LRU first, then through Redis shared by all workers.
+    Both tiers expire entries after ttl_seconds. Without a Redis client only the local tier is used
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis | None,
+        max_entries: int,
+        ttl_seconds: int,
+        significant_digits: int
+    ) -> None:
+        self.redis = redis_client
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.significant_digits = significant_digits
+        self.stats = PredictionCacheStats()
+        self._local: OrderedDict[str, tuple[float, float]] = OrderedDict()  # key: (risk score, expires at)
+
+    def key(self, model_version: str, features: np.ndarray) -> str:
+        """Cache key of a single feature row"""
+        quantized = ",".join(f"{value:.{self.significant_digits}g}" for value in features.tolist())
+        digest = hashlib.blake2b(quantized.encode(), digest_size=16).hexdigest()
+        return f"ecs:prediction-cache:{model_version}:{digest}"
+
+    async def get_many(self, keys: Sequence[str]) -> list[float | None]:
+        now = time.monotonic()
+        scores: list[float | None] = [self._get_local(key, now) for key in keys]
+        self.stats.local_hits += sum(score is not None for score in scores)
+
+        missing = [position for position, score in enumerate(scores) if score is None]
+        if missing and self.redis is not None:
+            try:
+                shared = await self.redis.mget([keys[position] for position in missing])
+            except RedisError as e:
+                structlog.get_logger().warning("Prediction cache unavailable", error=str(e))
+                shared = [None] * len(missing)
+
+            for position, value in zip(missing, shared):
+                if value is not None:
+                    scores[position] = float(value)
+                    self._set_local(keys[position], float(value), now)
+                    self.stats.shared_hits += 1
+
+        self.stats.misses += sum(score is None for score in scores)
+        return scores
+
+    async def set_many(self, keys: Sequence[str], scores: Sequence[float]) -> None:
+        now = time.monotonic()
+        for key, score in zip(keys, scores):
+            self._set_local(key, score, now)
+
+        if self.redis is None or not keys:
+            return
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, score in zip(keys, scores):
+                    pipe.set(key, repr(score), ex=self.ttl_seconds)
+                await pipe.execute()
+        except RedisError as e:
+            structlog.get_logger().warning("Failed to store predictions in the shared cache", error=str(e))
+
+    def _get_local(self, key: str, now: float) -> float | None:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        score, expires_at = entry
+        if expires_at <= now:
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return score
+
+    def _set_local(self, key: str, score: float, now: float) -> None:
+        self._local[key] = (score, now + self.ttl_seconds)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+@lru_cache(maxsize=1)
+def get_prediction_cache() -> PredictionCache | None:
+    """Process-wide prediction cache, None when disabled"""
+    if not settings.credit_model_prediction_cache:
+        return None
+    return PredictionCache(
+        redis_client=redis.Redis(connection_pool=redis_pool),
+        max_entries=settings.credit_model_prediction_cache_size,
+        ttl_seconds=settings.credit_model_prediction_cache_ttl_seconds,
+        significant_digits=settings.credit_model_prediction_cache_significant_digits
+    )
@@ -0,0 +1,195 @@
+import os
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Mapping, Self
+
+import numpy as np
+import structlog
+from pydantic import BaseModel, Field, model_validator
+
+from ecs.core.config import settings
+from ecs.models.schemas import FEATURE_NAMES
+
+DEFAULT_PRICING_POLICY_PATH = Path(__file__).parent / "pricing_policies" / "default.json"
+
+# Curves may read any feature or the risk score itself
+CURVE_INPUTS = (*FEATURE_NAMES, "risk_score")
+
+class CurvePolicy(BaseModel):
+    """Maps an input to [min_value, max_value]
+
+    The input is normalized to [0, 1] with lower_bound and upper_bound, values outside are clamped.
+    Without bounds the input must already be in [0, 1]. The result is
+        (max_value - min_value) * (metric ** bias_factor) + min_value
+    with metric replaced by 1 - metric when invert is set
+    """
+    name: str
+    feature: str
+    lower_bound: float | None = None
+    upper_bound: float | None = None
+    min_value: float
+    max_value: float
+    bias_factor: float = Field(gt=0)
+    invert: bool = False
+
+    @model_validator(mode="after")
+    def _check(self) -> Self:
+        if self.feature not in CURVE_INPUTS:
+            raise ValueError(f"Unknown curve input {self.feature!r} in curve {self.name!r}")
+        if (self.lower_bound is None) != (self.upper_bound is None):
+            raise ValueError(f"Curve {self.name!r} needs both bounds or none")
+        if self.lower_bound is not None and self.lower_bound == self.upper_bound:
+            raise ValueError(f"Upper and lower bounds of curve {self.name!r} must be different")
+        return self
+
+class CreditLimitPolicy(BaseModel):
+    """Base limit = max(min_limit, max_limit * (1 - risk_score ** risk_exponent))"""
+    min_limit: float = Field(ge=0)
+    max_limit: float = Field(gt=0)
+    risk_exponent: float = Field(gt=0)
+
+class PricingPolicy(BaseModel):
+    """Declarative pricing policy, loaded from a versioned JSON file"""
+    version: str
+    credit_limit: CreditLimitPolicy
+    multipliers: list[CurvePolicy]
+    apr: CurvePolicy
+
+def _power_function(exponent: float) -> Callable[[np.ndarray], np.ndarray]:
+    # Common exponents get their exact dedicated ufunc, same results as ** without the generic pow
+    match exponent:
+        case 1:
+            return lambda metric: metric
+        case 2:
+            return np.square
+        case 0.5:
+            return np.sqrt
+        case _:
+            return lambda metric: np.power(metric, exponent)
+
+@dataclass(frozen=True, slots=True)
+class CompiledCurve:
+    """A CurvePolicy with its constants folded, evaluated in place over a whole column"""
+    name: str
+    feature: str
+    lower_bound: float | None
+    range: float | None
+    min_value: float
+    span: float
+    invert: bool
+    power: Callable[[np.ndarray], np.ndarray]
+
+    @classmethod
+    def compile(cls, curve: CurvePolicy) -> "CompiledCurve":
+        return cls(
+            name=curve.name,
+            feature=curve.feature,
+            lower_bound=curve.lower_bound,
+            range=None if curve.lower_bound is None else curve.upper_bound - curve.lower_bound,
+            min_value=curve.min_value,
+            span=curve.max_value - curve.min_value,
+            invert=curve.invert,
+            power=_power_function(curve.bias_factor)
+        )
+
+    def __call__(self, values: np.ndarray) -> np.ndarray:
+        if self.lower_bound is None:
+            metric = np.array(values, dtype=np.float64)
+            if not np.all((0.0 <= metric) & (metric <= 1.0)):
+                raise ValueError(f"Input of curve {self.name!r} must be in the interval [0, 1].")
+        else:
+            metric = np.subtract(values, self.lower_bound, dtype=np.float64)
+            metric /= self.range
+            np.clip(metric, 0.0, 1.0, out=metric)
+
+        if self.invert:
+            np.subtract(1.0, metric, out=metric)
+        result = self.power(metric)
+        result *= self.span
+        result += self.min_value
+        return result
+
+@dataclass(frozen=True, slots=True)
+class CompiledPricingPolicy:
+    version: str
+    min_limit: float
+    max_limit: float
+    limit_power: Callable[[np.ndarray], np.ndarray]
+    multipliers: tuple[CompiledCurve, ...]
+    apr: CompiledCurve
+
+    @classmethod
+    def compile(cls, policy: PricingPolicy) -> "CompiledPricingPolicy":
+        return cls(
+            version=policy.version,
+            min_limit=policy.credit_limit.min_limit,
+            max_limit=policy.credit_limit.max_limit,
+            limit_power=_power_function(policy.credit_limit.risk_exponent),
+            multipliers=tuple(CompiledCurve.compile(curve) for curve in policy.multipliers),
+            apr=CompiledCurve.compile(policy.apr)
+        )
+
+    def base_limits(self, risk_scores: np.ndarray) -> np.ndarray:
+        # Inverse relationship: lower risk = higher limit
+        return np.maximum(self.min_limit, self.max_limit * (1 - self.limit_power(risk_scores)))
+
+    def multiplier(self, inputs: Mapping[str, np.ndarray]) -> np.ndarray:
+        multiplier = 1.0
+        for curve in self.multipliers:
+            multiplier = multiplier * curve(inputs[curve.feature])
+        return multiplier
+
+    def aprs(self, inputs: Mapping[str, np.ndarray]) -> np.ndarray:
+        return self.apr(inputs[self.apr.feature])
+
+def load_pricing_policy(path: str | Path) -> CompiledPricingPolicy:
+    return CompiledPricingPolicy.compile(PricingPolicy.model_validate_json(Path(path).read_bytes()))
+
+class PricingPolicyStore:
+    """Serves the compiled pricing policy of a file and recompiles it when the file changes
+
+    The file modification time is checked at most every reload_interval_seconds. A policy file that
+    fails to load is logged and the previous policy keeps being served
+    """
+
+    def __init__(self, path: str | Path, reload_interval_seconds: float) -> None:
+        self.path = Path(path)
+        self.reload_interval_seconds = reload_interval_seconds
+        self._mtime_ns = os.stat(self.path).st_mtime_ns
+        self._policy = load_pricing_policy(self.path)
+        self._checked_at = time.monotonic()
+
+    def current(self) -> CompiledPricingPolicy:
+        now = time.monotonic()
+        if now - self._checked_at >= self.reload_interval_seconds:
+            self._checked_at = now
+            self._reload_if_changed()
+        return self._policy
+
+    def _reload_if_changed(self) -> None:
+        logger = structlog.get_logger()
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+            if mtime_ns == self._mtime_ns:
+                return
+            # A broken file is reported once, not on every check
+            self._mtime_ns = mtime_ns
+            policy = load_pricing_policy(self.path)
+        except (OSError, ValueError) as e:
+            logger.error("Failed to reload pricing policy, keeping the current one", path=str(self.path), version=self._policy.version, error=str(e))
+            return
+
+        logger.info("Reloaded pricing policy", path=str(self.path), previous_version=self._policy.version, version=policy.version)
+        self._policy = policy
+
+@lru_cache(maxsize=1)
+def get_pricing_policy_store() -> PricingPolicyStore:
+    """Process-wide pricing policy, the bundled default unless credit_pricing_policy_path is set"""
+    store = PricingPolicyStore(
+        settings.credit_pricing_policy_path or DEFAULT_PRICING_POLICY_PATH,
+        settings.credit_pricing_policy_reload_seconds
+    )
+    structlog.get_logger().info("Loaded pricing policy", path=str(store.path), version=store.current().version)
+    return store
@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Sequence
+import uuid
+
+import numpy as np
+import structlog
+
+from ecs.core.config import settings
+from ecs.core.db import AsyncSessionDep
+from ecs.models.schemas import FeatureTable, PrecomputedOffer
+from ecs.services.dependencies import CreditRepositoryDep, CreditModelServiceDep, PrecomputedOfferCacheDep
+from ecs.services.credit_service import CreditOfferCalculator
+from ecs.services.feature_service import FeatureService
+
+# Scale of DBRiskAssessment.risk_score, offers are priced from the score as it is stored
+RISK_SCORE_DIGITS = 4
+
+@dataclass(frozen=True, slots=True)
+class RescoringResult:
+    users: int
+    scored: int
+    precomputed_offers: int = 0
+
+class RescoringService:
+    """Refreshes the risk assessments of many users at once, one chunk per call
+
+    Features come from a single set-based pass, the model scores the whole chunk in one call and the
+    assessments are bulk inserted and committed together. With an offer cache the offers of the chunk
+    are priced in one pass as well and stored for apply to pick up
+    """
+
+    def __init__(
+        self,
+        feature_service: FeatureService,
+        credit_model_service: CreditModelServiceDep,
+        credit_repository: CreditRepositoryDep,
+        session: AsyncSessionDep,
+        offer_cache: PrecomputedOfferCacheDep = None
+    ) -> None:
+        self.db = session
+        self.offer_cache = offer_cache
+        self.feature_service = feature_service
+        self.credit_model_service = credit_model_service
+        self.credit_repository = credit_repository
+
+    async def rescore_users(self, user_ids: Sequence[uuid.UUID]) -> RescoringResult:
+        logger = structlog.get_logger()
+        if not user_ids:
+            return RescoringResult(users=0, scored=0)
+
+        feature_table = await self.feature_service.create_feature_table(user_ids)
+        risk_scores = await self.credit_model_service.predict_risk_scores(feature_table.values)
+
+        # Nothing is stored for a user the model could not score
+        scored = np.isfinite(risk_scores)
+        scored_table = FeatureTable(
+            user_ids=[user_id for user_id, ok in zip(feature_table.user_ids, scored.tolist()) if ok],
+            values=feature_table.values[scored]
+        )
+        stored_risk_scores = [round(risk_score, RISK_SCORE_DIGITS) for risk_score in risk_scores[scored].tolist()]
+
+        try:
+            risk_assessment_ids = await self.credit_repository.create_risk_assessments(
+                scored_table.user_ids,
+                stored_risk_scores,
+                expires_at=datetime.now() + timedelta(days=settings.risk_assessment_ttl_days),
+                db=self.db
+            )
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+
+        precomputed_offers = 0
+        if self.offer_cache is not None and len(scored_table):
+            precomputed_offers = await self._precompute_offers(scored_table, stored_risk_scores, risk_assessment_ids)
+
+        result = RescoringResult(users=len(feature_table), scored=len(scored_table), precomputed_offers=precomputed_offers)
+        logger.info(
+            "Rescored users",
+            users=result.users,
+            scored=result.scored,
+            precomputed_offers=result.precomputed_offers,
+            model_version=self.credit_model_service.model_version
+        )
+        return result
+
+    async def _precompute_offers(
+        self, feature_table: FeatureTable, risk_scores: Sequence[float], risk_assessment_ids: Sequence[uuid.UUID]
+    ) -> int:
+        calculator = CreditOfferCalculator()
+        offers = calculator.calculate_offers(np.array(risk_scores), feature_table)
+        await self.offer_cache.set_many([
+            PrecomputedOffer(
+                user_id=user_id,
+                risk_assessment_id=risk_assessment_id,
+                pricing_policy_version=calculator.policy.version,
+                offer=offers.to_credit_offer(position)
+            )
+            for position, (user_id, risk_assessment_id) in enumerate(zip(feature_table.user_ids, risk_assessment_ids))
+        ])
+        return len(offers)
@@ -1,43 +1,91 @@
+import argparse
 import asyncio
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+import multiprocessing
+from multiprocessing.connection import wait
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
 from ecs.core.config import settings
+from ecs.core.logging import configure_logging
 from ecs.services.consumers import EmotionQueueConsumer
 from ecs.services.emotion_service import EmotionService
+from ecs.services.internal import FeatureEngineeringService, get_precomputed_offer_cache
 from ecs.repositories.implementations.emotion_repository import EmotionalEventsRepository
 
 # Emotional events consumer process entrypoint
+# Each process has its own engine, RabbitMQ connection and event loop, and writes up to
+# --concurrency batches at once. With --processes above 1 the entrypoint starts that many
+# consumer processes and waits for them, RabbitMQ spreads the messages over their channels
+
+def _emotion_service(session: AsyncSession) -> EmotionService:
+    return EmotionService(
+        EmotionalEventsRepository(), FeatureEngineeringService(), session, offer_cache=get_precomputed_offer_cache()
+    )
 
-async def main():
-    engine = create_async_engine(settings.DB_URL)
+async def consume(concurrency: int):
+    # One pooled connection per concurrent batch
+    engine = create_async_engine(settings.DB_URL, pool_size=concurrency, max_overflow=0)
     SessionLocal = async_sessionmaker(
         bind=engine, 
         autoflush=False, 
         autocommit=False, 
         expire_on_commit=False
     )
-    session = SessionLocal()
 
     try:
-        # Initialize repositories and services manually
-        emotion_repo = EmotionalEventsRepository()
-        emotion_service = EmotionService(emotion_repo, session)
-        
         # Create consumer
         consumer = EmotionQueueConsumer(
-            emotion_service=emotion_service,
+            emotion_service_factory=_emotion_service,
+            session_factory=SessionLocal,
             connection_params={
                 "host": settings.RABBITMQ_HOST,
                 "port": settings.RABBITMQ_PORT,
                 "username": settings.RABBITMQ_USER,
                 "password": settings.RABBITMQ_PASS
-            }
+            },
+            concurrency=concurrency
         )
         
         # Start consuming
         await consumer.start_consuming()
     finally:
-        await session.close()
         await engine.dispose()
 
+def _run_consumer(concurrency: int):
+    configure_logging()
+    asyncio.run(consume(concurrency))
+
+def main():
+    parser = argparse.ArgumentParser(description="Consume emotional events from RabbitMQ")
+    parser.add_argument("--processes", type=int, default=settings.emotion_consumer_processes)
+    parser.add_argument("--concurrency", type=int, default=settings.emotion_consumer_concurrency)
+    args = parser.parse_args()
+
+    configure_logging()
+    logger = structlog.get_logger()
+    logger.info("Starting emotional events consumer", processes=args.processes, concurrency=args.concurrency)
+    if args.processes <= 1:
+        asyncio.run(consume(args.concurrency))
+        return
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_run_consumer, args=(args.concurrency,), name=f"emotion-consumer-{position}")
+        for position in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        # A consumer only returns on failure, the others are stopped so the container restarts as a whole
+        wait([process.sentinel for process in processes])
+        logger.error("Emotional events consumer process exited, stopping the others")
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+    raise SystemExit(1)
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main()
@@ -1,21 +1,51 @@
+import asyncio
+import os
 import uuid
 import structlog
-import time
 import datetime
-from typing import Any
+from functools import lru_cache
+from typing import Any, Awaitable, Callable
 
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import sessionmaker
+from redis import Redis
+from redis.exceptions import RedisError
+from rq import Queue, get_current_job
+from rq.job import Job, JobStatus
+from sqlalchemy import Engine, create_engine, select
+from sqlalchemy.orm import Session, sessionmaker
 from structlog.contextvars import bind_contextvars
 
 from ecs.core.config import settings
 from ecs.models.domain import DBCreditOffer, DBCreditAccount
-from ecs.models.schemas import CreditOfferStatus
+from ecs.models.schemas import CreditOfferStatus, CreditAcceptanceOutcome, CreditAcceptJobStatus
+from ecs.repositories.credit_cache import invalidate_credit_eligibility_sync
+from ecs.services.internal.job_events import JobEvents
 
+# Wait before the first retry of a failed notification, doubled for every further one
+NOTIFICATION_RETRY_BACKOFF_SECONDS = 0.2
 
 
-def process_credit_acceptance(offer_id: str, user_id: str) -> None:
-    """Background job to process credit offer acceptance"""
+@lru_cache(maxsize=1)
+def get_job_engine() -> Engine:
+    """One pooled engine per worker process, shared by every job the process runs
+
+    Connections are checked before use, a job does not fail on one the database dropped while the worker was idle
+    """
+    engine = create_engine(
+        settings.DB_URL,
+        pool_size=settings.worker_db_pool_size,
+        max_overflow=0,
+        pool_pre_ping=True
+    )
+    # A forked work horse must not share the parent's connections, it opens its own
+    os.register_at_fork(after_in_child=lambda: engine.dispose(close=False))
+    return engine
+
+@lru_cache(maxsize=1)
+def get_job_session_factory() -> sessionmaker[Session]:
+    return sessionmaker(bind=get_job_engine())
+
+def process_credit_acceptance(offer_id: str, user_id: str) -> str:
+    """Background job to process credit offer acceptance, returns the CreditAcceptanceOutcome"""
     logger = structlog.get_logger()
     bind_contextvars(offer_id=offer_id, user_id=user_id)
     logger.info("Processing credit acceptance")
@@ -24,12 +54,8 @@ def process_credit_acceptance(offer_id: str, user_id: str) -> None:
     offer_uuid = uuid.UUID(offer_id)
     user_uuid = uuid.UUID(user_id)
     
-    # Create database connection for this job
-    engine = create_engine(settings.DB_URL)
-    SessionLocal = sessionmaker(bind=engine)
-    
     try:
-        with SessionLocal() as session:
+        with get_job_session_factory()() as session:
             # Get the credit offer once more to ensure fresh data
             stmt = select(DBCreditOffer).where(
                 DBCreditOffer.id == offer_uuid,
@@ -41,7 +67,7 @@ def process_credit_acceptance(offer_id: str, user_id: str) -> None:
             
             if not credit_offer:
                 logger.error("Credit offer not found or not in offered status")
-                return
+                return CreditAcceptanceOutcome.offer_unavailable.value
             
             # Check if user already has a credit account
             existing_account = session.execute(
@@ -51,7 +77,7 @@ def process_credit_acceptance(offer_id: str, user_id: str) -> None:
             if existing_account:
                 logger.error("User already has an active credit account", 
                     account_id=str(existing_account.id))
-                return
+                return CreditAcceptanceOutcome.account_exists.value
             
             # Create credit account
             credit_account = DBCreditAccount(
@@ -69,56 +95,102 @@ def process_credit_acceptance(offer_id: str, user_id: str) -> None:
             # Add and commit changes
             session.add(credit_account)
             session.commit()
+            invalidate_credit_eligibility_sync(user_uuid)
             
             logger.info("Credit acceptance processed successfully", 
                 account_id=str(credit_account.id))
 
-            # Send notification to user through specified channels
-            notification_service = NotificationService("mock-service-url")
-            notification_service.notify(user_id, "Your credit account has been created", ["push", "email"])
-            
+        # Send notification to user through specified channels, after the session is closed
+        notify_user(user_id, "Your credit account has been created", ["push", "email"])
+        return CreditAcceptanceOutcome.account_created.value
+
     except Exception as e:
         logger.error("Failed to process credit acceptance", error=str(e))
         raise
-    finally:
-        engine.dispose()    
+
+def notify_user(user_id: str, message: str, notification_types: list[str]) -> None:
+    """Sends the notification right away, or queues it when settings.notification_queue is set
+
+    A queued notification no longer holds up the job that triggered it
+    """
+    if settings.notification_queue:
+        job = get_current_job()
+        if job is not None:
+            try:
+                Queue(settings.notification_queue, connection=job.connection).enqueue(
+                    send_notification, user_id=user_id, message=message, notification_types=notification_types
+                )
+                return
+            except RedisError as e:
+                structlog.get_logger().warning("Failed to queue notification, sending it right away", error=str(e))
+    send_notification(user_id, message, notification_types)
+
+def send_notification(user_id: str, message: str, notification_types: list[str]) -> dict[str, Any]:
+    """Background job delivering a notification through all its channels at once"""
+    bind_contextvars(user_id=user_id)
+    return asyncio.run(NotificationService("mock-service-url").notify(user_id, message, notification_types))
+
+def publish_credit_acceptance_success(job: Job, connection: Redis, result: str, *args, **kwargs) -> None:
+    """RQ success callback of process_credit_acceptance, wakes up clients waiting on the job"""
+    _publish_credit_acceptance(job, connection, JobStatus.FINISHED, CreditAcceptanceOutcome(result))
+
+def publish_credit_acceptance_failure(job: Job, connection: Redis, *exc_info) -> None:
+    """RQ failure callback of process_credit_acceptance"""
+    _publish_credit_acceptance(job, connection, JobStatus.FAILED, None)
+
+def _publish_credit_acceptance(
+    job: Job, connection: Redis, status: JobStatus, outcome: CreditAcceptanceOutcome | None
+) -> None:
+    # Callbacks run before RQ stores the final status, so the notice carries it
+    job_status = CreditAcceptJobStatus(id=job.id, offer_id=job.kwargs["offer_id"], status=status.value, outcome=outcome)
+    try:
+        connection.publish(JobEvents.channel(job.id), job_status.model_dump_json())
+    except RedisError as e:
+        # Waiting clients still get the state once their wait times out, the job itself is done
+        structlog.get_logger().warning("Failed to publish credit acceptance", job_id=job.id, error=str(e))
 
 class NotificationService:
     """Service for sending notifications through various channels."""
     
-    def __init__(self, service_url: str, email_config: dict[str, Any] | None = None) -> None:
+    def __init__(
+        self,
+        service_url: str,
+        email_config: dict[str, Any] | None = None,
+        timeout_seconds: float | None = None,
+        retries: int | None = None
+    ) -> None:
         """
         Initialize the notification service.
         
         Args:
             service_url: Base URL for notification services
             email_config: Email configuration dictionary with smtp_server, port, username, password
+            timeout_seconds: Limit of a single delivery attempt, defaults to settings.notification_timeout_seconds
+            retries: Attempts after the first failed one, defaults to settings.notification_retries
         """
         self.service_url = service_url
         self.email_config = email_config or {}
+        self.timeout_seconds = settings.notification_timeout_seconds if timeout_seconds is None else timeout_seconds
+        self.retries = settings.notification_retries if retries is None else retries
         self.logger = structlog.get_logger()
+        self.channels: dict[str, Callable[[str, str], Awaitable[bool]]] = {
+            "email": self._notify_email,
+            "push": self._notify_push
+        }
     
-    def notify(self, user_id: str, message: str, notification_types: list[str] | None = None) -> dict[str, Any]:
+    async def notify(self, user_id: str, message: str, notification_types: list[str] | None = None) -> dict[str, Any]:
         """
         Send notifications through specified channels.
+        All channels are sent concurrently, each with its own timeout and retries, a failed channel
+        does not hold up or fail the others.
         """
         self.logger.info("Sending notifications", user_id=user_id, types=notification_types)
         
         notification_types = notification_types or ["email"]
-        success_count = 0
-        results = {}
-        
-        if "email" in notification_types:
-            result = self._notify_email(user_id, message)
-            results["email"] = result
-            if result:
-                success_count+=1
-        
-        if "push" in notification_types:
-            result = self._notify_push(user_id, message)
-            results["push"] = result
-            if result:
-                success_count+=1
+        channels = [channel for channel in self.channels if channel in notification_types]
+        delivered = await asyncio.gather(*(self._deliver(channel, user_id, message) for channel in channels))
+        results = dict(zip(channels, delivered))
+        success_count = sum(delivered)
         
         # Process results
         result = {
@@ -131,35 +203,45 @@ class NotificationService:
             self.logger.warning(
                 "Some notifications failed", 
                 success=success_count, 
-                total=len(results)
+                total=len(results),
+                failed=[channel for channel, ok in results.items() if not ok]
             )
             
         return result
+
+    async def _deliver(self, channel: str, user_id: str, message: str) -> bool:
+        send = self.channels[channel]
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(NOTIFICATION_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            try:
+                async with asyncio.timeout(self.timeout_seconds):
+                    if await send(user_id, message):
+                        return True
+                error = "not delivered"
+            except TimeoutError:
+                error = "timed out"
+            except Exception as e:
+                error = str(e)
+            self.logger.warning("Notification attempt failed", channel=channel, attempt=attempt + 1, error=error)
+        return False
     
-    def _notify_email(self, user_id: str, message: str) -> bool:
+    async def _notify_email(self, user_id: str, message: str) -> bool:
         """
         Send email notification.
         Placeholder
         """
-        try:
-            self.logger.info("Sending email notification")
-            time.sleep(0.1)  # Simulate email sending
-            self.logger.info("Email sent successfully")
-            return True
-        except Exception as e:
-            self.logger.error("Failed to send email", error=str(e))
-            raise
+        self.logger.info("Sending email notification")
+        await asyncio.sleep(0.1)  # Simulate email sending
+        self.logger.info("Email sent successfully")
+        return True
     
-    def _notify_push(self, user_id: str, message: str) -> bool:
+    async def _notify_push(self, user_id: str, message: str) -> bool:
         """
         Send push notification.
         Placeholder
         """
-        try:
-            self.logger.info("Sending push notification", user_id=user_id)
-            time.sleep(0.1)  # Simulate push notification
-            self.logger.info("Push notification sent successfully", user_id=user_id)
-            return True
-        except Exception as e:
-            self.logger.error("Failed to send push notification", user_id=user_id, error=str(e))
-            raise
\ No newline at end of file
+        self.logger.info("Sending push notification", user_id=user_id)
+        await asyncio.sleep(0.1)  # Simulate push notification
+        self.logger.info("Push notification sent successfully", user_id=user_id)
+        return True
@@ -0,0 +1,154 @@
+import argparse
+import asyncio
+import multiprocessing
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Sequence
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from ecs.core.config import settings
+from ecs.core.logging import configure_logging
+from ecs.repositories import CreditRepository, TransactionRepository, EmotionalEventsRepository
+from ecs.repositories.exceptions import DatabaseError
+from ecs.repositories.credit_cache import get_credit_eligibility_cache
+from ecs.services import FeatureService, RescoringService, RescoringResult
+from ecs.services.internal import CreditModelService, FeatureEngineeringService, get_precomputed_offer_cache
+
+# Portfolio re-scoring entrypoint, meant to run nightly e.g. from cron: make rescore-portfolio
+# The parent streams the ids of users due for a new risk assessment through a server-side cursor
+# and hands them out in chunks to a pool of worker processes, each with its own engine and event loop
+# Once done, emotional feature buckets older than the feature window are pruned
+
+def _session_factory(pool_size: int) -> async_sessionmaker[AsyncSession]:
+    engine = create_async_engine(settings.DB_URL, pool_size=pool_size, max_overflow=0)
+    return async_sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+async def rescore_chunk(session_factory: async_sessionmaker[AsyncSession], user_ids: Sequence[uuid.UUID]) -> RescoringResult:
+    async with session_factory() as session:
+        feature_service = FeatureService(
+            TransactionRepository(), EmotionalEventsRepository(), FeatureEngineeringService(), session
+        )
+        rescoring_service = RescoringService(
+            feature_service,
+            CreditModelService(),
+            CreditRepository(cache=get_credit_eligibility_cache()),
+            session,
+            offer_cache=get_precomputed_offer_cache()
+        )
+        return await rescoring_service.rescore_users(user_ids)
+
+async def prune_emotional_feature_buckets(session_factory: async_sessionmaker[AsyncSession]) -> int:
+    """Delete the emotional feature buckets no feature window reaches anymore, returns the number deleted"""
+    # One day of margin, the window starts within the day period_days ago in whatever timezone
+    window_days = settings.feature_engineering_emotional_events_period_days + 1
+    before = (datetime.now(timezone.utc) - timedelta(days=window_days)).date()
+    async with session_factory() as session:
+        deleted = await EmotionalEventsRepository().prune_emotional_feature_buckets(before, session)
+        await session.commit()
+    return deleted
+
+# Worker process state, set up once by the pool initializer
+_worker_loop: asyncio.AbstractEventLoop | None = None
+_worker_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+def _init_worker() -> None:
+    global _worker_loop, _worker_session_factory
+    configure_logging()
+    # A loop that lives as long as the process, pooled connections are bound to it
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+    _worker_session_factory = _session_factory(pool_size=1)
+
+def _rescore_chunk_in_worker(user_ids: list[str]) -> RescoringResult:
+    return _worker_loop.run_until_complete(
+        rescore_chunk(_worker_session_factory, [uuid.UUID(user_id) for user_id in user_ids])
+    )
+
+async def rescore_portfolio(chunk_size: int, workers: int, refresh_ahead_days: int) -> tuple[RescoringResult, int]:
+    """Rescore every user due for a new risk assessment, returns the totals and the number of failed chunks"""
+    logger = structlog.get_logger()
+    valid_until = datetime.now() + timedelta(days=refresh_ahead_days)
+    # One connection holds the cursor, the other scores chunks when there are no worker processes
+    session_factory = _session_factory(pool_size=2)
+    users, scored, precomputed_offers, failed_chunks = 0, 0, 0, 0
+
+    def collect(chunks: set[asyncio.Future[RescoringResult]]) -> None:
+        nonlocal users, scored, precomputed_offers, failed_chunks
+        for chunk in chunks:
+            if chunk.exception() is not None:
+                failed_chunks += 1
+                logger.error("Failed to rescore chunk", error=str(chunk.exception()))
+                continue
+            users += chunk.result().users
+            scored += chunk.result().scored
+            precomputed_offers += chunk.result().precomputed_offers
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker
+    ) if workers > 0 else None
+    # Keep every worker busy without reading the whole user base ahead of them
+    max_in_flight = 2 * workers if pool is not None else 1
+    loop = asyncio.get_running_loop()
+    pending: set[asyncio.Future[RescoringResult]] = set()
+    try:
+        async with session_factory() as session:
+            async for user_ids in CreditRepository().stream_user_ids_for_rescoring(valid_until, chunk_size, session):
+                if len(pending) >= max_in_flight:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    collect(done)
+
+                if pool is not None:
+                    # Plain strings cross the process boundary
+                    pending.add(loop.run_in_executor(pool, _rescore_chunk_in_worker, [str(user_id) for user_id in user_ids]))
+                else:
+                    pending.add(asyncio.ensure_future(rescore_chunk(session_factory, user_ids)))
+
+        if pending:
+            done, _ = await asyncio.wait(pending)
+            collect(done)
+
+        try:
+            pruned_buckets = await prune_emotional_feature_buckets(session_factory)
+        except DatabaseError as e:
+            # Stale buckets are never read, they are pruned on the next run
+            logger.error("Failed to prune emotional feature buckets", error=str(e))
+        else:
+            logger.info("Pruned emotional feature buckets", count=pruned_buckets)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        await session_factory.kw["bind"].dispose()
+
+    return RescoringResult(users=users, scored=scored, precomputed_offers=precomputed_offers), failed_chunks
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh the risk assessments of every user due for a new one")
+    parser.add_argument("--chunk-size", type=int, default=settings.rescoring_chunk_size)
+    parser.add_argument("--workers", type=int, default=settings.rescoring_workers, help="0 scores in this process")
+    parser.add_argument("--refresh-ahead-days", type=int, default=settings.rescoring_refresh_ahead_days)
+    args = parser.parse_args()
+
+    configure_logging()
+    logger = structlog.get_logger()
+    logger.info("Starting portfolio rescoring", chunk_size=args.chunk_size, workers=args.workers, refresh_ahead_days=args.refresh_ahead_days)
+
+    started_at = time.perf_counter()
+    result, failed_chunks = asyncio.run(rescore_portfolio(args.chunk_size, args.workers, args.refresh_ahead_days))
+    logger.info(
+        "Finished portfolio rescoring",
+        users=result.users,
+        scored=result.scored,
+        precomputed_offers=result.precomputed_offers,
+        failed_chunks=failed_chunks,
+        seconds=round(time.perf_counter() - started_at, 1)
+    )
+    if failed_chunks:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import structlog
+from rq import SimpleWorker
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from ecs.core.logging import configure_logging
+# Imported here so the worker process loads the job modules once, not per job
+from ecs.workers import jobs
+
+# RQ worker class for the ecs:offers queue: rq worker -w ecs.workers.worker.JobWorker ecs:offers
+# The stock worker forks a work horse per job, so every job imports its modules and connects to the
+# database again. This one runs jobs in its own process, the modules and the pooled engine of
+# jobs.get_job_session_factory stay warm across jobs. Scale out with more worker processes
+
+class JobWorker(SimpleWorker):
+    """SimpleWorker with the job modules preloaded and a warm database pool"""
+
+    def __init__(self, *args, **kwargs) -> None:
+        configure_logging()
+        super().__init__(*args, **kwargs)
+
+    def bootstrap(self, *args, **kwargs) -> None:
+        super().bootstrap(*args, **kwargs)
+        logger = structlog.get_logger()
+        session_factory = jobs.get_job_session_factory()
+        try:
+            with session_factory() as session:
+                session.execute(text("SELECT 1"))
+        except SQLAlchemyError as e:
+            # Not fatal, jobs connect on their own once the database is back
+            logger.warning("Failed to warm up database pool", error=str(e))
+            return
+        logger.info("Worker database pool ready")
+
+    def teardown(self) -> None:
+        super().teardown()
+        jobs.get_job_engine().dispose()
@@ -0,0 +1,81 @@
+"""add emotional feature buckets
+
+Revision ID: a3e91c5d27b4
+Revises: f405ae2d2dca
+Create Date: 2025-09-02 10:14:27.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e91c5d27b4'
+down_revision: Union[str, Sequence[str], None] = 'f405ae2d2dca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('emotional_feature_buckets',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('bucket_date', sa.Date(), nullable=False),
+    sa.Column('event_count', sa.Integer(), nullable=False),
+    sa.Column('valence_sum', sa.Float(), nullable=False),
+    sa.Column('valence_sq_sum', sa.Float(), nullable=False),
+    sa.Column('stress_count', sa.Integer(), nullable=False),
+    sa.Column('positive_count', sa.Integer(), nullable=False),
+    sa.Column('valence_abs_change_sum', sa.Float(), nullable=False),
+    sa.Column('first_valence', sa.Float(), nullable=False),
+    sa.Column('last_valence', sa.Float(), nullable=False),
+    sa.Column('first_captured_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_captured_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'bucket_date')
+    )
+    op.create_index('ix_emotional_feature_buckets_bucket_date', 'emotional_feature_buckets', ['bucket_date'], unique=False)
+
+    # Backfill the buckets from the existing emotional events
+    op.execute("""
+        INSERT INTO emotional_feature_buckets (
+            user_id, bucket_date, event_count, valence_sum, valence_sq_sum, stress_count, positive_count,
+            valence_abs_change_sum, first_valence, last_valence, first_captured_at, last_captured_at
+        )
+        SELECT
+            user_id,
+            bucket_date,
+            count(*),
+            sum(valence),
+            sum(valence * valence),
+            count(*) FILTER (
+                WHERE valence < 0.3 OR arousal > 0.7 OR lower(emotion_primary) IN ('anger', 'fear', 'anxiety', 'stress')
+            ),
+            count(*) FILTER (
+                WHERE valence > 0.35 OR lower(emotion_primary) IN ('joy', 'happiness', 'excitement', 'contentment')
+            ),
+            coalesce(sum(abs(valence - previous_valence)), 0),
+            (array_agg(valence ORDER BY captured_at))[1],
+            (array_agg(valence ORDER BY captured_at DESC))[1],
+            min(captured_at),
+            max(captured_at)
+        FROM (
+            SELECT
+                *,
+                (captured_at AT TIME ZONE 'UTC')::date AS bucket_date,
+                lag(valence) OVER (
+                    PARTITION BY user_id, (captured_at AT TIME ZONE 'UTC')::date ORDER BY captured_at
+                ) AS previous_valence
+            FROM emotional_events
+        ) AS events
+        GROUP BY user_id, bucket_date
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_emotional_feature_buckets_bucket_date', table_name='emotional_feature_buckets')
+    op.drop_table('emotional_feature_buckets')
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Write a logistic credit model file for the in-process "logistic" backend
+
+The coefficients below are a hand-tuned baseline for development, replace them with trained ones.
+Usage: make export-model MODEL_PATH=models/credit_logistic.npy
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from ecs.models.schemas import FEATURE_NAMES
+
+# feature: (mean, scale, weight), positive weights increase the risk score
+BASELINE = {
+    "average_daily_spend": (150.0, 200.0, 0.2),
+    "avg_daily_transactions": (3.0, 3.0, -0.1),
+    "max_single_transaction": (500.0, 800.0, 0.3),
+    "income_volatility": (0.4, 0.25, 0.6),
+    "average_emotional_stability": (0.5, 0.2, -0.5),
+    "stress_events_count": (5.0, 5.0, 0.4),
+    "positive_emotion_ratio": (0.5, 0.25, -0.4),
+    "emotional_volatility": (0.3, 0.15, 0.3),
+    "recent_emotional_trend": (0.0, 0.3, -0.3),
+    "spending_pattern_change": (0.0, 0.4, 0.4),
+    "emotional_spending_correlation": (0.1, 0.1, 0.1),
+}
+INTERCEPT = -0.8
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path, help="Destination .npy file")
+    args = parser.parse_args()
+
+    columns = [BASELINE[name] for name in FEATURE_NAMES] + [(0.0, 1.0, INTERCEPT)]
+    parameters = np.array(columns, dtype=np.float64).T
+
+    args.path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(args.path, parameters)
+    print(f"Wrote {args.path} {parameters.shape}")
+
+if __name__ == "__main__":
+    main()
@@ -38,3 +38,16 @@ def user_token():
 def auth_headers(user_token):
     """Create authorization headers with the user token."""
     return {"Authorization": f"Bearer {user_token}"}
+
+
+@pytest.fixture
+def client_auth_headers():
+    """Create authorization headers with a client token."""
+    to_encode = {
+        "sub": "client-1",
+        "exp": datetime.now(tz=timezone.utc) + timedelta(minutes=30),
+        "iat": datetime.now(tz=timezone.utc),
+        "typ": PrincipalType.client
+    }
+    encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return {"Authorization": f"Bearer {encoded_jwt}"}
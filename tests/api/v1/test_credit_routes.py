@@ -1,10 +1,12 @@
+import json
+import uuid
 from unittest.mock import patch
 
 from fastapi import status
-from ecs.models.schemas import CreditOfferStatus, CreditType
+from ecs.models.schemas import CreditOfferStatus, CreditType, CreditAcceptJobStatus, CreditAcceptanceOutcome
 from ecs.services.exceptions import (
     ActiveCreditOfferExistsError, NoActiveCreditOfferExistsError, InvalidCreditOfferError,
-    CreditAccountExistsError)
+    CreditAccountExistsError, CreditAcceptanceNotFoundError)
 
 
 class TestCreditRoutes:
@@ -87,6 +89,63 @@ class TestCreditRoutes:
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
+    @patch("ecs.services.credit_service.CreditService.get_current_credit_offer")
+    async def test_get_current_offer(
+        self,
+        mock_get_current_credit_offer,
+        test_client,
+        auth_headers,
+        sample_db_credit_offer,
+    ):
+        """Test reading the current offer, returned with a strong ETag."""
+        mock_get_current_credit_offer.return_value = sample_db_credit_offer
+
+        response = test_client.get("/api/v1/credit/offers/current", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["id"] == str(sample_db_credit_offer.id)
+        assert response.json()["status"] == CreditOfferStatus.offered
+        assert response.headers["etag"].startswith('"') and not response.headers["etag"].startswith("W/")
+        assert response.headers["cache-control"] == "private, no-cache"
+
+    @patch("ecs.services.credit_service.CreditService.get_current_credit_offer")
+    async def test_get_current_offer_not_modified(
+        self,
+        mock_get_current_credit_offer,
+        test_client,
+        auth_headers,
+        sample_db_credit_offer,
+    ):
+        """Test that a matching If-None-Match gets an empty 304 and a changed offer a new ETag."""
+        mock_get_current_credit_offer.return_value = sample_db_credit_offer
+        etag = test_client.get("/api/v1/credit/offers/current", headers=auth_headers).headers["etag"]
+
+        response = test_client.get(
+            "/api/v1/credit/offers/current", headers={**auth_headers, "If-None-Match": f'"other", {etag}'}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+        sample_db_credit_offer.status = CreditOfferStatus.accepted
+        response = test_client.get("/api/v1/credit/offers/current", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] != etag
+
+    @patch("ecs.services.credit_service.CreditService.get_current_credit_offer")
+    async def test_get_current_offer_no_active_offer(
+        self,
+        mock_get_current_credit_offer,
+        test_client,
+        auth_headers,
+    ):
+        """Test reading the current offer when there is none."""
+        mock_get_current_credit_offer.side_effect = NoActiveCreditOfferExistsError("No active credit offer found")
+
+        response = test_client.get("/api/v1/credit/offers/current", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     @patch("ecs.services.credit_service.CreditService.accept_credit_offer")
     async def test_accept_credit_offer_success(
         self,
@@ -161,4 +220,94 @@ class TestCreditRoutes:
         )
         
         # Assert
-        assert response.status_code == status.HTTP_401_UNAUTHORIZED
\ No newline at end of file
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @patch("ecs.services.credit_service.CreditService.get_credit_acceptance")
+    async def test_get_acceptance_job(
+        self,
+        mock_get_credit_acceptance,
+        test_client,
+        auth_headers,
+        offer_id,
+    ):
+        """Test reading the state of a credit acceptance job."""
+        job_id = uuid.uuid4()
+        mock_get_credit_acceptance.return_value = CreditAcceptJobStatus(
+            id=str(job_id), offer_id=str(offer_id), status="queued"
+        )
+
+        response = test_client.get(f"/api/v1/credit/jobs/{job_id}", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"id": str(job_id), "offer_id": str(offer_id), "status": "queued", "outcome": None}
+
+    @patch("ecs.services.credit_service.CreditService.watch_credit_acceptance")
+    @patch("ecs.services.credit_service.CreditService.get_credit_acceptance")
+    async def test_get_acceptance_job_not_found(
+        self,
+        mock_get_credit_acceptance,
+        mock_watch_credit_acceptance,
+        test_client,
+        auth_headers,
+    ):
+        """Test reading a job that does not exist or belongs to another user."""
+        mock_get_credit_acceptance.side_effect = CreditAcceptanceNotFoundError("Credit acceptance job not found")
+
+        async def updates(*args, **kwargs):
+            raise CreditAcceptanceNotFoundError("Credit acceptance job not found")
+            yield
+        mock_watch_credit_acceptance.side_effect = updates
+
+        response = test_client.get(f"/api/v1/credit/jobs/{uuid.uuid4()}", headers=auth_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = test_client.get(f"/api/v1/credit/jobs/{uuid.uuid4()}/events", headers=auth_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @patch("ecs.services.credit_service.CreditService.watch_credit_acceptance")
+    async def test_acceptance_job_events(
+        self,
+        mock_watch_credit_acceptance,
+        test_client,
+        auth_headers,
+        offer_id,
+    ):
+        """Test the event stream sends the current and then the final state of the job."""
+        job_id = uuid.uuid4()
+
+        async def updates(*args, **kwargs):
+            yield CreditAcceptJobStatus(id=str(job_id), offer_id=str(offer_id), status="started")
+            yield CreditAcceptJobStatus(
+                id=str(job_id), offer_id=str(offer_id), status="finished", outcome=CreditAcceptanceOutcome.account_created
+            )
+        mock_watch_credit_acceptance.side_effect = updates
+
+        response = test_client.get(f"/api/v1/credit/jobs/{job_id}/events", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [event for event in response.text.split("\n\n") if event]
+        assert [event.splitlines()[0] for event in events] == ["event: status", "event: status"]
+        data = [json.loads(event.splitlines()[1].removeprefix("data: ")) for event in events]
+        assert [event["status"] for event in data] == ["started", "finished"]
+        assert data[1]["outcome"] == CreditAcceptanceOutcome.account_created
+
+    @patch("ecs.services.credit_service.CreditService.watch_credit_acceptance")
+    async def test_acceptance_job_events_done(
+        self,
+        mock_watch_credit_acceptance,
+        test_client,
+        auth_headers,
+        offer_id,
+    ):
+        """Test the event stream of a finished job closes after its state."""
+        job_id = uuid.uuid4()
+
+        async def updates(*args, **kwargs):
+            yield CreditAcceptJobStatus(id=str(job_id), offer_id=str(offer_id), status="failed")
+        mock_watch_credit_acceptance.side_effect = updates
+
+        response = test_client.get(f"/api/v1/credit/jobs/{job_id}/events", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.text.count("event: status") == 1
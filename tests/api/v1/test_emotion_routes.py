@@ -0,0 +1,82 @@
+import json
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import status
+
+from ecs.app import app
+from ecs.models.schemas import EmotionalEvent, EmotionalEventIngestResult
+from ecs.services import EmotionService
+
+
+def make_events(user_id: uuid.UUID, count: int) -> list[dict]:
+    return [
+        {
+            "event_id": str(uuid.uuid4()),
+            "user_id": str(user_id),
+            "captured_at": datetime(2025, 1, 1, tzinfo=timezone.utc).isoformat(),
+            "emotion_primary": "happiness",
+            "emotion_confidence": 0.9,
+            "arousal": 0.5,
+            "valence": 0.5
+        }
+        for _ in range(count)
+    ]
+
+
+@pytest.fixture
+def mock_emotion_service():
+    service = AsyncMock(spec=EmotionService)
+    service.ingest.side_effect = lambda events: EmotionalEventIngestResult(inserted=len(events), duplicates=0)
+    app.dependency_overrides[EmotionService] = lambda: service
+    yield service
+    app.dependency_overrides.pop(EmotionService, None)
+
+
+class TestEmotionRoutes:
+    """Tests for the emotional events ingest endpoint."""
+
+    def test_ingest_success(self, test_client, client_auth_headers, mock_emotion_service, user_id):
+        """The raw body is decoded into events which are passed on to the service"""
+        events = make_events(user_id, 3)
+
+        response = test_client.post(
+            "/api/v1/emotions/ingest",
+            content=json.dumps(events).encode(),
+            headers={**client_auth_headers, "Content-Type": "application/json"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"inserted": 3, "duplicates": 0}
+        ingested = mock_emotion_service.ingest.await_args.args[0]
+        assert all(isinstance(event, EmotionalEvent) for event in ingested)
+        assert [str(event.event_id) for event in ingested] == [event["event_id"] for event in events]
+
+    def test_ingest_invalid_event(self, test_client, client_auth_headers, mock_emotion_service, user_id):
+        """Invalid events are reported like FastAPI body validation errors"""
+        events = make_events(user_id, 2)
+        events[1]["arousal"] = 1.5
+
+        response = test_client.post("/api/v1/emotions/ingest", json=events, headers=client_auth_headers)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["detail"][0]["loc"] == ["body", 1, "arousal"]
+        mock_emotion_service.ingest.assert_not_awaited()
+
+    def test_ingest_malformed_json(self, test_client, client_auth_headers, mock_emotion_service):
+        response = test_client.post(
+            "/api/v1/emotions/ingest",
+            content=b"[{",
+            headers={**client_auth_headers, "Content-Type": "application/json"}
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        mock_emotion_service.ingest.assert_not_awaited()
+
+    def test_ingest_requires_client_token(self, test_client, auth_headers, mock_emotion_service, user_id):
+        response = test_client.post("/api/v1/emotions/ingest", json=make_events(user_id, 1), headers=auth_headers)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        mock_emotion_service.ingest.assert_not_awaited()
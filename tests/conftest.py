@@ -9,11 +9,11 @@ from rq import Queue
 
 from ecs.models.schemas import (
     Features, RiskAssessment, CreditOffer, CreditOfferStatus, 
-    CreditType
+    CreditType, TransactionAggregates
 )
 from ecs.models.domain import DBRiskAssessment, DBCreditOffer
 from ecs.repositories import CreditRepository, TransactionRepository, EmotionalEventsRepository
-from ecs.services.internal import FeatureEngineeringService, CreditModelService
+from ecs.services.internal import FeatureEngineeringService, CreditModelService, JobEvents
 
 
 @pytest.fixture
@@ -42,14 +42,27 @@ def mock_db_session():
     return session
 
 
+@pytest.fixture
+def mock_session_factory(mock_db_session):
+    """Create a mock session factory handing out the mock database session."""
+    return MagicMock(return_value=mock_db_session)
+
+
 @pytest.fixture
 def mock_redis_queue():
     """Create a mock Redis queue."""
     queue = MagicMock(spec=Queue)
     queue.enqueue.return_value = "job-id"
+    queue.connection = MagicMock()
     return queue
 
 
+@pytest.fixture
+def mock_job_events():
+    """Create a mock job events subscriber."""
+    return MagicMock(spec=JobEvents)
+
+
 @pytest.fixture
 def mock_credit_repository():
     """Create a mock credit repository."""
@@ -62,6 +75,10 @@ def mock_transaction_repository():
     """Create a mock transaction repository."""
     repo = AsyncMock(spec=TransactionRepository)
     repo.get_recent_transactions.return_value = []
+    repo.get_transaction_aggregates.return_value = TransactionAggregates(
+        count=0, total_amount=0.0, max_amount=0.0, stddev_amount=0.0,
+        active_days=0, older_half_mean=0.0, recent_half_mean=0.0
+    )
     return repo
 
 
@@ -70,6 +87,7 @@ def mock_emotional_events_repository():
     """Create a mock emotional events repository."""
     repo = AsyncMock(spec=EmotionalEventsRepository)
     repo.get_recent_emotional_events.return_value = []
+    repo.get_recent_emotional_event_rows.return_value = []
     return repo
 
 
@@ -81,6 +99,7 @@ def mock_feature_engineering_service():
     service.transaction_limit = 1000
     service.emotional_events_since = datetime.now() - timedelta(days=90)
     service.emotional_events_limit = 1000
+    service.use_emotional_feature_store = False
     
     # Set up the create_features method
     service.create_features.return_value = Features(
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from ecs.core.single_flight import SingleFlight
+
+
+@pytest.fixture
+def single_flight():
+    return SingleFlight(redis_client=None, namespace="test", lease_seconds=1, wait_seconds=1)
+
+
+class TestSingleFlight:
+
+    async def test_concurrent_calls_share_one_run(self, single_flight):
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(single_flight.do("key", fn) for _ in range(3)))
+
+        assert results == [1, 1, 1]
+        assert calls == 1
+
+    async def test_follower_survives_cancelled_leader(self, single_flight):
+        """A follower of a cancelled leader runs the call itself instead of being cancelled along"""
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "result"
+
+        leader = asyncio.create_task(single_flight.do("key", fn))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(single_flight.do("key", fn))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        assert await follower == "result"
+        assert leader.cancelled()
+        assert calls == 2
+
+    async def test_cancelled_follower_is_cancelled(self, single_flight):
+        async def fn():
+            await asyncio.sleep(0.05)
+            return "result"
+
+        leader = asyncio.create_task(single_flight.do("key", fn))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(single_flight.do("key", fn))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+
+        assert await leader == "result"
+        with pytest.raises(asyncio.CancelledError):
+            await follower
@@ -0,0 +1,143 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ecs.core.single_flight import SingleFlight
+from ecs.models.domain import DBCreditOffer, DBRiskAssessment
+from ecs.models.schemas import CreditEligibility, CreditOfferStatus, CreditType
+from ecs.repositories.credit_cache import CreditEligibilityCache, credit_eligibility_cache_key
+
+
+class FakeRedis:
+    """Just the commands the cache uses, ttls are recorded but never expire"""
+
+    def __init__(self):
+        self.values: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+        self.deletes: list[tuple[str, ...]] = []
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+        self.ttls[key] = ex
+
+    async def delete(self, *keys):
+        self.deletes.append(keys)
+        for key in keys:
+            self.values.pop(key, None)
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+@pytest.fixture
+def cache(fake_redis):
+    return CreditEligibilityCache(
+        redis_client=fake_redis,
+        single_flight=SingleFlight(redis_client=None, namespace="test", lease_seconds=1, wait_seconds=1),
+        ttl_seconds=300,
+        negative_ttl_seconds=60
+    )
+
+
+@pytest.fixture
+def eligibility(user_id):
+    risk_assessment = DBRiskAssessment(
+        id=uuid.uuid4(),
+        user_id=user_id,
+        risk_score=Decimal("0.2500"),
+        created_at=datetime.now(timezone.utc),
+        expires_at=datetime.now(timezone.utc) + timedelta(days=10)
+    )
+    offer = DBCreditOffer(
+        id=uuid.uuid4(),
+        user_id=user_id,
+        risk_assessment_id=risk_assessment.id,
+        status=CreditOfferStatus.offered,
+        credit_type=CreditType.long_term,
+        credit_limit=Decimal("15000.00"),
+        apr=Decimal("0.12"),
+        created_at=datetime.now(timezone.utc),
+        expires_at=datetime.now(timezone.utc) + timedelta(seconds=120)
+    )
+    return CreditEligibility(has_credit_account=False, active_offer=offer, valid_risk_assessment=risk_assessment)
+
+
+class TestCreditEligibilityCache:
+
+    async def test_read_through(self, cache, fake_redis, user_id, eligibility):
+        """A miss loads and stores the entry, a hit returns detached copies without loading"""
+        load = AsyncMock(return_value=eligibility)
+
+        first = await cache.get_or_load(user_id, load)
+        second = await cache.get_or_load(user_id, load)
+
+        load.assert_awaited_once()
+        for cached in (first, second):
+            assert cached.has_credit_account is False
+            assert cached.active_offer is not eligibility.active_offer
+            assert cached.active_offer.id == eligibility.active_offer.id
+            assert cached.active_offer.credit_limit == Decimal("15000.00")
+            assert cached.active_offer.expires_at == eligibility.active_offer.expires_at
+            assert cached.valid_risk_assessment.risk_score == Decimal("0.2500")
+        # Never cached past the offer expiry
+        assert 0 < fake_redis.ttls[credit_eligibility_cache_key(user_id)] <= 120
+
+    async def test_negative_entries_use_negative_ttl(self, cache, fake_redis, user_id):
+        load = AsyncMock(return_value=CreditEligibility(has_credit_account=False, active_offer=None, valid_risk_assessment=None))
+
+        result = await cache.get_or_load(user_id, load)
+        await cache.get_or_load(user_id, load)
+
+        assert result.active_offer is None and result.valid_risk_assessment is None
+        load.assert_awaited_once()
+        assert fake_redis.ttls[credit_eligibility_cache_key(user_id)] == 60
+
+    async def test_concurrent_misses_load_once(self, cache, user_id, eligibility):
+        """Stampede protection, concurrent misses of a user share one load"""
+        async def load():
+            await asyncio.sleep(0.01)
+            return eligibility
+        load = AsyncMock(side_effect=load)
+
+        results = await asyncio.gather(*(cache.get_or_load(user_id, load) for _ in range(10)))
+
+        load.assert_awaited_once()
+        assert {result.active_offer.id for result in results} == {eligibility.active_offer.id}
+
+    async def test_invalidate_on_write_deletes_again_after_commit(self, cache, fake_redis, user_id, eligibility):
+        await cache.get_or_load(user_id, AsyncMock(return_value=eligibility))
+        db = AsyncSession()
+        await db.begin()
+
+        await cache.invalidate_on_write([user_id], db)
+        assert credit_eligibility_cache_key(user_id) not in fake_redis.values
+
+        # A reader racing the write caches the old state again before the commit
+        await cache.get_or_load(user_id, AsyncMock(return_value=eligibility))
+        await db.commit()
+        await asyncio.sleep(0)
+
+        assert credit_eligibility_cache_key(user_id) not in fake_redis.values
+        assert len(fake_redis.deletes) == 2
+
+    async def test_rollback_drops_pending_invalidations(self, cache, fake_redis, user_id):
+        db = AsyncSession()
+        await db.begin()
+
+        await cache.invalidate_on_write([user_id], db)
+        await db.rollback()
+        await db.begin()
+        await db.commit()
+        await asyncio.sleep(0)
+
+        assert len(fake_redis.deletes) == 1
@@ -0,0 +1,128 @@
+import uuid
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from ecs.models.schemas import EmotionalEvent, EmotionalFeatureBucket, PrimaryEmotion
+from ecs.repositories import EmotionalEventsRepository
+from ecs.repositories.exceptions import EmotionalEventIngestionError
+from ecs.repositories.implementations.emotion_repository import (
+    INGEST_EMOTIONAL_EVENTS, UPSERT_EMOTIONAL_FEATURE_BUCKETS
+)
+
+
+@pytest.fixture
+def events(user_id):
+    return [
+        EmotionalEvent(
+            event_id=uuid.uuid4(),
+            user_id=user_id,
+            captured_at=datetime(2025, 1, 1, 12, position, tzinfo=timezone.utc),
+            emotion_primary=emotion,
+            emotion_confidence=0.9,
+            arousal=0.5,
+            valence=position / 10
+        )
+        for position, emotion in enumerate([PrimaryEmotion.happiness, PrimaryEmotion.fear, PrimaryEmotion.anger])
+    ]
+
+
+class TestEmotionalEventsRepository:
+
+    async def test_ingest_is_one_unnest_statement(self, mock_db_session, events):
+        """The whole batch goes out as one statement with one array parameter per column"""
+        mock_db_session.execute.return_value = MagicMock()
+        mock_db_session.execute.return_value.scalars.return_value.all.return_value = [events[0].event_id]
+
+        inserted_event_ids = await EmotionalEventsRepository().ingest(events, mock_db_session)
+
+        # Only what the statement returned was inserted, the others were already stored
+        assert inserted_event_ids == {events[0].event_id}
+
+        mock_db_session.execute.assert_awaited_once()
+        statement, parameters = mock_db_session.execute.await_args.args
+        assert statement is INGEST_EMOTIONAL_EVENTS
+        sql = str(statement.compile(dialect=postgresql.psycopg.dialect()))
+        assert "FROM unnest(" in sql
+        assert "ON CONFLICT (event_id) DO NOTHING RETURNING" in sql
+        # Rows in event_id order, so concurrent batches lock the unique index in the same order
+        ordered = sorted(events, key=lambda event: event.event_id)
+        assert parameters["event_id_values"] == [event.event_id for event in ordered]
+        assert parameters["emotion_primary_values"] == [event.emotion_primary.value for event in ordered]
+        assert parameters["valence_values"] == [event.valence for event in ordered]
+        assert len(set(parameters["id_values"])) == 3
+        assert all(len(values) == 3 for values in parameters.values())
+        mock_db_session.add_all.assert_not_called()
+
+    async def test_ingest_nothing(self, mock_db_session):
+        assert await EmotionalEventsRepository().ingest([], mock_db_session) == set()
+
+        mock_db_session.execute.assert_not_awaited()
+
+    async def test_ingest_integrity_error(self, mock_db_session, events):
+        mock_db_session.execute = AsyncMock(side_effect=IntegrityError("INSERT", {}, Exception("violates foreign key")))
+
+        with pytest.raises(EmotionalEventIngestionError):
+            await EmotionalEventsRepository().ingest(events, mock_db_session)
+
+    async def test_upsert_feature_buckets_is_one_unnest_statement(self, mock_db_session, user_id):
+        """Buckets are bound as one array per column, the parameter count does not grow with the buckets"""
+        buckets = [
+            EmotionalFeatureBucket(
+                user_id=user_id,
+                bucket_date=date(2025, 1, day),
+                event_count=2,
+                valence_sum=1.0,
+                valence_sq_sum=0.5,
+                stress_count=1,
+                positive_count=0,
+                valence_abs_change_sum=0.2,
+                first_valence=0.4,
+                last_valence=0.6,
+                first_captured_at=datetime(2025, 1, day, 8, tzinfo=timezone.utc),
+                last_captured_at=datetime(2025, 1, day, 9, tzinfo=timezone.utc)
+            )
+            for day in range(1, 8)
+        ][::-1]
+
+        await EmotionalEventsRepository().upsert_emotional_feature_buckets(buckets, mock_db_session)
+
+        mock_db_session.execute.assert_awaited_once()
+        statement, parameters = mock_db_session.execute.await_args.args
+        assert statement is UPSERT_EMOTIONAL_FEATURE_BUCKETS
+        sql = str(statement.compile(dialect=postgresql.psycopg.dialect()))
+        assert "FROM unnest(" in sql
+        assert "ON CONFLICT (user_id, bucket_date) DO UPDATE SET event_count = " in sql
+        assert len(parameters) == 12
+        # Rows in key order, so concurrent upserts lock shared buckets in the same order
+        assert parameters["bucket_date_values"] == sorted(bucket.bucket_date for bucket in buckets)
+        assert all(len(values) == len(buckets) for values in parameters.values())
+
+    async def test_upsert_no_feature_buckets(self, mock_db_session):
+        await EmotionalEventsRepository().upsert_emotional_feature_buckets([], mock_db_session)
+
+        mock_db_session.execute.assert_not_awaited()
+
+    async def test_prune_feature_buckets(self, mock_db_session):
+        mock_db_session.execute.return_value = MagicMock(rowcount=4)
+
+        deleted = await EmotionalEventsRepository().prune_emotional_feature_buckets(date(2025, 1, 1), mock_db_session)
+
+        assert deleted == 4
+        statement = mock_db_session.execute.await_args.args[0]
+        sql = str(statement.compile(dialect=postgresql.psycopg.dialect(), compile_kwargs={"literal_binds": True}))
+        assert sql == "DELETE FROM emotional_feature_buckets WHERE emotional_feature_buckets.bucket_date < '2025-01-01'"
+
+    async def test_emotional_events_for_users_bind_one_array(self, mock_db_session):
+        """Users are bound as a single array, the statement does not grow with the chunk size"""
+        user_ids = [uuid.uuid4() for _ in range(70_000)]
+        mock_db_session.execute.return_value = MagicMock()
+
+        await EmotionalEventsRepository().get_recent_emotional_events_for_users(user_ids, mock_db_session)
+
+        compiled = mock_db_session.execute.await_args.args[0].compile(dialect=postgresql.psycopg.dialect())
+        assert "WHERE emotional_events.user_id = ANY (%(user_ids)s::UUID[])" in str(compiled)
+        assert compiled.params == {"user_ids": user_ids}
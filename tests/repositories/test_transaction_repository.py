@@ -0,0 +1,105 @@
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from ecs.models.schemas import TransactionAggregates
+from ecs.repositories import TransactionRepository
+
+
+def compile_sql(statement):
+    compiled = statement.compile(dialect=postgresql.psycopg.dialect())
+    return " ".join(str(compiled).split()), compiled.params
+
+
+@pytest.fixture
+def aggregates_row():
+    return MagicMock(
+        count=4, total_amount=100.0, max_amount=40.0, stddev_amount=12.5, active_days=3,
+        older_half_mean=20.0, recent_half_mean=30.0
+    )
+
+
+class TestTransactionRepository:
+
+    async def test_transaction_aggregates_sql(self, mock_db_session, user_id, aggregates_row):
+        """Every transactional statistic comes out of one aggregate query over the capped window"""
+        mock_db_session.execute.return_value = MagicMock()
+        mock_db_session.execute.return_value.one.return_value = aggregates_row
+        since = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+        aggregates = await TransactionRepository().get_transaction_aggregates(
+            user_id, mock_db_session, since=since, limit=50
+        )
+
+        assert aggregates == TransactionAggregates(
+            count=4, total_amount=100.0, max_amount=40.0, stddev_amount=12.5, active_days=3,
+            older_half_mean=20.0, recent_half_mean=30.0
+        )
+        mock_db_session.execute.assert_awaited_once()
+        sql, params = compile_sql(mock_db_session.execute.await_args.args[0])
+
+        # Window: the user's most recent transactions since the cutoff, at most limit of them
+        assert (
+            "FROM (SELECT CAST(transactions.amount AS FLOAT) AS amount, transactions.occurred_at AS occurred_at "
+            "FROM transactions WHERE transactions.user_id = %(user_id_1)s::UUID "
+            "AND transactions.occurred_at > %(occurred_at_1)s::TIMESTAMP WITH TIME ZONE "
+            "ORDER BY transactions.occurred_at DESC LIMIT %(param_1)s::INTEGER) AS recent"
+        ) in sql
+        assert params["user_id_1"] == user_id
+        assert params["occurred_at_1"] == since
+        assert params["param_1"] == 50
+
+        # Older and recent halves, split on the position in occurrence order
+        assert "row_number() OVER (ORDER BY recent.occurred_at) AS position, count(*) OVER () AS total" in sql
+        assert (
+            "avg(ranked.amount) FILTER (WHERE ranked.position <= ranked.total / %(total_1)s::INTEGER) AS older_half_mean"
+        ) in sql
+        assert (
+            "avg(ranked.amount) FILTER (WHERE ranked.position > ranked.total / %(total_1)s::INTEGER) AS recent_half_mean"
+        ) in sql
+        assert params["total_1"] == 2
+
+        assert "stddev_samp(ranked.amount) AS stddev_amount" in sql
+        assert "count(distinct(date_trunc(%(date_trunc_1)s::VARCHAR, ranked.occurred_at))) AS active_days" in sql
+        assert params["date_trunc_1"] == "day"
+        assert sql.startswith("SELECT count(*) AS count, sum(ranked.amount) AS total_amount, max(ranked.amount) AS max_amount")
+
+    async def test_transaction_aggregates_without_window_bounds(self, mock_db_session, user_id, aggregates_row):
+        mock_db_session.execute.return_value = MagicMock()
+        mock_db_session.execute.return_value.one.return_value = aggregates_row
+
+        await TransactionRepository().get_transaction_aggregates(user_id, mock_db_session)
+
+        sql, _ = compile_sql(mock_db_session.execute.await_args.args[0])
+        assert "WHERE transactions.user_id = %(user_id_1)s::UUID) AS recent" in sql
+        assert "LIMIT" not in sql
+
+    async def test_transaction_aggregates_of_no_transactions(self, mock_db_session, user_id):
+        """SQL aggregates of an empty window are NULL, they become zeros"""
+        mock_db_session.execute.return_value = MagicMock()
+        mock_db_session.execute.return_value.one.return_value = MagicMock(
+            count=0, total_amount=None, max_amount=None, stddev_amount=None, active_days=0,
+            older_half_mean=None, recent_half_mean=None
+        )
+
+        aggregates = await TransactionRepository().get_transaction_aggregates(user_id, mock_db_session)
+
+        assert aggregates == TransactionAggregates(
+            count=0, total_amount=0.0, max_amount=0.0, stddev_amount=0.0, active_days=0,
+            older_half_mean=0.0, recent_half_mean=0.0
+        )
+
+    async def test_transactions_for_users_bind_one_array(self, mock_db_session):
+        """Users are bound as a single array, the statement does not grow with the chunk size"""
+        user_ids = [uuid.uuid4() for _ in range(70_000)]
+        mock_db_session.execute.return_value = MagicMock()
+
+        await TransactionRepository().get_recent_transactions_for_users(user_ids, mock_db_session, limit=5)
+
+        sql, params = compile_sql(mock_db_session.execute.await_args.args[0])
+        assert "WHERE transactions.user_id = ANY (%(user_ids)s::UUID[])" in sql
+        assert params["user_ids"] == user_ids
+        assert len(params) == 2
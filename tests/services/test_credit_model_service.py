@@ -0,0 +1,118 @@
+import math
+import time
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from ecs.models.schemas import FEATURE_NAMES
+from ecs.services.internal import CreditModelService, LogisticCreditModelBackend, PredictionCache, features_matrix
+
+
+@pytest.fixture
+def model_parameters():
+    rng = np.random.default_rng(0)
+    means = np.append(rng.uniform(0, 1, len(FEATURE_NAMES)), 0.0)
+    scales = np.append(rng.uniform(0.5, 2, len(FEATURE_NAMES)), 1.0)
+    weights = rng.normal(0, 1, len(FEATURE_NAMES) + 1)
+    return np.array([means, scales, weights])
+
+
+@pytest.fixture
+def model_path(tmp_path, model_parameters):
+    path = tmp_path / "credit_logistic.npy"
+    np.save(path, model_parameters)
+    return path
+
+
+class TestLogisticCreditModelBackend:
+
+    async def test_scores_match_logistic_formula(self, model_path, model_parameters, sample_features):
+        """Batch evaluation matches the logistic regression computed row by row"""
+        backend = LogisticCreditModelBackend(model_path)
+        rows = [sample_features, sample_features.model_copy(update={"income_volatility": 0.9, "stress_events_count": 40})]
+
+        scores = await backend.predict_risk_scores(features_matrix(rows))
+
+        means, scales, weights = model_parameters
+        for row, score in zip(rows, scores):
+            values = [getattr(row, name) for name in FEATURE_NAMES] + [1.0]
+            logit = sum((v - m) / s * w for v, m, s, w in zip(values, means, scales, weights))
+            assert score == pytest.approx(1 / (1 + math.exp(-logit)), rel=1e-12)
+
+    async def test_version_identifies_the_model_file(self, model_path, tmp_path, model_parameters):
+        """Different weights give a different model version"""
+        other_path = tmp_path / "other.npy"
+        np.save(other_path, model_parameters * 2)
+
+        assert LogisticCreditModelBackend(model_path).version == LogisticCreditModelBackend(model_path).version
+        assert LogisticCreditModelBackend(model_path).version != LogisticCreditModelBackend(other_path).version
+
+    def test_rejects_wrong_shape(self, tmp_path):
+        path = tmp_path / "invalid.npy"
+        np.save(path, np.zeros((2, 3)))
+
+        with pytest.raises(ValueError):
+            LogisticCreditModelBackend(path)
+
+
+class TestCreditModelService:
+
+    async def test_batch_matches_single_predictions(self, model_path, sample_features):
+        """Scoring in batch gives the same risk assessments as one by one"""
+        service = CreditModelService()
+        service.backend = LogisticCreditModelBackend(model_path)
+        rows = [sample_features.model_copy(update={"average_daily_spend": spend}) for spend in (0.0, 50.0, 5000.0)]
+
+        batch = await service.predict_credit_risk_batch(rows)
+        single = [await service.predict_credit_risk(row) for row in rows]
+
+        assert batch == single
+        assert all(0 <= assessment.risk_score <= 1 for assessment in batch)
+
+    async def test_prediction_cache_skips_the_model(self, model_path, sample_features):
+        """Repeated and near-identical features are served from the cache"""
+        service = CreditModelService()
+        service.backend = LogisticCreditModelBackend(model_path)
+        service.backend.predict_risk_scores = AsyncMock(wraps=service.backend.predict_risk_scores)
+        service.prediction_cache = PredictionCache(redis_client=None, max_entries=10, ttl_seconds=60, significant_digits=3)
+
+        first = await service.predict_credit_risk(sample_features)
+        near_identical = sample_features.model_copy(update={"average_daily_spend": sample_features.average_daily_spend + 0.01})
+        second = await service.predict_credit_risk(near_identical)
+        await service.predict_credit_risk(sample_features.model_copy(update={"income_volatility": 0.9}))
+
+        assert first == second
+        assert service.backend.predict_risk_scores.await_count == 2
+        assert service.prediction_cache.stats.local_hits == 1
+        assert service.prediction_cache.stats.misses == 2
+
+
+class TestPredictionCache:
+
+    async def test_entries_expire(self, monkeypatch):
+        cache = PredictionCache(redis_client=None, max_entries=10, ttl_seconds=60, significant_digits=3)
+        await cache.set_many(["a"], [0.5])
+        assert await cache.get_many(["a"]) == [0.5]
+
+        expired = time.monotonic() + 61
+        monkeypatch.setattr("ecs.services.internal.prediction_cache.time.monotonic", lambda: expired)
+        assert await cache.get_many(["a"]) == [None]
+
+    async def test_evicts_least_recently_used(self):
+        cache = PredictionCache(redis_client=None, max_entries=2, ttl_seconds=60, significant_digits=3)
+        await cache.set_many(["a", "b"], [0.1, 0.2])
+        await cache.get_many(["a"])
+        await cache.set_many(["c"], [0.3])
+
+        assert await cache.get_many(["a", "b", "c"]) == [0.1, None, 0.3]
+
+    async def test_reads_through_to_redis(self):
+        redis_client = AsyncMock()
+        redis_client.mget.return_value = ["0.25", None]
+        cache = PredictionCache(redis_client=redis_client, max_entries=10, ttl_seconds=60, significant_digits=3)
+
+        assert await cache.get_many(["a", "b"]) == [0.25, None]
+        assert await cache.get_many(["a"]) == [0.25]
+        redis_client.mget.assert_awaited_once_with(["a", "b"])
+        assert (cache.stats.shared_hits, cache.stats.local_hits, cache.stats.misses) == (1, 1, 1)
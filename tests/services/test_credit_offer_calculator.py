@@ -0,0 +1,199 @@
+import json
+import math
+import os
+import random
+import uuid
+
+import numpy as np
+import pytest
+
+from ecs.models.schemas import (
+    Features, FeatureTable, FEATURE_NAMES, RiskAssessment, CreditOfferStatus, CreditType, RiskCategory,
+    risk_categories_for
+)
+from ecs.services.credit_service import CreditOfferCalculator
+from ecs.services.internal.pricing_policy import (
+    CompiledCurve, CurvePolicy, PricingPolicyStore, DEFAULT_PRICING_POLICY_PATH
+)
+
+
+def reference_offer(risk_score: float, features: Features) -> dict:
+    """Plain float implementation of the pricing formulas the vectorized calculator must match"""
+    if risk_score >= 0.75:
+        return {"status": CreditOfferStatus.denied}
+
+    def normalize(metric, lower_bound, upper_bound):
+        return min(1.0, max(0.0, (metric - lower_bound) / (upper_bound - lower_bound)))
+
+    def interpolate(metric, min_value, max_value, bias_factor, invert=False):
+        metric = 1 - metric if invert else metric
+        return (max_value - min_value) * (metric ** bias_factor) + min_value
+
+    base_limit = max(1000, 50000 * (1 - risk_score ** 2))
+    multiplier = (
+        interpolate(normalize(features.average_daily_spend, 50, 5000), 1, 1.5, 2)
+        * interpolate(normalize(features.avg_daily_transactions, 0.1, 1000), 0.9, 1.8, 2.5)
+        * interpolate(normalize(features.recent_emotional_trend, -1, 1), 0.5, 1.5, 1)
+        * interpolate(risk_score, 0.7, 1.2, 2, invert=True)
+    )
+    return {
+        "status": CreditOfferStatus.offered,
+        "credit_limit": base_limit * multiplier,
+        "apr": interpolate(risk_score, 0.08, 0.25, 1.75),
+        "credit_type": CreditType.long_term if risk_score < 0.5 else CreditType.short_term
+    }
+
+
+def random_features(rng: random.Random) -> Features:
+    return Features(
+        average_daily_spend=rng.choice([0.0, 50.0, 5000.0, 7500.0, rng.uniform(0, 6000)]),
+        avg_daily_transactions=rng.choice([0, 1, 1000, 1500, rng.randint(0, 1200)]),
+        max_single_transaction=rng.uniform(0, 5000),
+        income_volatility=rng.random(),
+        average_emotional_stability=rng.random(),
+        stress_events_count=rng.randint(0, 30),
+        positive_emotion_ratio=rng.random(),
+        emotional_volatility=rng.random(),
+        recent_emotional_trend=rng.choice([-1.0, 0.0, 1.0, rng.uniform(-1, 1)]),
+        spending_pattern_change=rng.uniform(-1, 1),
+        emotional_spending_correlation=rng.choice([0.0, 0.2, 0.3])
+    )
+
+
+@pytest.fixture
+def calculator():
+    return CreditOfferCalculator()
+
+
+@pytest.fixture
+def random_batch():
+    rng = random.Random(12)
+    risk_scores = [rng.choice([0.0, 0.25, 0.5, 0.75, 1.0, rng.random()]) for _ in range(500)]
+    features = [random_features(rng) for _ in range(500)]
+    return risk_scores, features
+
+
+class TestCreditOfferCalculator:
+
+    def test_normalized_curve(self):
+        curve = CompiledCurve.compile(CurvePolicy(
+            name="test", feature="average_daily_spend", lower_bound=0, upper_bound=10, min_value=1, max_value=2, bias_factor=1
+        ))
+        assert curve(np.array([-5.0, 0.0, 5.0, 10.0, 15.0])).tolist() == [1.0, 1.0, 1.5, 2.0, 2.0]
+
+    def test_unbounded_curve(self):
+        curve = CompiledCurve.compile(CurvePolicy(name="test", feature="risk_score", min_value=1, max_value=2, bias_factor=2))
+        inverted = CompiledCurve.compile(CurvePolicy(
+            name="test", feature="risk_score", min_value=1, max_value=2, bias_factor=1, invert=True
+        ))
+        metric = np.array([0.0, 0.5, 1.0])
+
+        assert curve(metric).tolist() == [1.0, 1.25, 2.0]
+        assert inverted(metric).tolist() == [2.0, 1.5, 1.0]
+        with pytest.raises(ValueError):
+            curve(np.array([0.5, 1.5]))
+
+    def test_invalid_curve_policy(self):
+        with pytest.raises(ValueError):
+            CurvePolicy(name="test", feature="unknown", min_value=1, max_value=2, bias_factor=1)
+        with pytest.raises(ValueError):
+            CurvePolicy(name="test", feature="risk_score", lower_bound=1, upper_bound=1, min_value=1, max_value=2, bias_factor=1)
+        with pytest.raises(ValueError):
+            CurvePolicy(name="test", feature="risk_score", lower_bound=0, min_value=1, max_value=2, bias_factor=1)
+
+    def test_calculate_offer_low_risk(self, calculator, sample_risk_assessment_low, sample_features):
+        offer = calculator.calculate_offer(sample_risk_assessment_low, sample_features)
+
+        assert offer.status == CreditOfferStatus.offered
+        assert offer.credit_type == CreditType.long_term
+        assert 0.08 <= offer.apr <= 0.25
+        assert offer.credit_limit > 0
+
+    def test_calculate_offer_medium_risk(self, calculator, sample_risk_assessment_medium, sample_features):
+        offer = calculator.calculate_offer(sample_risk_assessment_medium, sample_features)
+
+        assert offer.status == CreditOfferStatus.offered
+        assert offer.credit_type == CreditType.short_term
+
+    def test_calculate_offer_high_risk_is_denied(self, calculator, sample_risk_assessment_high, sample_features):
+        offer = calculator.calculate_offer(sample_risk_assessment_high, sample_features)
+
+        assert offer.status == CreditOfferStatus.denied
+        assert offer.credit_limit is None and offer.apr is None and offer.credit_type is None
+
+    def test_calculate_offer_matches_reference(self, calculator, random_batch):
+        for risk_score, features in zip(*random_batch):
+            offer = calculator.calculate_offer(RiskAssessment(risk_score=risk_score), features)
+            expected = reference_offer(risk_score, features)
+
+            assert offer.status == expected["status"]
+            if offer.status == CreditOfferStatus.offered:
+                assert offer.credit_type == expected["credit_type"]
+                assert offer.credit_limit == pytest.approx(expected["credit_limit"], rel=1e-12)
+                assert offer.apr == pytest.approx(expected["apr"], rel=1e-12)
+
+    def test_calculate_offers_matches_calculate_offer_exactly(self, calculator, random_batch):
+        risk_scores, features = random_batch
+        table = FeatureTable(
+            user_ids=[uuid.uuid4() for _ in features],
+            values=np.array([[getattr(f, name) for name in FEATURE_NAMES] for f in features], dtype=np.float64)
+        )
+
+        offers = calculator.calculate_offers(np.array(risk_scores), table)
+
+        assert len(offers) == len(features)
+        for position, (risk_score, f) in enumerate(zip(risk_scores, features)):
+            single = calculator.calculate_offer(RiskAssessment(risk_score=risk_score), f)
+            assert offers.to_credit_offer(position) == single
+            if single.status == CreditOfferStatus.denied:
+                assert math.isnan(offers.credit_limits[position]) and offers.credit_types[position] is None
+
+    def test_risk_categories_match_risk_assessment(self):
+        risk_scores = [0.0, 0.2499, 0.25, 0.4999, 0.5, 0.7499, 0.75, 1.0]
+        categories = risk_categories_for(np.array(risk_scores))
+
+        assert categories.tolist() == [RiskAssessment(risk_score=r).risk_category for r in risk_scores]
+        assert categories[-1] is RiskCategory.high_risk
+
+
+class TestPricingPolicyStore:
+
+    @pytest.fixture
+    def policy_file(self, tmp_path):
+        path = tmp_path / "pricing_policy.json"
+        path.write_text(DEFAULT_PRICING_POLICY_PATH.read_text())
+        return path
+
+    def write_policy(self, path, **changes):
+        policy = json.loads(DEFAULT_PRICING_POLICY_PATH.read_text()) | changes
+        path.write_text(json.dumps(policy))
+        # Make sure the change is visible on filesystems with coarse timestamps
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_reloads_changed_policy(self, policy_file, sample_risk_assessment_low, sample_features):
+        store = PricingPolicyStore(policy_file, reload_interval_seconds=0)
+        before = CreditOfferCalculator(store.current()).calculate_offer(sample_risk_assessment_low, sample_features)
+
+        self.write_policy(policy_file, version="doubled-limits", credit_limit={"min_limit": 2000, "max_limit": 100000, "risk_exponent": 2})
+        after = CreditOfferCalculator(store.current()).calculate_offer(sample_risk_assessment_low, sample_features)
+
+        assert store.current().version == "doubled-limits"
+        assert after.credit_limit == pytest.approx(2 * before.credit_limit)
+        assert after.apr == before.apr
+
+    def test_keeps_current_policy_when_file_is_invalid(self, policy_file):
+        store = PricingPolicyStore(policy_file, reload_interval_seconds=0)
+        version = store.current().version
+
+        self.write_policy(policy_file, multipliers="not a list")
+
+        assert store.current().version == version
+
+    def test_does_not_check_file_before_interval(self, policy_file):
+        store = PricingPolicyStore(policy_file, reload_interval_seconds=3600)
+        version = store.current().version
+
+        self.write_policy(policy_file, version="too-early")
+
+        assert store.current().version == version
@@ -1,15 +1,25 @@
+import asyncio
+import threading
 import uuid
 import pytest
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from ecs.core.single_flight import SingleFlight
 from ecs.services.credit_service import CreditService
-from ecs.models.schemas import CreditOffer, CreditOfferStatus, CreditType
+from ecs.services.internal import PrecomputedOfferCache, get_pricing_policy_store
+from ecs.models.schemas import (
+    CreditOffer, CreditOfferStatus, CreditType, CreditEligibility, RiskAssessment, PrecomputedOffer,
+    CreditAcceptJobStatus, CreditAcceptanceOutcome
+)
 from ecs.models.domain import DBCreditOffer
 from ecs.services.exceptions import (
     ActiveCreditOfferExistsError, CreditAccountExistsError, 
-    NoActiveCreditOfferExistsError, InvalidCreditOfferError
+    NoActiveCreditOfferExistsError, InvalidCreditOfferError, CreditAcceptanceNotFoundError
 )
+from rq.exceptions import NoSuchJobError
+from rq.job import JobStatus
 
 
 class TestCreditService:
@@ -23,7 +33,9 @@ class TestCreditService:
         mock_feature_engineering_service,
         mock_credit_model_service,
         mock_db_session,
-        mock_redis_queue
+        mock_session_factory,
+        mock_redis_queue,
+        mock_job_events
     ):
         """Create an instance of the CreditService with mocked dependencies."""
         return CreditService(
@@ -33,7 +45,10 @@ class TestCreditService:
             feature_engineering_service=mock_feature_engineering_service,
             credit_model_service=mock_credit_model_service,
             session=mock_db_session,
-            redis_queue=mock_redis_queue
+            session_factory=mock_session_factory,
+            redis_queue=mock_redis_queue,
+            job_events=mock_job_events,
+            single_flight=SingleFlight(redis_client=None, namespace="test", lease_seconds=1, wait_seconds=1)
         )
     
     async def test_apply_for_credit_line_success_new_assessment(
@@ -50,9 +65,9 @@ class TestCreditService:
     ):
         """Test successful credit line application with new risk assessment."""
         # Configure mocks
-        mock_credit_repository.get_credit_account_for_user.return_value = None
-        mock_credit_repository.get_active_credit_offer_for_user.return_value = None
-        mock_credit_repository.get_valid_risk_assessment.return_value = None
+        mock_credit_repository.get_credit_eligibility.return_value = CreditEligibility(
+            has_credit_account=False, active_offer=None, valid_risk_assessment=None
+        )
         mock_credit_repository.create_credit_offer.return_value = None
         
         # Mock the calculator
@@ -69,10 +84,9 @@ class TestCreditService:
             _ = await credit_service.apply_for_credit_line(user_id)
             
             # Verify interactions
-            mock_credit_repository.get_credit_account_for_user.assert_called_once_with(user_id, mock_db_session)
-            mock_credit_repository.get_active_credit_offer_for_user.assert_called_once_with(user_id, mock_db_session)
-            mock_transaction_repository.get_recent_transactions.assert_called_once()
-            mock_emotional_events_repository.get_recent_emotional_events.assert_called_once()
+            mock_credit_repository.get_credit_eligibility.assert_called_once_with(user_id, mock_db_session)
+            mock_transaction_repository.get_transaction_aggregates.assert_called_once()
+            mock_emotional_events_repository.get_recent_emotional_event_rows.assert_called_once()
             mock_feature_engineering_service.create_features.assert_called_once()
             mock_credit_model_service.predict_credit_risk.assert_called_once_with(sample_features)
             mock_credit_repository.create_risk_assessment.assert_called_once()
@@ -95,9 +109,9 @@ class TestCreditService:
     ):
         """Test successful credit line application with existing risk assessment."""
         # Configure mocks
-        mock_credit_repository.get_credit_account_for_user.return_value = None
-        mock_credit_repository.get_active_credit_offer_for_user.return_value = None
-        mock_credit_repository.get_valid_risk_assessment.return_value = sample_db_risk_assessment
+        mock_credit_repository.get_credit_eligibility.return_value = CreditEligibility(
+            has_credit_account=False, active_offer=None, valid_risk_assessment=sample_db_risk_assessment
+        )
         mock_credit_repository.create_credit_offer.return_value = None
         
         # Mock the calculator
@@ -114,10 +128,9 @@ class TestCreditService:
             result = await credit_service.apply_for_credit_line(user_id)
             
             # Verify interactions
-            mock_credit_repository.get_credit_account_for_user.assert_called_once_with(user_id, mock_db_session)
-            mock_credit_repository.get_active_credit_offer_for_user.assert_called_once_with(user_id, mock_db_session)
-            mock_transaction_repository.get_recent_transactions.assert_called_once()
-            mock_emotional_events_repository.get_recent_emotional_events.assert_called_once()
+            mock_credit_repository.get_credit_eligibility.assert_called_once_with(user_id, mock_db_session)
+            mock_transaction_repository.get_transaction_aggregates.assert_called_once()
+            mock_emotional_events_repository.get_recent_emotional_event_rows.assert_called_once()
             mock_feature_engineering_service.create_features.assert_called_once()
             mock_credit_model_service.predict_credit_risk.assert_not_called()  # Should not be called when we have existing assessment
             mock_credit_repository.create_risk_assessment.assert_not_called()  # Should not be called when we have existing assessment
@@ -134,15 +147,16 @@ class TestCreditService:
     ):
         """Test credit line application when user already has an active credit account."""
         # Configure mocks to simulate active credit account
-        mock_credit_repository.get_credit_account_for_user.return_value = MagicMock()
+        mock_credit_repository.get_credit_eligibility.return_value = CreditEligibility(
+            has_credit_account=True, active_offer=None, valid_risk_assessment=None
+        )
         
         # Execute the method and check for expected exception
         with pytest.raises(CreditAccountExistsError):
             await credit_service.apply_for_credit_line(user_id)
             
         # Verify interactions
-        mock_credit_repository.get_credit_account_for_user.assert_called_once_with(user_id, mock_db_session)
-        mock_credit_repository.get_active_credit_offer_for_user.assert_not_called()
+        mock_credit_repository.get_credit_eligibility.assert_called_once_with(user_id, mock_db_session)
     
     async def test_apply_for_credit_line_active_offer_exists(
         self,
@@ -154,8 +168,9 @@ class TestCreditService:
     ):
         """Test credit line application when user already has an active credit offer."""
         # Configure mocks to simulate active credit offer
-        mock_credit_repository.get_credit_account_for_user.return_value = None
-        mock_credit_repository.get_active_credit_offer_for_user.return_value = sample_db_credit_offer
+        mock_credit_repository.get_credit_eligibility.return_value = CreditEligibility(
+            has_credit_account=False, active_offer=sample_db_credit_offer, valid_risk_assessment=None
+        )
         
         # Execute the method and check for expected exception
         with pytest.raises(ActiveCreditOfferExistsError) as excinfo:
@@ -165,9 +180,109 @@ class TestCreditService:
         assert excinfo.value.credit_offer == sample_db_credit_offer
         
         # Verify interactions
-        mock_credit_repository.get_credit_account_for_user.assert_called_once_with(user_id, mock_db_session)
-        mock_credit_repository.get_active_credit_offer_for_user.assert_called_once_with(user_id, mock_db_session)
+        mock_credit_repository.get_credit_eligibility.assert_called_once_with(user_id, mock_db_session)
     
+    async def test_apply_for_credit_line_concurrent_reads(
+        self,
+        credit_service,
+        mock_credit_repository,
+        mock_transaction_repository,
+        mock_emotional_events_repository,
+        mock_credit_model_service,
+        mock_db_session,
+        mock_session_factory,
+        user_id,
+        sample_db_risk_assessment
+    ):
+        """Test credit line application reading its data concurrently on dedicated sessions."""
+        credit_service.concurrent_reads = True
+        mock_credit_repository.get_credit_eligibility.return_value = CreditEligibility(
+            has_credit_account=False, active_offer=None, valid_risk_assessment=sample_db_risk_assessment
+        )
+
+        with patch("ecs.services.credit_service.CreditOfferCalculator") as mock_calculator_class:
+            mock_calculator_class.return_value.calculate_offer.return_value = CreditOffer(
+                status=CreditOfferStatus.offered,
+                credit_type=CreditType.long_term,
+                credit_limit=10000.0,
+                apr=0.15
+            )
+
+            await credit_service.apply_for_credit_line(user_id)
+
+        # One dedicated session per independent read
+        assert mock_session_factory.call_count == 3
+        mock_credit_repository.get_credit_eligibility.assert_called_once()
+        mock_transaction_repository.get_transaction_aggregates.assert_called_once()
+        mock_emotional_events_repository.get_recent_emotional_event_rows.assert_called_once()
+        mock_credit_model_service.predict_credit_risk.assert_not_called()
+        mock_credit_repository.create_credit_offer.assert_called_once()
+        mock_db_session.commit.assert_called_once()
+
+    async def test_apply_for_credit_line_concurrent_reads_active_account_exists(
+        self,
+        credit_service,
+        mock_credit_repository,
+        mock_db_session,
+        user_id
+    ):
+        """Test concurrent reads still reject users with an active credit account."""
+        credit_service.concurrent_reads = True
+        mock_credit_repository.get_credit_eligibility.return_value = CreditEligibility(
+            has_credit_account=True, active_offer=None, valid_risk_assessment=None
+        )
+
+        with pytest.raises(CreditAccountExistsError):
+            await credit_service.apply_for_credit_line(user_id)
+
+        mock_credit_repository.create_credit_offer.assert_not_called()
+        mock_db_session.commit.assert_not_called()
+
+    async def test_apply_for_credit_line_coalesces_concurrent_requests(
+        self,
+        credit_service,
+        mock_credit_repository,
+        mock_credit_model_service,
+        mock_db_session,
+        user_id
+    ):
+        """Test concurrent applications of the same user share a single computation."""
+        mock_credit_repository.get_credit_eligibility.return_value = CreditEligibility(
+            has_credit_account=False, active_offer=None, valid_risk_assessment=None
+        )
+
+        async def slow_prediction(features):
+            await asyncio.sleep(0.01)
+            return RiskAssessment(risk_score=0.3)
+        mock_credit_model_service.predict_credit_risk.side_effect = slow_prediction
+
+        offers = await asyncio.gather(*(credit_service.apply_for_credit_line(user_id) for _ in range(3)))
+
+        assert offers[0] is offers[1] is offers[2]
+        mock_credit_repository.get_credit_eligibility.assert_called_once()
+        mock_credit_model_service.predict_credit_risk.assert_called_once()
+        mock_credit_repository.create_credit_offer.assert_called_once()
+        mock_db_session.commit.assert_called_once()
+
+    async def test_apply_for_credit_line_coalesced_requests_share_errors(
+        self,
+        credit_service,
+        mock_credit_repository,
+        user_id
+    ):
+        """Test requests joining an in flight application get its error."""
+        async def slow_eligibility(*args):
+            await asyncio.sleep(0.01)
+            return CreditEligibility(has_credit_account=True, active_offer=None, valid_risk_assessment=None)
+        mock_credit_repository.get_credit_eligibility.side_effect = slow_eligibility
+
+        results = await asyncio.gather(
+            *(credit_service.apply_for_credit_line(user_id) for _ in range(2)), return_exceptions=True
+        )
+
+        assert all(isinstance(result, CreditAccountExistsError) for result in results)
+        mock_credit_repository.get_credit_eligibility.assert_called_once()
+
     async def test_apply_for_credit_line_exception_handling(
         self,
         credit_service,
@@ -181,9 +296,9 @@ class TestCreditService:
     ):
         """Test exception handling during credit line application."""
         # Configure mocks
-        mock_credit_repository.get_credit_account_for_user.return_value = None
-        mock_credit_repository.get_active_credit_offer_for_user.return_value = None
-        mock_credit_repository.get_valid_risk_assessment.return_value = None
+        mock_credit_repository.get_credit_eligibility.return_value = CreditEligibility(
+            has_credit_account=False, active_offer=None, valid_risk_assessment=None
+        )
         
         # Make create_risk_assessment raise an exception
         mock_credit_repository.create_risk_assessment.side_effect = Exception("Database error")
@@ -195,6 +310,86 @@ class TestCreditService:
         # Verify rollback was called
         mock_db_session.rollback.assert_called_once()
     
+    async def test_apply_for_credit_line_uses_precomputed_offer(
+        self,
+        credit_service,
+        mock_credit_repository,
+        mock_transaction_repository,
+        mock_feature_engineering_service,
+        mock_credit_model_service,
+        mock_db_session,
+        user_id,
+        sample_db_risk_assessment
+    ):
+        """A current precomputed offer is persisted without reading user data or calling the model."""
+        mock_credit_repository.get_credit_eligibility.return_value = CreditEligibility(
+            has_credit_account=False, active_offer=None, valid_risk_assessment=sample_db_risk_assessment
+        )
+        offer = CreditOffer(status=CreditOfferStatus.offered, credit_type=CreditType.long_term, credit_limit=12000.0, apr=0.1)
+        credit_service.offer_cache = AsyncMock(spec=PrecomputedOfferCache)
+        credit_service.offer_cache.get.return_value = PrecomputedOffer(
+            user_id=user_id,
+            risk_assessment_id=sample_db_risk_assessment.id,
+            pricing_policy_version=get_pricing_policy_store().current().version,
+            offer=offer
+        )
+
+        result = await credit_service.apply_for_credit_line(user_id)
+
+        assert result.risk_assessment_id == sample_db_risk_assessment.id
+        assert (result.status, result.credit_limit, result.apr) == (offer.status, offer.credit_limit, offer.apr)
+        mock_transaction_repository.get_transaction_aggregates.assert_not_called()
+        mock_feature_engineering_service.create_features.assert_not_called()
+        mock_credit_model_service.predict_credit_risk.assert_not_called()
+        mock_credit_repository.create_credit_offer.assert_called_once()
+        mock_db_session.commit.assert_called_once()
+
+    @pytest.mark.parametrize("stale", ["risk_assessment", "pricing_policy"])
+    async def test_apply_for_credit_line_ignores_stale_precomputed_offer(
+        self,
+        credit_service,
+        mock_credit_repository,
+        mock_feature_engineering_service,
+        mock_db_session,
+        user_id,
+        sample_db_risk_assessment,
+        stale
+    ):
+        """A precomputed offer of another risk assessment or pricing policy falls back to the full computation."""
+        mock_credit_repository.get_credit_eligibility.return_value = CreditEligibility(
+            has_credit_account=False, active_offer=None, valid_risk_assessment=sample_db_risk_assessment
+        )
+        credit_service.offer_cache = AsyncMock(spec=PrecomputedOfferCache)
+        credit_service.offer_cache.get.return_value = PrecomputedOffer(
+            user_id=user_id,
+            risk_assessment_id=uuid.uuid4() if stale == "risk_assessment" else sample_db_risk_assessment.id,
+            pricing_policy_version="old" if stale == "pricing_policy" else get_pricing_policy_store().current().version,
+            offer=CreditOffer(status=CreditOfferStatus.offered, credit_type=CreditType.long_term, credit_limit=1.0, apr=0.1)
+        )
+
+        result = await credit_service.apply_for_credit_line(user_id)
+
+        mock_credit_repository.get_credit_eligibility.assert_called_once_with(user_id, mock_db_session)
+        mock_feature_engineering_service.create_features.assert_called_once()
+        assert result.credit_limit != 1.0
+        mock_db_session.commit.assert_called_once()
+
+    async def test_get_current_credit_offer(self, credit_service, mock_credit_repository, user_id, sample_db_credit_offer):
+        """The active offer is returned without the apply checks."""
+        mock_credit_repository.get_credit_eligibility.return_value = CreditEligibility(
+            has_credit_account=True, active_offer=sample_db_credit_offer, valid_risk_assessment=None
+        )
+
+        assert await credit_service.get_current_credit_offer(user_id) is sample_db_credit_offer
+
+    async def test_get_current_credit_offer_no_active_offer(self, credit_service, mock_credit_repository, user_id):
+        mock_credit_repository.get_credit_eligibility.return_value = CreditEligibility(
+            has_credit_account=False, active_offer=None, valid_risk_assessment=None
+        )
+
+        with pytest.raises(NoActiveCreditOfferExistsError):
+            await credit_service.get_current_credit_offer(user_id)
+
     async def test_accept_credit_offer_success(
         self,
         credit_service,
@@ -207,19 +402,21 @@ class TestCreditService:
     ):
         """Test successful credit offer acceptance."""
         # Configure mocks
-        mock_credit_repository.get_credit_account_for_user.return_value = None
-        mock_credit_repository.get_active_credit_offer_for_user.return_value = sample_db_credit_offer
+        mock_credit_repository.get_credit_eligibility.return_value = CreditEligibility(
+            has_credit_account=False, active_offer=sample_db_credit_offer, valid_risk_assessment=None
+        )
         
         # Execute the method
         job_id = await credit_service.accept_credit_offer(offer_id, user_id)
         
         # Verify interactions
-        mock_credit_repository.get_credit_account_for_user.assert_called_once_with(user_id, mock_db_session)
-        mock_credit_repository.get_active_credit_offer_for_user.assert_called_once_with(user_id, mock_db_session)
+        mock_credit_repository.get_credit_eligibility.assert_called_once_with(user_id, mock_db_session)
         mock_redis_queue.enqueue.assert_called_once()
         
         # Check the job ID format (should be UUID)
         assert uuid.UUID(job_id, version=4)
+        # The returned id is the RQ job id
+        assert mock_redis_queue.enqueue.call_args.kwargs["job_id"] == job_id
     
     async def test_accept_credit_offer_with_active_account(
         self,
@@ -231,15 +428,16 @@ class TestCreditService:
     ):
         """Test credit offer acceptance when user already has an active credit account."""
         # Configure mocks to simulate active credit account
-        mock_credit_repository.get_credit_account_for_user.return_value = MagicMock()
+        mock_credit_repository.get_credit_eligibility.return_value = CreditEligibility(
+            has_credit_account=True, active_offer=None, valid_risk_assessment=None
+        )
         
         # Execute the method and check for expected exception
         with pytest.raises(CreditAccountExistsError):
             await credit_service.accept_credit_offer(offer_id, user_id)
             
         # Verify interactions
-        mock_credit_repository.get_credit_account_for_user.assert_called_once_with(user_id, mock_db_session)
-        mock_credit_repository.get_active_credit_offer_for_user.assert_not_called()
+        mock_credit_repository.get_credit_eligibility.assert_called_once_with(user_id, mock_db_session)
     
     async def test_accept_credit_offer_no_active_offer(
         self,
@@ -251,16 +449,16 @@ class TestCreditService:
     ):
         """Test credit offer acceptance when no active offer exists."""
         # Configure mocks to simulate no active offer
-        mock_credit_repository.get_credit_account_for_user.return_value = None
-        mock_credit_repository.get_active_credit_offer_for_user.return_value = None
+        mock_credit_repository.get_credit_eligibility.return_value = CreditEligibility(
+            has_credit_account=False, active_offer=None, valid_risk_assessment=None
+        )
         
         # Execute the method and check for expected exception
         with pytest.raises(NoActiveCreditOfferExistsError):
             await credit_service.accept_credit_offer(offer_id, user_id)
             
         # Verify interactions
-        mock_credit_repository.get_credit_account_for_user.assert_called_once_with(user_id, mock_db_session)
-        mock_credit_repository.get_active_credit_offer_for_user.assert_called_once_with(user_id, mock_db_session)
+        mock_credit_repository.get_credit_eligibility.assert_called_once_with(user_id, mock_db_session)
     
     async def test_accept_credit_offer_id_mismatch(
         self,
@@ -275,16 +473,16 @@ class TestCreditService:
         # Configure mocks with a different offer ID than requested
         different_offer = sample_db_credit_offer
         different_offer.id = uuid.uuid4()  # Different ID than offer_id fixture
-        mock_credit_repository.get_credit_account_for_user.return_value = None
-        mock_credit_repository.get_active_credit_offer_for_user.return_value = different_offer
+        mock_credit_repository.get_credit_eligibility.return_value = CreditEligibility(
+            has_credit_account=False, active_offer=different_offer, valid_risk_assessment=None
+        )
         
         # Execute the method and check for expected exception
         with pytest.raises(InvalidCreditOfferError):
             await credit_service.accept_credit_offer(offer_id, user_id)
             
         # Verify interactions
-        mock_credit_repository.get_credit_account_for_user.assert_called_once_with(user_id, mock_db_session)
-        mock_credit_repository.get_active_credit_offer_for_user.assert_called_once_with(user_id, mock_db_session)
+        mock_credit_repository.get_credit_eligibility.assert_called_once_with(user_id, mock_db_session)
     
     async def test_accept_credit_offer_expired(
         self,
@@ -300,13 +498,124 @@ class TestCreditService:
         expired_offer.id = offer_id
         expired_offer.expires_at = datetime.now() - timedelta(days=1)  # Expired
         
-        mock_credit_repository.get_credit_account_for_user.return_value = None
-        mock_credit_repository.get_active_credit_offer_for_user.return_value = expired_offer
+        mock_credit_repository.get_credit_eligibility.return_value = CreditEligibility(
+            has_credit_account=False, active_offer=expired_offer, valid_risk_assessment=None
+        )
         
         # Execute the method and check for expected exception
         with pytest.raises(InvalidCreditOfferError):
             await credit_service.accept_credit_offer(offer_id, user_id)
             
         # Verify interactions
-        mock_credit_repository.get_credit_account_for_user.assert_called_once_with(user_id, mock_db_session)
-        mock_credit_repository.get_active_credit_offer_for_user.assert_called_once_with(user_id, mock_db_session)
+        mock_credit_repository.get_credit_eligibility.assert_called_once_with(user_id, mock_db_session)
+
+    @pytest.fixture
+    def acceptance_job(self, user_id, offer_id):
+        job = MagicMock()
+        job.id = str(uuid.uuid4())
+        job.func_name = "ecs.workers.jobs.process_credit_acceptance"
+        job.kwargs = {"offer_id": str(offer_id), "user_id": str(user_id)}
+        job.get_status.return_value = JobStatus.STARTED
+        return job
+
+    async def test_get_credit_acceptance(self, credit_service, acceptance_job, user_id, offer_id):
+        """The state comes from the RQ job, the outcome once it finished"""
+        acceptance_job.get_status.return_value = JobStatus.FINISHED
+        acceptance_job.return_value.return_value = CreditAcceptanceOutcome.account_created.value
+
+        with patch("ecs.services.credit_service.Job.fetch", return_value=acceptance_job):
+            job_status = await credit_service.get_credit_acceptance(uuid.UUID(acceptance_job.id), user_id)
+
+        assert job_status == CreditAcceptJobStatus(
+            id=acceptance_job.id, offer_id=str(offer_id), status="finished", outcome=CreditAcceptanceOutcome.account_created
+        )
+        assert job_status.done
+
+    async def test_get_credit_acceptance_not_found(self, credit_service, acceptance_job):
+        """Missing jobs and jobs of other users are both not found"""
+        with patch("ecs.services.credit_service.Job.fetch", return_value=acceptance_job):
+            with pytest.raises(CreditAcceptanceNotFoundError):
+                await credit_service.get_credit_acceptance(uuid.UUID(acceptance_job.id), uuid.uuid4())
+
+        with patch("ecs.services.credit_service.Job.fetch", side_effect=NoSuchJobError):
+            with pytest.raises(CreditAcceptanceNotFoundError):
+                await credit_service.get_credit_acceptance(uuid.uuid4(), uuid.uuid4())
+
+    async def test_get_credit_acceptance_off_event_loop(self, credit_service, acceptance_job, user_id):
+        """RQ reads Redis synchronously, the job is fetched in a worker thread"""
+        event_loop_thread = threading.get_ident()
+        fetch_threads = []
+
+        def fetch(job_id, connection):
+            fetch_threads.append(threading.get_ident())
+            return acceptance_job
+
+        with patch("ecs.services.credit_service.Job.fetch", side_effect=fetch):
+            await credit_service.get_credit_acceptance(uuid.UUID(acceptance_job.id), user_id)
+
+        assert fetch_threads and fetch_threads[0] != event_loop_thread
+
+    async def test_watch_credit_acceptance(self, credit_service, mock_job_events, acceptance_job, user_id, offer_id):
+        """The current state, then the state published when the job finishes"""
+        notice = asyncio.get_running_loop().create_future()
+        calls = []
+
+        @asynccontextmanager
+        async def subscribe(job_id):
+            assert job_id == acceptance_job.id
+            calls.append("subscribe")
+            yield notice
+        mock_job_events.subscribe.side_effect = subscribe
+
+        def fetch(job_id, connection):
+            calls.append("fetch")
+            return acceptance_job
+        finished = CreditAcceptJobStatus(
+            id=acceptance_job.id, offer_id=str(offer_id), status="finished", outcome=CreditAcceptanceOutcome.account_exists
+        )
+
+        with patch("ecs.services.credit_service.Job.fetch", side_effect=fetch):
+            updates = credit_service.watch_credit_acceptance(uuid.UUID(acceptance_job.id), user_id, 5)
+            current = await anext(updates)
+            # Subscribed before reading the state, a job finishing in between is not missed
+            assert calls == ["subscribe", "fetch"]
+            assert current.status == "started"
+
+            final = asyncio.create_task(anext(updates))
+            await asyncio.sleep(0.01)
+            assert not final.done()
+            notice.set_result(finished.model_dump_json())
+
+            assert await final == finished
+            assert [update async for update in updates] == []
+
+    async def test_watch_credit_acceptance_done(self, credit_service, mock_job_events, acceptance_job, user_id):
+        """A finished job is reported once, without waiting"""
+        @asynccontextmanager
+        async def subscribe(job_id):
+            yield asyncio.get_running_loop().create_future()
+        mock_job_events.subscribe.side_effect = subscribe
+        acceptance_job.get_status.return_value = JobStatus.FAILED
+
+        with patch("ecs.services.credit_service.Job.fetch", return_value=acceptance_job):
+            updates = [
+                update async for update in credit_service.watch_credit_acceptance(uuid.UUID(acceptance_job.id), user_id, 5)
+            ]
+
+        assert [update.status for update in updates] == ["failed"]
+
+    async def test_watch_credit_acceptance_timeout(self, credit_service, mock_job_events, acceptance_job, user_id):
+        """Without a notice the wait ends after the timeout with the current state"""
+        @asynccontextmanager
+        async def subscribe(job_id):
+            yield asyncio.get_running_loop().create_future()
+        mock_job_events.subscribe.side_effect = subscribe
+
+        with patch("ecs.services.credit_service.Job.fetch", return_value=acceptance_job) as fetch:
+            updates = [
+                update async for update in credit_service.watch_credit_acceptance(uuid.UUID(acceptance_job.id), user_id, 0.01)
+            ]
+
+        assert [update.status for update in updates] == ["started", "started"]
+        assert not updates[-1].done
+        assert fetch.call_count == 2
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from ecs.models.schemas import EmotionalEventIngestResult
+from ecs.repositories.exceptions import EmotionalEventIngestionError
+from ecs.services import EmotionService
+from ecs.services.consumers import EmotionQueueConsumer
+
+
+def make_message(user_id: uuid.UUID, count: int) -> MagicMock:
+    message = MagicMock()
+    message.body = json.dumps([
+        {
+            "event_id": str(uuid.uuid4()),
+            "user_id": str(user_id),
+            "captured_at": datetime(2025, 1, 1, tzinfo=timezone.utc).isoformat(),
+            "emotion_primary": "happiness",
+            "emotion_confidence": 0.9,
+            "arousal": 0.5,
+            "valence": 0.5
+        }
+        for _ in range(count)
+    ]).encode()
+    message.ack = AsyncMock()
+    message.nack = AsyncMock()
+    message.reject = AsyncMock()
+    return message
+
+
+@pytest.fixture
+def mock_emotion_service():
+    service = AsyncMock(spec=EmotionService)
+    service.ingest.side_effect = lambda events: EmotionalEventIngestResult(inserted=len(events), duplicates=0)
+    return service
+
+
+@pytest.fixture
+def consumer(mock_emotion_service, mock_session_factory):
+    return EmotionQueueConsumer(
+        emotion_service_factory=lambda session: mock_emotion_service,
+        session_factory=mock_session_factory,
+        connection_params={},
+        prefetch_count=100,
+        batch_size=10,
+        batch_max_wait_seconds=0.05,
+        concurrency=2
+    )
+
+
+class TestEmotionQueueConsumer:
+
+    async def test_full_batch_is_written_at_once(self, consumer, mock_emotion_service, user_id):
+        """Messages are written together once they hold batch_size events, then all acked"""
+        messages = [make_message(user_id, 4) for _ in range(3)]
+
+        for message in messages:
+            await consumer._process_message(message)
+
+        mock_emotion_service.ingest.assert_awaited_once()
+        (events,), _ = mock_emotion_service.ingest.await_args
+        assert len(events) == 12
+        for message in messages:
+            message.ack.assert_awaited_once()
+
+    async def test_partial_batch_is_written_after_max_wait(self, consumer, mock_emotion_service, user_id):
+        message = make_message(user_id, 2)
+
+        await consumer._process_message(message)
+        mock_emotion_service.ingest.assert_not_awaited()
+        await asyncio.sleep(0.1)
+
+        mock_emotion_service.ingest.assert_awaited_once()
+        message.ack.assert_awaited_once()
+
+    async def test_failed_batch_is_requeued(self, consumer, mock_emotion_service, user_id):
+        mock_emotion_service.ingest.side_effect = ConnectionError("database unavailable")
+        messages = [make_message(user_id, 5) for _ in range(2)]
+
+        for message in messages:
+            await consumer._process_message(message)
+
+        for message in messages:
+            message.nack.assert_awaited_once_with(requeue=True)
+            message.ack.assert_not_awaited()
+
+    async def test_unstorable_message_is_rejected_alone(self, consumer, mock_emotion_service, user_id):
+        """A message whose events can never be stored does not take the rest of its batch down"""
+        unknown_user = uuid.uuid4()
+
+        async def ingest(events):
+            if any(event.user_id == unknown_user for event in events):
+                raise EmotionalEventIngestionError("violates foreign key constraint")
+            return EmotionalEventIngestResult(inserted=len(events), duplicates=0)
+        mock_emotion_service.ingest.side_effect = ingest
+        good, bad = make_message(user_id, 5), make_message(unknown_user, 5)
+
+        await consumer._process_message(good)
+        await consumer._process_message(bad)
+
+        good.ack.assert_awaited_once()
+        bad.reject.assert_awaited_once_with(requeue=False)
+        assert mock_emotion_service.ingest.await_count == 3
+
+    async def test_unreadable_message_is_rejected(self, consumer, mock_emotion_service):
+        message = make_message(uuid.uuid4(), 0)
+        message.body = b"not json"
+
+        await consumer._process_message(message)
+
+        message.reject.assert_awaited_once_with(requeue=False)
+        assert consumer._pending == []
+
+    async def test_out_of_range_event_is_rejected(self, consumer, mock_emotion_service, user_id):
+        """The whole body is validated at once, one out of range event rejects its message"""
+        message = make_message(user_id, 3)
+        message.body = message.body.replace(b'"arousal": 0.5', b'"arousal": 1.5', 1)
+
+        await consumer._process_message(message)
+
+        message.reject.assert_awaited_once_with(requeue=False)
+        assert consumer._pending == []
+
+    async def test_batches_are_written_concurrently_with_own_sessions(self, consumer, mock_emotion_service, user_id):
+        """Up to concurrency batches are written at once, each through a session of its own"""
+        sessions = []
+        writing, most_writing = 0, 0
+
+        def session_factory():
+            session = AsyncMock()
+            session.__aenter__.return_value = session
+            sessions.append(session)
+            return session
+        consumer.session_factory = session_factory
+        services = {}
+
+        def emotion_service_factory(session):
+            async def ingest(events):
+                nonlocal writing, most_writing
+                writing += 1
+                most_writing = max(most_writing, writing)
+                await asyncio.sleep(0.02)
+                writing -= 1
+                return EmotionalEventIngestResult(inserted=len(events), duplicates=0)
+            services[session] = AsyncMock(spec=EmotionService, ingest=AsyncMock(side_effect=ingest))
+            return services[session]
+        consumer.emotion_service_factory = emotion_service_factory
+        messages = [make_message(user_id, 10) for _ in range(4)]
+
+        await asyncio.gather(*(consumer._process_message(message) for message in messages))
+
+        assert len(sessions) == 4 and len(set(map(id, sessions))) == 4
+        assert all(service.ingest.await_count == 1 for service in services.values())
+        assert most_writing == 2
+        for message in messages:
+            message.ack.assert_awaited_once()
@@ -0,0 +1,68 @@
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ecs.models.schemas import EmotionalEvent, EmotionalEventIngestResult, PrimaryEmotion
+from ecs.services import EmotionService
+from ecs.services.internal import FeatureEngineeringService, PrecomputedOfferCache
+
+
+def make_event(user_id: uuid.UUID, event_id: uuid.UUID | None = None) -> EmotionalEvent:
+    return EmotionalEvent(
+        event_id=event_id or uuid.uuid4(),
+        user_id=user_id,
+        captured_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        emotion_primary=PrimaryEmotion.happiness,
+        emotion_confidence=0.9,
+        arousal=0.5,
+        valence=0.5
+    )
+
+
+@pytest.fixture
+def emotion_service(mock_emotional_events_repository, mock_db_session):
+    return EmotionService(
+        emotional_events_repository=mock_emotional_events_repository,
+        feature_engineering_service=FeatureEngineeringService(),
+        session=mock_db_session,
+        offer_cache=AsyncMock(spec=PrecomputedOfferCache)
+    )
+
+
+class TestEmotionService:
+
+    async def test_duplicates_are_skipped(self, emotion_service, mock_emotional_events_repository, mock_db_session, user_id):
+        """Already stored events are counted as duplicates and left out of the feature buckets"""
+        new_event, stored_event = make_event(user_id), make_event(uuid.uuid4())
+        mock_emotional_events_repository.ingest.return_value = {new_event.event_id}
+
+        result = await emotion_service.ingest([new_event, stored_event])
+
+        assert result == EmotionalEventIngestResult(inserted=1, duplicates=1)
+        (buckets, _), _ = mock_emotional_events_repository.upsert_emotional_feature_buckets.await_args
+        assert [(bucket.user_id, bucket.event_count) for bucket in buckets] == [(user_id, 1)]
+        mock_db_session.commit.assert_awaited_once()
+        (user_ids,), _ = emotion_service.offer_cache.invalidate.await_args
+        assert list(user_ids) == [user_id]
+
+    async def test_repeated_event_in_batch_is_ingested_once(self, emotion_service, mock_emotional_events_repository, user_id):
+        event = make_event(user_id)
+        mock_emotional_events_repository.ingest.return_value = {event.event_id}
+
+        result = await emotion_service.ingest([event, make_event(user_id, event.event_id)])
+
+        assert result == EmotionalEventIngestResult(inserted=1, duplicates=1)
+        (events, _), _ = mock_emotional_events_repository.ingest.await_args
+        assert events == [event]
+
+    async def test_redelivered_batch(self, emotion_service, mock_emotional_events_repository, mock_db_session, user_id):
+        """A batch that is stored already commits nothing new and keeps the precomputed offers"""
+        mock_emotional_events_repository.ingest.return_value = set()
+
+        result = await emotion_service.ingest([make_event(user_id), make_event(user_id)])
+
+        assert result == EmotionalEventIngestResult(inserted=0, duplicates=2)
+        mock_db_session.rollback.assert_not_awaited()
+        emotion_service.offer_cache.invalidate.assert_not_awaited()
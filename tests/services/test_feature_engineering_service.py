@@ -0,0 +1,231 @@
+import random
+import statistics
+import uuid
+from collections import namedtuple
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from ecs.models.domain import DBTransaction, DBEmotionalEvent, DBEmotionalFeatureBucket
+from ecs.models.schemas import Features, PrimaryEmotion, EmotionalEvent
+from ecs.services.internal import FeatureEngineeringService
+
+
+def reference_features(transactions, emotional_events) -> dict:
+    """Straightforward row by row implementation the vectorized engine must match"""
+    amounts = [float(t.amount) for t in transactions]
+    daily_spends, daily_counts = {}, {}
+    for t in transactions:
+        day = t.occurred_at.date()
+        daily_spends[day] = daily_spends.get(day, 0) + float(t.amount)
+        daily_counts[day] = daily_counts.get(day, 0) + 1
+
+    sorted_amounts = [float(t.amount) for t in sorted(transactions, key=lambda x: x.occurred_at)]
+    sorted_valences = [e.valence for e in sorted(emotional_events, key=lambda x: x.captured_at)]
+    valences = [e.valence for e in emotional_events]
+
+    income_volatility = 0.0
+    if len(amounts) >= 2 and statistics.mean(amounts) != 0:
+        income_volatility = min(1.0, statistics.stdev(amounts) / statistics.mean(amounts))
+
+    spending_pattern_change = 0.0
+    if len(amounts) >= 4:
+        mid = len(sorted_amounts) // 2
+        older, recent = statistics.mean(sorted_amounts[:mid]), statistics.mean(sorted_amounts[mid:])
+        if older != 0:
+            spending_pattern_change = max(-1.0, min(1.0, (recent - older) / older))
+
+    emotional_volatility, recent_emotional_trend = 0.0, 0.0
+    if len(valences) >= 2:
+        emotional_volatility = statistics.mean(abs(b - a) for a, b in zip(sorted_valences, sorted_valences[1:]))
+        mid = len(sorted_valences) // 2
+        recent_emotional_trend = max(-1.0, min(1.0, statistics.mean(sorted_valences[mid:]) - statistics.mean(sorted_valences[:mid])))
+
+    correlation = 0.0
+    if amounts and valences:
+        if statistics.mean(amounts) > 100 and statistics.mean(valences) > 0.6:
+            correlation = 0.3
+        elif statistics.mean(amounts) < 50 and statistics.mean(valences) < 0.4:
+            correlation = 0.2
+
+    return {
+        "average_daily_spend": statistics.mean(daily_spends.values()) if amounts else 0.0,
+        "avg_daily_transactions": round(statistics.mean(daily_counts.values())) if amounts else 0,
+        "max_single_transaction": max(amounts) if amounts else 0.0,
+        "income_volatility": income_volatility,
+        "average_emotional_stability": statistics.mean(valences) if valences else 0,
+        "stress_events_count": sum(
+            1 for e in emotional_events
+            if e.valence < 0.3 or e.arousal > 0.7 or e.emotion_primary.lower() in ["anger", "fear", "anxiety", "stress"]
+        ),
+        "positive_emotion_ratio": sum(
+            1 for e in emotional_events
+            if e.valence > 0.35 or e.emotion_primary.lower() in ["joy", "happiness", "excitement", "contentment"]
+        ) / len(valences) if valences else 0,
+        "emotional_volatility": emotional_volatility,
+        "recent_emotional_trend": recent_emotional_trend,
+        "spending_pattern_change": spending_pattern_change,
+        "emotional_spending_correlation": correlation,
+    }
+
+
+def make_transactions(count: int, seed: int, user_id: uuid.UUID | None = None) -> list[DBTransaction]:
+    rng = random.Random(seed)
+    now = datetime(2025, 1, 31, 12, tzinfo=timezone.utc)
+    return [
+        DBTransaction(
+            user_id=user_id,
+            amount=Decimal(f"{rng.uniform(1, 800):.2f}"),
+            occurred_at=now - timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+        )
+        for _ in range(count)
+    ]
+
+
+def make_emotional_events(count: int, seed: int, user_id: uuid.UUID | None = None) -> list[DBEmotionalEvent]:
+    rng = random.Random(seed)
+    now = datetime(2025, 1, 31, 12, tzinfo=timezone.utc)
+    return [
+        DBEmotionalEvent(
+            user_id=user_id,
+            event_id=uuid.uuid4(),
+            emotion_primary=rng.choice(list(PrimaryEmotion)).value,
+            emotion_confidence=rng.random(),
+            arousal=rng.random(),
+            valence=rng.random(),
+            captured_at=now - timedelta(minutes=rng.randint(0, 60 * 24 * 7))
+        )
+        for _ in range(count)
+    ]
+
+
+class TestFeatureEngineeringService:
+
+    @pytest.fixture
+    def service(self):
+        return FeatureEngineeringService()
+
+    @pytest.mark.parametrize(
+        "transactions_count, events_count",
+        [(0, 0), (1, 1), (3, 2), (4, 3), (50, 20), (1000, 50)]
+    )
+    async def test_create_features_matches_reference(self, service, transactions_count, events_count):
+        """Vectorized engine keeps parity with the row by row implementation"""
+        transactions = make_transactions(transactions_count, seed=transactions_count)
+        emotional_events = make_emotional_events(events_count, seed=events_count)
+
+        features = await service.create_features(transactions, emotional_events)
+        expected = reference_features(transactions, emotional_events)
+
+        assert isinstance(features, Features)
+        for name, value in expected.items():
+            assert getattr(features, name) == pytest.approx(value, rel=1e-9, abs=1e-12), name
+
+    async def test_create_features_no_data_is_neutral(self, service):
+        """Users without history get neutral features"""
+        features = await service.create_features([], [])
+
+        assert features.average_daily_spend == 0.0
+        assert features.avg_daily_transactions == 0
+        assert features.stress_events_count == 0
+        assert features.recent_emotional_trend == 0.0
+        assert features.emotional_spending_correlation == 0.0
+
+    async def test_create_features_from_projected_rows(self, service):
+        """Projected rows with a float amount give the same features as ORM entities"""
+        TransactionRow = namedtuple("TransactionRow", ["user_id", "amount", "occurred_at"])
+        EmotionalEventRow = namedtuple("EmotionalEventRow", ["user_id", "valence", "arousal", "emotion_primary", "captured_at"])
+        transactions = make_transactions(40, seed=3)
+        emotional_events = make_emotional_events(15, seed=4)
+
+        from_entities = await service.create_features(transactions, emotional_events)
+        from_rows = await service.create_features(
+            [TransactionRow(t.user_id, float(t.amount), t.occurred_at) for t in transactions],
+            [EmotionalEventRow(e.user_id, e.valence, e.arousal, e.emotion_primary, e.captured_at) for e in emotional_events]
+        )
+
+        assert from_rows == from_entities
+
+    async def test_feature_store_buckets_match_raw_events(self, service):
+        """Emotional features read from the daily buckets match the ones computed from the raw events"""
+        user_id = uuid.uuid4()
+        start = datetime(2025, 1, 27, 8, tzinfo=timezone.utc)
+        rng = random.Random(7)
+        # Three events per day, so the older/recent split falls on a bucket boundary
+        events = [
+            EmotionalEvent(
+                event_id=uuid.uuid4(),
+                user_id=user_id,
+                captured_at=start + timedelta(days=day, hours=hour),
+                emotion_primary=rng.choice(list(PrimaryEmotion)),
+                emotion_confidence=rng.random(),
+                arousal=rng.random(),
+                valence=rng.random()
+            )
+            for day in range(4) for hour in range(3)
+        ]
+
+        buckets = [
+            DBEmotionalFeatureBucket(**asdict(b))
+            for b in service.build_emotional_feature_buckets(events)
+        ]
+        assert len(buckets) == 4
+
+        from_store = await service.create_features([], service.aggregate_emotional_feature_buckets(buckets))
+        from_events = await service.create_features([], [DBEmotionalEvent(**e.model_dump()) for e in events])
+
+        for name, value in from_events.model_dump().items():
+            assert getattr(from_store, name) == pytest.approx(value, rel=1e-9, abs=1e-12), name
+
+    def test_feature_buckets_sorted_by_key(self, service):
+        """Buckets come out in (user_id, bucket_date) order whatever the capture order of the events"""
+        user_ids = [uuid.uuid4() for _ in range(3)]
+        start = datetime(2025, 1, 27, 8, tzinfo=timezone.utc)
+        events = [
+            EmotionalEvent(
+                event_id=uuid.uuid4(),
+                user_id=user_id,
+                captured_at=start + timedelta(days=day, hours=hour),
+                emotion_primary=PrimaryEmotion.happiness,
+                emotion_confidence=0.5,
+                arousal=0.5,
+                valence=0.5
+            )
+            for user_id in user_ids for day in range(3) for hour in range(2)
+        ]
+        random.Random(3).shuffle(events)
+
+        buckets = service.build_emotional_feature_buckets(events)
+
+        keys = [(bucket.user_id, bucket.bucket_date) for bucket in buckets]
+        assert len(keys) == 9
+        assert keys == sorted(keys)
+        assert all(bucket.first_captured_at < bucket.last_captured_at for bucket in buckets)
+
+    async def test_create_feature_table_matches_single_user(self, service):
+        """Batched features match the per user computation, users without rows are neutral"""
+        user_ids = [uuid.uuid4() for _ in range(4)]
+        transactions_by_user = {
+            user_id: make_transactions(count, seed=index, user_id=user_id)
+            for index, (user_id, count) in enumerate(zip(user_ids, [30, 0, 5, 1]))
+        }
+        events_by_user = {
+            user_id: make_emotional_events(count, seed=index, user_id=user_id)
+            for index, (user_id, count) in enumerate(zip(user_ids, [10, 3, 0, 1]))
+        }
+        # Rows of every user interleaved, as returned by a set-based query
+        transactions = [t for group in transactions_by_user.values() for t in group]
+        emotional_events = [e for group in events_by_user.values() for e in group]
+        random.Random(1).shuffle(transactions)
+        random.Random(2).shuffle(emotional_events)
+
+        table = await service.create_feature_table(user_ids, transactions, emotional_events)
+
+        assert len(table) == len(user_ids)
+        for position, user_id in enumerate(table.user_ids):
+            expected = await service.create_features(transactions_by_user[user_id], events_by_user[user_id])
+            for name, value in expected.model_dump().items():
+                assert table.column(name)[position] == pytest.approx(value, rel=1e-9, abs=1e-12), name
+            assert isinstance(table.to_features(position), Features)
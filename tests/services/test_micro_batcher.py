@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from ecs.services.exceptions import ServiceOverloadedError
+from ecs.services.internal import MicroBatcher
+
+
+class TestMicroBatcher:
+
+    @pytest.fixture
+    def batches(self):
+        return []
+
+    @pytest.fixture
+    async def batcher(self, batches):
+        async def double(items):
+            batches.append(list(items))
+            return [item * 2 for item in items]
+
+        batcher = MicroBatcher(double, max_batch_size=4, max_wait_ms=20, max_queue_depth=8, name="test")
+        yield batcher
+        await batcher.close()
+
+    async def test_concurrent_items_share_a_batch(self, batcher, batches):
+        """Concurrent submissions are sent together and each caller gets its own result"""
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+
+        assert results == [0, 2, 4]
+        assert batches == [[0, 1, 2]]
+        assert batcher.stats.fill_ratio(batcher.max_batch_size) == pytest.approx(0.75)
+
+    async def test_full_batch_is_sent_without_waiting(self, batcher, batches):
+        """Batches never exceed max_batch_size"""
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(6)))
+
+        assert results == [0, 2, 4, 6, 8, 10]
+        assert [len(batch) for batch in batches] == [4, 2]
+
+    async def test_errors_reach_every_caller_of_the_batch(self, batches):
+        """A failing batch call fails all the requests it contained"""
+        async def fail(items):
+            raise RuntimeError("model unavailable")
+
+        batcher = MicroBatcher(fail, max_batch_size=4, max_wait_ms=5, max_queue_depth=8, name="test")
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(2)), return_exceptions=True)
+        await batcher.close()
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def test_rejects_when_queue_is_full(self, batcher):
+        """Submissions beyond max_queue_depth are rejected instead of queued"""
+        # Queued, the worker did not get to run yet
+        pending = [asyncio.ensure_future(batcher.submit(i)) for i in range(batcher.max_queue_depth)]
+        await asyncio.sleep(0)
+        assert batcher.queue_depth == batcher.max_queue_depth
+
+        with pytest.raises(ServiceOverloadedError):
+            await batcher.submit(-1)
+
+        await asyncio.gather(*pending)
+        assert batcher.stats.rejected == 1
@@ -0,0 +1,102 @@
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from ecs.models.schemas import FeatureTable, FEATURE_NAMES, RiskAssessment, CreditOfferStatus
+from ecs.services import FeatureService, RescoringService
+from ecs.services.credit_service import CreditOfferCalculator
+from ecs.services.internal import PrecomputedOfferCache
+
+
+@pytest.fixture
+def user_ids():
+    return [uuid.uuid4() for _ in range(3)]
+
+
+@pytest.fixture
+def mock_feature_service(user_ids):
+    service = AsyncMock(spec=FeatureService)
+    service.create_feature_table.return_value = FeatureTable(
+        user_ids=user_ids, values=np.zeros((len(user_ids), len(FEATURE_NAMES)))
+    )
+    return service
+
+
+@pytest.fixture
+def rescoring_service(mock_feature_service, mock_credit_model_service, mock_credit_repository, mock_db_session):
+    mock_credit_model_service.model_version = "test"
+    return RescoringService(
+        feature_service=mock_feature_service,
+        credit_model_service=mock_credit_model_service,
+        credit_repository=mock_credit_repository,
+        session=mock_db_session
+    )
+
+
+class TestRescoringService:
+
+    async def test_rescore_users(
+        self, rescoring_service, user_ids, mock_feature_service, mock_credit_model_service,
+        mock_credit_repository, mock_db_session
+    ):
+        """A chunk is scored with one model call and stored with one bulk insert"""
+        mock_credit_model_service.predict_risk_scores.return_value = np.array([0.1, 0.5, 0.9])
+
+        result = await rescoring_service.rescore_users(user_ids)
+
+        assert (result.users, result.scored) == (3, 3)
+        mock_feature_service.create_feature_table.assert_awaited_once_with(user_ids)
+        mock_credit_model_service.predict_risk_scores.assert_awaited_once()
+        mock_credit_repository.create_risk_assessments.assert_awaited_once()
+        args, kwargs = mock_credit_repository.create_risk_assessments.await_args
+        assert args == (user_ids, [0.1, 0.5, 0.9])
+        assert kwargs["expires_at"] > datetime.now() + timedelta(days=14)
+        mock_db_session.commit.assert_awaited_once()
+
+    async def test_unscored_users_are_skipped(self, rescoring_service, user_ids, mock_credit_model_service, mock_credit_repository):
+        """Users the model returned no score for get no risk assessment"""
+        mock_credit_model_service.predict_risk_scores.return_value = np.array([0.1, np.nan, 0.9])
+
+        result = await rescoring_service.rescore_users(user_ids)
+
+        assert (result.users, result.scored) == (3, 2)
+        args, _ = mock_credit_repository.create_risk_assessments.await_args
+        assert args == ([user_ids[0], user_ids[2]], [0.1, 0.9])
+
+    async def test_failed_insert_rolls_back(self, rescoring_service, user_ids, mock_credit_model_service, mock_credit_repository, mock_db_session):
+        mock_credit_model_service.predict_risk_scores.return_value = np.array([0.1, 0.5, 0.9])
+        mock_credit_repository.create_risk_assessments.side_effect = RuntimeError("insert failed")
+
+        with pytest.raises(RuntimeError):
+            await rescoring_service.rescore_users(user_ids)
+
+        mock_db_session.rollback.assert_awaited_once()
+        mock_db_session.commit.assert_not_awaited()
+
+    async def test_empty_chunk(self, rescoring_service, mock_feature_service):
+        result = await rescoring_service.rescore_users([])
+
+        assert (result.users, result.scored) == (0, 0)
+        mock_feature_service.create_feature_table.assert_not_awaited()
+
+    async def test_precomputes_offers(
+        self, rescoring_service, user_ids, mock_credit_model_service, mock_credit_repository
+    ):
+        """Offers are priced from the stored risk score and keyed by the new risk assessment"""
+        risk_assessment_ids = [uuid.uuid4() for _ in user_ids]
+        mock_credit_model_service.predict_risk_scores.return_value = np.array([0.123456, 0.6, 0.9])
+        mock_credit_repository.create_risk_assessments.return_value = risk_assessment_ids
+        rescoring_service.offer_cache = AsyncMock(spec=PrecomputedOfferCache)
+
+        result = await rescoring_service.rescore_users(user_ids)
+
+        assert result.precomputed_offers == 3
+        (offers,), _ = rescoring_service.offer_cache.set_many.await_args
+        assert [offer.risk_assessment_id for offer in offers] == risk_assessment_ids
+        assert offers[0].offer == CreditOfferCalculator().calculate_offer(
+            RiskAssessment(risk_score=0.1235), FeatureTable(user_ids=user_ids, values=np.zeros((3, len(FEATURE_NAMES)))).to_features(0)
+        )
+        assert offers[2].offer.status == CreditOfferStatus.denied
@@ -0,0 +1,72 @@
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+from rq import SimpleWorker
+from sqlalchemy.exc import OperationalError
+
+from ecs.models.schemas import CreditAcceptanceOutcome
+from ecs.workers import jobs
+from ecs.workers.worker import JobWorker
+
+
+@pytest.fixture
+def job_engine():
+    """Pooled job engine replaced by a mock, the cached engine and session factory start out empty"""
+    jobs.get_job_engine.cache_clear()
+    jobs.get_job_session_factory.cache_clear()
+    engine = MagicMock()
+    with patch("ecs.workers.jobs.create_engine", return_value=engine) as create_engine, \
+            patch("ecs.workers.jobs.os.register_at_fork"):
+        yield create_engine
+    jobs.get_job_engine.cache_clear()
+    jobs.get_job_session_factory.cache_clear()
+
+
+class TestJobSessions:
+
+    def test_jobs_share_one_engine(self, job_engine):
+        """Every job of the worker process gets its session from the same cached factory and engine"""
+        session = MagicMock()
+        session.__enter__.return_value = session
+        session.execute.return_value.scalar_one_or_none.return_value = None
+        session_factory = MagicMock(return_value=session)
+
+        with patch("ecs.workers.jobs.sessionmaker", return_value=session_factory) as sessionmaker:
+            outcomes = [
+                jobs.process_credit_acceptance(str(uuid.uuid4()), str(uuid.uuid4())) for _ in range(3)
+            ]
+
+        assert outcomes == [CreditAcceptanceOutcome.offer_unavailable.value] * 3
+        job_engine.assert_called_once()
+        sessionmaker.assert_called_once_with(bind=job_engine.return_value)
+        assert session_factory.call_count == 3
+
+
+class TestJobWorker:
+
+    def test_bootstrap_warms_up_pool(self, job_engine):
+        worker = JobWorker.__new__(JobWorker)
+        session = MagicMock()
+        session.__enter__.return_value = session
+
+        with patch.object(SimpleWorker, "bootstrap") as bootstrap, \
+                patch("ecs.workers.jobs.sessionmaker", return_value=MagicMock(return_value=session)):
+            worker.bootstrap()
+
+        bootstrap.assert_called_once()
+        session.execute.assert_called_once()
+
+    def test_bootstrap_tolerates_unavailable_database(self, job_engine):
+        """The worker starts without a database, jobs connect once it is back"""
+        worker = JobWorker.__new__(JobWorker)
+        session = MagicMock()
+        session.__enter__.return_value = session
+        session.execute.side_effect = OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+        with patch.object(SimpleWorker, "bootstrap") as bootstrap, \
+                patch("ecs.workers.jobs.sessionmaker", return_value=MagicMock(return_value=session)):
+            worker.bootstrap()
+
+        bootstrap.assert_called_once()
+        session.execute.assert_called_once()
@@ -0,0 +1,82 @@
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ecs.workers.jobs import NotificationService, notify_user, send_notification
+
+
+@pytest.fixture
+def notification_service():
+    return NotificationService("mock-service-url", timeout_seconds=0.5, retries=2)
+
+
+class TestNotificationService:
+
+    async def test_channels_are_sent_concurrently(self, notification_service):
+        """Email and push take 100 ms each, together they still take about 100 ms"""
+        started = time.perf_counter()
+        result = await notification_service.notify("user", "message", ["push", "email"])
+
+        assert (result["success_count"], result["total_count"]) == (2, 2)
+        assert time.perf_counter() - started < 0.19
+
+    async def test_failed_attempts_are_retried(self, notification_service):
+        attempts = []
+
+        async def flaky_push(user_id, message):
+            attempts.append(user_id)
+            if len(attempts) < 3:
+                raise ConnectionError("push gateway unavailable")
+            return True
+        notification_service.channels["push"] = flaky_push
+
+        with patch("ecs.workers.jobs.NOTIFICATION_RETRY_BACKOFF_SECONDS", 0):
+            result = await notification_service.notify("user", "message", ["push"])
+
+        assert result["success_count"] == 1
+        assert len(attempts) == 3
+
+    async def test_slow_channel_times_out_without_holding_up_others(self, notification_service):
+        """A channel past its retries only fails itself"""
+        async def hanging_email(user_id, message):
+            await asyncio.sleep(10)
+        notification_service.channels["email"] = hanging_email
+        notification_service.timeout_seconds = 0.2
+        notification_service.retries = 1
+
+        started = time.perf_counter()
+        with patch("ecs.workers.jobs.NOTIFICATION_RETRY_BACKOFF_SECONDS", 0):
+            result = await notification_service.notify("user", "message", ["push", "email"])
+
+        assert (result["success_count"], result["total_count"]) == (1, 2)
+        assert time.perf_counter() - started < 1
+
+
+class TestNotifyUser:
+
+    def test_sends_from_the_job_without_queue(self):
+        with patch("ecs.workers.jobs.send_notification") as send, patch("ecs.workers.jobs.settings.notification_queue", ""):
+            notify_user("user", "message", ["email"])
+
+        send.assert_called_once_with("user", "message", ["email"])
+
+    def test_queues_when_configured(self):
+        job = MagicMock()
+        with (
+            patch("ecs.workers.jobs.settings.notification_queue", "ecs:notifications"),
+            patch("ecs.workers.jobs.get_current_job", return_value=job),
+            patch("ecs.workers.jobs.Queue") as queue,
+            patch("ecs.workers.jobs.send_notification") as send
+        ):
+            notify_user("user", "message", ["email"])
+
+        queue.assert_called_once_with("ecs:notifications", connection=job.connection)
+        queue.return_value.enqueue.assert_called_once_with(
+            send, user_id="user", message="message", notification_types=["email"]
+        )
+        send.assert_not_called()
+
+    def test_send_notification(self):
+        assert send_notification("user", "message", ["email"])["success_count"] == 1